@@ -1,6 +1,11 @@
 from django.contrib import admin
-from .models import Signal, AnalyzedNews
+from .models import Stock, Signal, AnalyzedNews, SymbolRollup, AnalysisRun, TriageDecision, ArchivedPartition
 
 # Register your models here.
+admin.site.register(Stock)
 admin.site.register(Signal)
 admin.site.register(AnalyzedNews)
+admin.site.register(SymbolRollup)
+admin.site.register(AnalysisRun)
+admin.site.register(TriageDecision)
+admin.site.register(ArchivedPartition)
@@ -0,0 +1,32 @@
+from django.core.management.base import BaseCommand
+
+from ai.utils.partitions import PARTITIONED_TABLES, archive_old_partitions, ensure_partitions
+
+
+class Command(BaseCommand):
+    help = (
+        "Create upcoming monthly partitions and archive partitions older than the "
+        "retention window to Parquet (the same work as maintain_partitions_task)."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--retention-months', type=int,
+                            help='Override PARTITION_RETENTION_MONTHS (0 disables archival)')
+        parser.add_argument('--months-ahead', type=int, help='Override PARTITION_MONTHS_AHEAD')
+        parser.add_argument('--dry-run', action='store_true', help='List partitions that would be archived')
+
+    def handle(self, *args, **options):
+        if not options['dry_run']:
+            for table in PARTITIONED_TABLES:
+                for name in ensure_partitions(table, options['months_ahead']):
+                    self.stdout.write(f"Created {name}")
+
+        archived = archive_old_partitions(options['retention_months'], dry_run=options['dry_run'])
+        for item in archived:
+            if options['dry_run']:
+                self.stdout.write(f"Would archive {item}")
+            else:
+                self.stdout.write(f"Archived {item}: {item.row_count:,} rows, "
+                                  f"{item.size_bytes / 1e6:.1f} MB -> {item.path or '(empty)'}")
+        if not archived:
+            self.stdout.write("Nothing to archive")
@@ -0,0 +1,125 @@
+import hashlib
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import openai
+from django.conf import settings
+from django.core.cache import cache
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+from django.utils.dateparse import parse_datetime
+
+from ai import pipeline
+from ai.models import AnalysisRun
+from ai.tasks import analyze_news_task
+from ai.utils.rate_limit import AdaptiveRateLimiter
+
+
+class Command(BaseCommand):
+    help = (
+        "Analyze stories that never got an analysis (e.g. OpenAI or ChromaDB was down). "
+        "Walks ids in chunks, checkpointing the id below which every story succeeded so an "
+        "interrupted run resumes without skipping failures."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--since', help='Only stories published at or after this ISO8601 time')
+        parser.add_argument('--until', help='Only stories published before this ISO8601 time')
+        parser.add_argument('--source', help='Only stories whose link host starts with this (case-insensitive), e.g. economictimes.indiatimes.com')
+        parser.add_argument('--chunk-size', type=int, default=200)
+        parser.add_argument('--workers', type=int, default=4, help='Concurrent stories (and DB connections)')
+        parser.add_argument('--rpm', type=float, default=60, help='Max LLM requests per minute')
+        parser.add_argument('--limit', type=int, help='Stop after this many stories')
+        parser.add_argument('--min-age-minutes', type=int, default=30,
+                            help='Skip stories that may still be in flight')
+        parser.add_argument('--enqueue', action='store_true',
+                            help='Dispatch to the Celery pipeline instead of running stages in-process')
+        parser.add_argument('--restart', action='store_true', help='Ignore the saved checkpoint')
+        parser.add_argument('--dry-run', action='store_true', help='Only count matching stories')
+
+    def handle(self, *args, **options):
+        since = self._parse(options['since'], '--since')
+        until = self._parse(options['until'], '--until')
+        stories = pipeline.unanalyzed_stories(since, until, options['source'], options['min_age_minutes'])
+
+        if options['dry_run']:
+            self.stdout.write(f"{stories.count()} stories need analysis.")
+            return
+
+        filters = f"{options['since']}|{options['until']}|{options['source']}"
+        checkpoint_key = f"backfill_analysis:{hashlib.sha1(filters.encode()).hexdigest()[:12]}"
+        last_id = 0 if options['restart'] else cache.get(checkpoint_key, 0)
+        if last_id:
+            self.stdout.write(f"Resuming after story id {last_id}")
+
+        limiter = AdaptiveRateLimiter(options['rpm'])
+        # Stages that may call the LLM; each call takes one slot from the limiter
+        self.llm_stages = {'llm'} | ({'triage'} if settings.TRIAGE_MODE in ('model', 'cascade') else set())
+        processed = failed = 0
+        # ``cursor`` moves past every story; the saved checkpoint stops before the first failure
+        cursor, first_failed = last_id, None
+        with ThreadPoolExecutor(options['workers']) as pool:
+            while options['limit'] is None or processed < options['limit']:
+                size = options['chunk_size']
+                if options['limit'] is not None:
+                    size = min(size, options['limit'] - processed)
+                ids = list(stories.filter(id__gt=cursor).order_by('id').values_list('id', flat=True)[:size])
+                if not ids:
+                    break
+                if options['enqueue']:
+                    for story_id in ids:
+                        analyze_news_task.delay(story_id)
+                else:
+                    results = pool.map(lambda i: self._analyze(i, limiter), ids)
+                    failures = [story_id for story_id, ok in zip(ids, results) if not ok]
+                    failed += len(failures)
+                    if failures and first_failed is None:
+                        first_failed = failures[0]
+                processed += len(ids)
+                cursor = ids[-1]
+                last_id = cursor if first_failed is None else first_failed - 1
+                cache.set(checkpoint_key, last_id, timeout=None)
+                self.stdout.write(
+                    f"{processed} stories processed ({failed} failed), last id {cursor}, "
+                    f"LLM rate {limiter.rate:.0f}/min"
+                )
+
+        if options['limit'] is None and first_failed is None:
+            cache.delete(checkpoint_key)
+        self.stdout.write(self.style.SUCCESS(f"Backfill finished: {processed} processed, {failed} failed."))
+
+    def _parse(self, value, flag):
+        if not value:
+            return None
+        parsed = parse_datetime(value)
+        if parsed is None:
+            raise CommandError(f"{flag} must be an ISO8601 datetime")
+        return parsed
+
+    def _run_stages(self, story_id, limiter):
+        """Like ``pipeline.run_pipeline``, taking a limiter slot before each stage that calls the LLM."""
+        for stage in pipeline.STAGE_ORDER[:-1]:
+            if stage in self.llm_stages and AnalysisRun.objects.filter(news_story_id=story_id, stage=stage).exists():
+                limiter.acquire()
+            pipeline.STAGES[stage](story_id)
+
+    def _analyze(self, story_id, limiter, attempts=4):
+        """Run the remaining stages for one story; back off on provider rate limits."""
+        try:
+            for attempt in range(attempts):
+                try:
+                    self._run_stages(story_id, limiter)
+                    limiter.reward()
+                    return True
+                except openai.RateLimitError as e:
+                    limiter.penalize()
+                    pipeline.record_failure(story_id, e)
+                    time.sleep(2 ** attempt)
+                except Exception as e:
+                    pipeline.record_failure(story_id, e)
+                    self.stderr.write(f"Story {story_id} failed: {e}")
+                    return False
+            return False
+        finally:
+            # Worker threads each hold their own connection; release it per story.
+            connection.close()
@@ -0,0 +1,58 @@
+import statistics
+import time
+
+from django.core.management.base import BaseCommand
+from django.db import connection
+from django.test import Client
+from django.test.utils import CaptureQueriesContext
+
+from ai.models import AnalyzedNews
+from ai.utils.synthetic import seed_news
+
+VARIANTS = [
+    ('full, identity', {}, ''),
+    ('full, gzip', {}, 'gzip'),
+    ('full, br', {}, 'gzip, deflate, br'),
+    ('omit=content, br', {'omit': 'content'}, 'gzip, deflate, br'),
+    ('fields=title,summary,tags, br', {'fields': 'title,summary,tags'}, 'gzip, deflate, br'),
+    ('view=list, identity', {'view': 'list'}, ''),
+    ('view=list, br', {'view': 'list'}, 'gzip, deflate, br'),
+]
+
+
+class Command(BaseCommand):
+    help = (
+        "Measure bytes per page and server time of /api/analyzed-news/ for the full, sparse and "
+        "list representations with and without compression. Optionally seeds synthetic stories."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--seed', type=int, default=0, help='Synthetic stories to insert first')
+        parser.add_argument('--repeat', type=int, default=20)
+        parser.add_argument('--page', type=int, default=1)
+
+    def handle(self, *args, **options):
+        if options['seed']:
+            t0 = time.perf_counter()
+            seed_news(options['seed'], tag='bench-api-payload')
+            self.stdout.write(f"Seeded {options['seed']:,} stories in {time.perf_counter() - t0:.1f}s")
+        self.stdout.write(f"AnalyzedNews rows: {AnalyzedNews.objects.count():,}")
+
+        client = Client()
+        for label, params, encoding in VARIANTS:
+            params = {**params, 'page': options['page']}
+            headers = {'HTTP_ACCEPT_ENCODING': encoding} if encoding else {}
+            client.get('/api/analyzed-news/', params, **headers)  # warm caches
+            timings, sql = [], []
+            for _ in range(options['repeat']):
+                with CaptureQueriesContext(connection) as queries:
+                    t0 = time.perf_counter()
+                    response = client.get('/api/analyzed-news/', params, **headers)
+                    timings.append((time.perf_counter() - t0) * 1000)
+                sql.append(sum(float(q['time']) for q in queries.captured_queries) * 1000)
+            self.stdout.write(
+                f"{label:32} {len(response.content) / 1024:8.1f} KB/page "
+                f"({response.get('Content-Encoding', 'identity')}), "
+                f"median {statistics.median(timings):6.1f} ms (SQL {statistics.median(sql):5.1f}), "
+                f"max {max(timings):6.1f} ms, {len(queries)} queries"
+            )
@@ -0,0 +1,165 @@
+import json
+import os
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import numpy as np
+from django.core.management.base import BaseCommand
+
+from ai.utils.openai_utils import (
+    CHARS_PER_TOKEN, IncompleteResponseError, analyze_news_streaming, analyze_news_with_candidates,
+)
+
+FAULTS = ('none', 'bad-item', 'truncated')
+NEWS = [{'title': 'Stub story', 'description': 'Stub description', 'datetime': '2025-01-01T00:00:00+00:00',
+         'source': 'Stub', 'link': 'https://stream.local/news/1'}]
+CANDIDATES = [{'Symbol': 'TCS', 'CompanyName': 'Tata Consultancy Services Limited', 'Industry': 'IT'}]
+
+
+def stub_completion(signals: int, fault: str) -> str:
+    """A GPT-shaped analysis response, optionally with a broken last signal or cut short."""
+    result = {
+        'signals': [{
+            'type': 'buy', 'symbol': f"SYM{i}", 'confidence': 0.7,
+            'reason': 'Order book growth and margin guidance ahead of estimates for the quarter',
+            'timestamp': '2025-01-01T00:00:00Z',
+        } for i in range(signals)],
+        'news': [{
+            'title': 'Stub story', 'summary': 'Summary of the story ' * 6,
+            'publishedAt': '2025-01-01T00:00:00Z', 'source': 'Stub', 'url': 'https://stream.local/news/1',
+            'tags': {'stocks': [f"SYM{i}" for i in range(signals)], 'sentiment': 'positive', 'impact': 'high',
+                     'key_points': ['Point one', 'Point two']},
+        }],
+    }
+    text = '```json\n' + json.dumps(result, indent=2) + '\n```'
+    if fault == 'bad-item':
+        # An unescaped quote inside the last signal's reason
+        last = f'"symbol": "SYM{signals - 1}"'
+        head, tail = text.split(last)
+        text = head + last + tail.replace('"reason": "Order', '"reason": "Order "book" ', 1)
+    elif fault == 'truncated':
+        # Cut inside the news item, as when max_tokens runs out
+        text = text[:text.index('"summary"') + 200]
+    return text
+
+
+class _StubHTTPServer(ThreadingHTTPServer):
+    daemon_threads = True
+
+
+class StubStreamingServer:
+    """
+    Chat completions stub that generates ``completion`` at ``ms_per_token``
+    after ``first_token_ms``, both scaled by ``time_scale``, either as one
+    response or as an SSE stream.
+    """
+
+    def __init__(self, completion: str, first_token_ms: float, ms_per_token: float, time_scale: float = 1.0):
+        first_token_ms, ms_per_token = first_token_ms * time_scale, ms_per_token * time_scale
+        tokens = [completion[i:i + CHARS_PER_TOKEN] for i in range(0, len(completion), CHARS_PER_TOKEN)]
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_POST(self):
+                request = json.loads(self.rfile.read(int(self.headers['Content-Length'])))
+                time.sleep(first_token_ms / 1000)
+                if not request.get('stream'):
+                    time.sleep(ms_per_token * len(tokens) / 1000)
+                    body = json.dumps({
+                        'id': 'stub', 'object': 'chat.completion', 'created': 0, 'model': request['model'],
+                        'choices': [{'index': 0, 'finish_reason': 'stop',
+                                     'message': {'role': 'assistant', 'content': completion}}],
+                    }).encode()
+                    self.send_response(200)
+                    self.send_header('Content-Type', 'application/json')
+                    self.send_header('Content-Length', str(len(body)))
+                    self.end_headers()
+                    self.wfile.write(body)
+                    return
+                self.send_response(200)
+                self.send_header('Content-Type', 'text/event-stream')
+                self.end_headers()
+                for token in tokens:
+                    chunk = {'id': 'stub', 'object': 'chat.completion.chunk', 'created': 0, 'model': request['model'],
+                             'choices': [{'index': 0, 'delta': {'content': token}, 'finish_reason': None}]}
+                    self.wfile.write(f"data: {json.dumps(chunk)}\n\n".encode())
+                    self.wfile.flush()
+                    time.sleep(ms_per_token / 1000)
+                self.wfile.write(b"data: [DONE]\n\n")
+
+            def log_message(self, format, *args):
+                pass
+
+        self.tokens = len(tokens)
+        self.httpd = _StubHTTPServer(('127.0.0.1', 0), Handler)
+        self.port = self.httpd.server_address[1]
+        self.thread = threading.Thread(target=self.httpd.serve_forever, daemon=True)
+
+    def __enter__(self):
+        self.thread.start()
+        return self
+
+    def __exit__(self, *exc):
+        self.httpd.shutdown()
+        self.httpd.server_close()
+
+
+class Command(BaseCommand):
+    help = (
+        "Measure time-to-first-signal of blocking and streaming analysis against a stub streaming "
+        "server, with a clean response, a malformed last signal and a truncated response."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--signals', type=int, default=5, help='Signals in the stub response')
+        parser.add_argument('--first-token-ms', type=float, default=600)
+        parser.add_argument('--ms-per-token', type=float, default=30)
+        parser.add_argument('--runs', type=int, default=3)
+        parser.add_argument('--time-scale', type=float, default=0.25,
+                            help='Multiplier on simulated latencies; results are reported unscaled')
+        parser.add_argument('--faults', default=','.join(FAULTS), help=f"Comma-separated subset of: {', '.join(FAULTS)}")
+
+    def handle(self, *args, **options):
+        saved_env = {key: os.environ.get(key) for key in ('OPENAI_BASE_URL', 'OPENAI_API_KEY')}
+        try:
+            for fault in [f for f in options['faults'].split(',') if f]:
+                completion = stub_completion(options['signals'], fault)
+                with StubStreamingServer(completion, options['first_token_ms'], options['ms_per_token'],
+                                         options['time_scale']) as stub:
+                    os.environ.update(OPENAI_BASE_URL=f"http://127.0.0.1:{stub.port}/v1", OPENAI_API_KEY='stub')
+                    self.stdout.write(f"{fault}: {stub.tokens} tokens")
+                    for mode in ('blocking', 'streaming'):
+                        self.run_mode(mode, options['runs'], options['time_scale'])
+        finally:
+            for key, value in saved_env.items():
+                if value is None:
+                    os.environ.pop(key, None)
+                else:
+                    os.environ[key] = value
+
+    def run_mode(self, mode, runs, scale):
+        first, total, kept, raised = [], [], [], 0
+        for _ in range(runs):
+            arrivals = []
+            t0 = time.perf_counter()
+            if mode == 'streaming':
+                try:
+                    result = analyze_news_streaming(
+                        NEWS, CANDIDATES,
+                        on_item=lambda key, item: key == 'signals' and arrivals.append(time.perf_counter() - t0),
+                    )
+                except IncompleteResponseError:
+                    # The stage is retried; signals already published are superseded
+                    result, raised = {'signals': []}, raised + 1
+            else:
+                result = analyze_news_with_candidates(NEWS, CANDIDATES)
+                if result['signals']:
+                    arrivals.append(time.perf_counter() - t0)
+            total.append((time.perf_counter() - t0) / scale)
+            first.append(arrivals[0] / scale if arrivals else np.nan)
+            kept.append(len(result['signals']))
+        first_ms = 'n/a' if np.isnan(first).all() else f"{np.nanmean(first) * 1000:7.0f} ms"
+        self.stdout.write(
+            f"  {mode:>9}: first signal {first_ms:>10}  complete {np.mean(total) * 1000:7.0f} ms  "
+            f"{np.mean(kept):.0f} signals kept" + (f", raised on {raised}/{runs} runs" if raised else '')
+        )
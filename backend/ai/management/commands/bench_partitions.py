@@ -0,0 +1,120 @@
+import statistics
+import time
+from datetime import date, timedelta
+
+from django.core.management.base import BaseCommand
+from django.db import connection
+from django.utils import timezone
+
+from ai.utils.partitions import archive_old_partitions, ensure_partitions
+from ai.utils.synthetic import seed_news, seed_signal_rows
+from scrapy.models import NewsStory
+
+TAG = 'bench-partitions'
+HEAP_TABLE = 'bench_signal_heap'
+
+# The window start is bound as a parameter, as the API's ORM queries send it.
+# Unlike now() in SQL, a parameter lets the planner prune partitions.
+QUERIES = {
+    'latest 100 in 7d': (
+        7, 'SELECT id, symbol, price, "timestamp" FROM {table} '
+        'WHERE "timestamp" >= %s ORDER BY "timestamp" DESC LIMIT 100'
+    ),
+    'per-symbol counts 7d': (
+        7, 'SELECT symbol, type, count(*) FROM {table} WHERE "timestamp" >= %s GROUP BY symbol, type'
+    ),
+    'per-symbol counts 30d': (
+        30, 'SELECT symbol, type, count(*) FROM {table} WHERE "timestamp" >= %s GROUP BY symbol, type'
+    ),
+}
+
+
+def _size(cursor, table, partitioned):
+    if partitioned:
+        cursor.execute("SELECT sum(pg_total_relation_size(relid)) FROM pg_partition_tree(%s::regclass)", [table])
+    else:
+        cursor.execute("SELECT pg_total_relation_size(%s::regclass)", [table])
+    return int(cursor.fetchone()[0] or 0)
+
+
+class Command(BaseCommand):
+    help = (
+        "Benchmark recent-window signal queries and disk usage of the partitioned ai_signal "
+        "table against an unpartitioned copy. Seeds synthetic signals (use a disposable database)."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--rows', type=int, default=0, help='Synthetic signals to insert first, e.g. 10000000')
+        parser.add_argument('--days', type=int, default=730, help='History the seeded signals span')
+        parser.add_argument('--repeat', type=int, default=5)
+        parser.add_argument('--archive-months', type=int, default=0,
+                            help='Afterwards, archive partitions older than this many months and report sizes')
+        parser.add_argument('--cleanup', action='store_true', help='Delete seeded rows and the heap copy afterwards')
+
+    def handle(self, *args, **options):
+        with connection.cursor() as cursor:
+            if options['rows']:
+                story_ids = list(NewsStory.objects.filter(link__contains=f"//{TAG}.local/")
+                                 .values_list('id', flat=True)[:1000])
+                if not story_ids:
+                    seed_news(1000, tag=TAG)
+                    story_ids = list(NewsStory.objects.filter(link__contains=f"//{TAG}.local/")
+                                     .values_list('id', flat=True))
+                # Monthly partitions for the whole span, so history doesn't pile up in the default partition
+                ensure_partitions('ai_signal', since=date.today() - timedelta(days=options['days']))
+                t0 = time.perf_counter()
+                seed_signal_rows(options['rows'], story_ids, days=options['days'], reason=TAG)
+                self.stdout.write(f"Seeded {options['rows']:,} signals in {time.perf_counter() - t0:.1f}s")
+
+            # The unpartitioned copy mirrors ai_signal's layout before migration 0007.
+            t0 = time.perf_counter()
+            cursor.execute(f'DROP TABLE IF EXISTS "{HEAP_TABLE}"')
+            cursor.execute(f'CREATE TABLE "{HEAP_TABLE}" AS SELECT * FROM ai_signal')
+            cursor.execute(f'ALTER TABLE "{HEAP_TABLE}" ADD PRIMARY KEY (id)')
+            cursor.execute(f'CREATE INDEX ON "{HEAP_TABLE}" (news_story_id)')
+            cursor.execute(f'CREATE INDEX ON "{HEAP_TABLE}" ("timestamp")')
+            cursor.execute(f'VACUUM ANALYZE "{HEAP_TABLE}"')
+            cursor.execute('VACUUM ANALYZE ai_signal')
+            self.stdout.write(f"Built unpartitioned copy in {time.perf_counter() - t0:.1f}s")
+
+            cursor.execute('SELECT count(*) FROM ai_signal')
+            self.stdout.write(f"Signal rows: {cursor.fetchone()[0]:,}")
+            cursor.execute("SELECT count(*) FROM pg_partition_tree('ai_signal'::regclass) WHERE isleaf")
+            self.stdout.write(f"Partitions: {cursor.fetchone()[0]}")
+            for table, partitioned in (('ai_signal', True), (HEAP_TABLE, False)):
+                self.stdout.write(f"{table}: {_size(cursor, table, partitioned) / 1e6:,.1f} MB on disk")
+
+            for label, (days, sql) in QUERIES.items():
+                since = timezone.now() - timedelta(days=days)
+                timings = {}
+                for table in ('ai_signal', HEAP_TABLE):
+                    runs = []
+                    for _ in range(options['repeat']):
+                        t0 = time.perf_counter()
+                        cursor.execute(sql.format(table=table), [since])
+                        cursor.fetchall()
+                        runs.append((time.perf_counter() - t0) * 1000)
+                    timings[table] = runs
+                part, heap = timings['ai_signal'], timings[HEAP_TABLE]
+                self.stdout.write(
+                    f"{label}: partitioned median {statistics.median(part):.1f} ms (max {max(part):.1f}); "
+                    f"unpartitioned median {statistics.median(heap):.1f} ms (max {max(heap):.1f})"
+                )
+
+            if options['archive_months']:
+                before = _size(cursor, 'ai_signal', True)
+                t0 = time.perf_counter()
+                archived = [a for a in archive_old_partitions(options['archive_months']) if a.table == 'ai_signal']
+                elapsed = time.perf_counter() - t0
+                after = _size(cursor, 'ai_signal', True)
+                rows = sum(a.row_count for a in archived)
+                parquet = sum(a.size_bytes for a in archived)
+                self.stdout.write(
+                    f"Archived {len(archived)} signal partitions ({rows:,} rows) in {elapsed:.1f}s: "
+                    f"ai_signal {before / 1e6:,.1f} -> {after / 1e6:,.1f} MB, Parquet {parquet / 1e6:,.1f} MB"
+                )
+
+            if options['cleanup']:
+                cursor.execute(f'DROP TABLE "{HEAP_TABLE}"')
+                cursor.execute('DELETE FROM ai_signal WHERE reason = %s', [TAG])
+                self.stdout.write("Removed seeded signals and the unpartitioned copy")
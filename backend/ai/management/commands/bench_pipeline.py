@@ -0,0 +1,190 @@
+import os
+import threading
+import time
+from collections import defaultdict
+from contextlib import ExitStack
+from unittest import mock
+
+import numpy as np
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+from django.test.utils import override_settings
+
+from ai import pipeline
+from ai.management.commands.bench_triage import StubLLMServer
+from ai.models import AnalysisRun, SymbolRollup
+from ai.tasks import analyze_news_task
+from scrapy.models import NewsStory
+
+QUEUES = ('celery', 'retrieval', 'llm', 'prices', 'persist')
+CANDIDATES = [{'Symbol': 'STUB', 'CompanyName': 'Stub Industries Limited', 'Industry': 'Stub'}]
+LINK_PREFIX = 'https://bench-pipeline.local/news/'
+
+
+def _layout(value):
+    """``queue:threads,...`` -> ``{queue: threads}``; ``all:N`` is one worker consuming every queue."""
+    layout = {}
+    for part in value.split(','):
+        queue, threads = part.split(':')
+        layout[queue] = int(threads)
+    return layout
+
+
+class _StubUniverse:
+    collection = True
+
+    def __init__(self, latency):
+        self.latency = latency
+
+    def get_relevant_stocks(self, news_text, n_results=5):
+        time.sleep(self.latency)
+        return CANDIDATES
+
+
+class Command(BaseCommand):
+    help = (
+        "Run the real analysis chain (analyze_news_task and the stage tasks, routed by "
+        "CELERY_TASK_ROUTES) on in-process Celery workers over an in-memory broker. GPT is served "
+        "by a stub OpenAI server; retrieval, Yahoo prices and embedding are stubbed with fixed "
+        "latencies. Compares worker layouts on throughput, per-story latency and stage times. "
+        "Writes stories, runs, signals and analyzed news (use a disposable database); they are "
+        "deleted afterwards."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--stories', type=int, default=100)
+        parser.add_argument('--layouts', nargs='+', type=_layout,
+                            default=[_layout('all:16'), _layout('celery:2,retrieval:8,llm:16,prices:32,persist:4')],
+                            help="Worker layouts, each 'queue:threads,...'; 'all:N' is one worker on every "
+                                 "queue. The default compares one 16-slot worker with docker-compose's split")
+        parser.add_argument('--llm-latency', type=float, nargs=2, default=(800, 30), metavar=('BASE_MS', 'MS_PER_TOKEN'))
+        parser.add_argument('--retrieval-ms', type=float, default=150)
+        parser.add_argument('--yahoo-ms', type=float, default=500, help='Per price lookup')
+        parser.add_argument('--timeout', type=float, default=600, help='Seconds to wait for one layout')
+
+    def handle(self, *args, **options):
+        if connection.vendor != 'postgresql':
+            raise CommandError("bench_pipeline needs the Postgres database the pipeline writes to")
+        from core.celery import app
+
+        model = settings.ANALYSIS_MODEL
+        base_ms, ms_per_token = options['llm_latency']
+        # The app reads the CELERY_-prefixed Django settings, so override those keys. The
+        # in-memory transport only refills a worker about once a second after its prefetch
+        # runs out, which Redis doesn't; a deep prefetch keeps that out of the measurement,
+        # and concurrency is still bounded by each worker's pool.
+        app.conf.update(CELERY_BROKER_URL='memory://', CELERY_RESULT_BACKEND='cache+memory://',
+                        CELERY_TASK_IGNORE_RESULT=True, CELERY_WORKER_PREFETCH_MULTIPLIER=1000,
+                        CELERY_BROKER_TRANSPORT_OPTIONS={'polling_interval': 0.01})
+        saved_env = {key: os.environ.get(key) for key in ('OPENAI_BASE_URL', 'OPENAI_API_KEY')}
+        # Every story is relevant, so each one gets a signal and a price lookup
+        labels = {f"Stub story {i}": True for i in range(options['stories'])}
+        stub = StubLLMServer(
+            labels=labels, analysis_model=model, triage_model=settings.TRIAGE_MODEL,
+            latency={model: (base_ms, ms_per_token), settings.TRIAGE_MODEL: (0, 0)}, accuracy=1.0, time_scale=1.0,
+        )
+        try:
+            with stub:
+                os.environ.update(OPENAI_BASE_URL=f"http://127.0.0.1:{stub.port}/v1", OPENAI_API_KEY='stub')
+                self.stdout.write(
+                    f"{options['stories']} stories; LLM {base_ms:.0f} ms + {ms_per_token:.0f} ms/token, "
+                    f"retrieval {options['retrieval_ms']:.0f} ms, Yahoo {options['yahoo_ms']:.0f} ms per lookup"
+                )
+                for layout in options['layouts']:
+                    self.run_layout(app, layout, options)
+        finally:
+            for key, value in saved_env.items():
+                if value is None:
+                    os.environ.pop(key, None)
+                else:
+                    os.environ[key] = value
+
+    def run_layout(self, app, layout, options):
+        from celery.contrib.testing.worker import start_worker
+
+        n = options['stories']
+        NewsStory.objects.filter(link__startswith=LINK_PREFIX).delete()
+        story_ids = [s.id for s in NewsStory.objects.bulk_create([
+            NewsStory(title=f"Stub story {i}", link=f"{LINK_PREFIX}{i}", datetime='2025-01-01T00:00:00Z',
+                      description='Stub description')
+            for i in range(n)
+        ])]
+
+        lock = threading.Lock()
+        finished = threading.Event()
+        stage_seconds, story_seconds = defaultdict(list), defaultdict(float)
+        in_flight, peak = defaultdict(int), defaultdict(int)
+        dispatched, done, failures = {}, {}, [0]
+
+        def timed(stage, run):
+            def wrapper(news_story_id):
+                with lock:
+                    in_flight[stage] += 1
+                    peak[stage] = max(peak[stage], in_flight[stage])
+                t0 = time.perf_counter()
+                try:
+                    run(news_story_id)
+                except Exception:
+                    with lock:
+                        failures[0] += 1
+                    raise
+                finally:
+                    with lock:
+                        in_flight[stage] -= 1
+                t1 = time.perf_counter()
+                with lock:
+                    stage_seconds[stage].append(t1 - t0)
+                    story_seconds[news_story_id] += t1 - t0
+                    if stage == 'persist':
+                        done[news_story_id] = t1
+                        if len(done) == n:
+                            finished.set()
+            return wrapper
+
+        def get_stock_price(symbol, at=None):
+            time.sleep(options['yahoo_ms'] / 1000)
+            return {'current_price': 100.0}
+
+        universe = _StubUniverse(options['retrieval_ms'] / 1000)
+        with ExitStack() as stack:
+            stack.enter_context(override_settings(TRIAGE_MODE='off', LLM_STREAMING=False))
+            stack.enter_context(mock.patch.dict(
+                pipeline.STAGES, {stage: timed(stage, run) for stage, run in pipeline.STAGES.items()}
+            ))
+            stack.enter_context(mock.patch.object(pipeline, 'get_stock_universe', return_value=universe))
+            stack.enter_context(mock.patch.object(pipeline, 'get_stock_price', get_stock_price))
+            stack.enter_context(mock.patch.object(pipeline, 'enqueue_for_embedding', lambda ids: None))
+            for queue, threads in layout.items():
+                queues = QUEUES if queue == 'all' else [queue]
+                stack.enter_context(start_worker(
+                    app, pool='threads', concurrency=threads, queues=list(queues),
+                    hostname=f"bench-{queue}@localhost", perform_ping_check=False, loglevel='WARNING',
+                ))
+
+            t0 = time.perf_counter()
+            for story_id in story_ids:
+                dispatched[story_id] = time.perf_counter()
+                analyze_news_task.delay(story_id)
+            finished.wait(options['timeout'])
+            wall = time.perf_counter() - t0
+
+        completed = AnalysisRun.objects.filter(news_story_id__in=story_ids, stage='done').count()
+        latencies = np.asarray([done[i] - dispatched[i] for i in done])
+        # Time a story spent queued between stages rather than running one
+        waits = np.asarray([done[i] - dispatched[i] - story_seconds[i] for i in done])
+        name = ', '.join(f"{queue} x{threads}" for queue, threads in layout.items())
+        self.stdout.write(f"{name}:")
+        self.stdout.write(
+            f"  {completed}/{n} done in {wall:6.1f} s: {completed / wall:5.2f} stories/s  "
+            f"latency p50 {np.percentile(latencies, 50) if len(latencies) else float('nan'):5.1f} s  "
+            f"p95 {np.percentile(latencies, 95) if len(latencies) else float('nan'):5.1f} s  "
+            f"queued p50 {np.percentile(waits, 50) if len(waits) else float('nan'):5.1f} s  "
+            f"{failures[0]} stage failures"
+        )
+        self.stdout.write('  stage mean (peak concurrency): ' + '  '.join(
+            f"{stage} {np.mean(seconds) * 1000:.0f} ms ({peak[stage]})"
+            for stage, seconds in stage_seconds.items()
+        ))
+        NewsStory.objects.filter(id__in=story_ids).delete()
+        SymbolRollup.objects.filter(symbol='STUB').delete()
@@ -0,0 +1,58 @@
+import tempfile
+import time
+from datetime import date, timedelta
+
+import numpy as np
+import pandas as pd
+from django.core.management.base import BaseCommand
+
+from ai.utils.price_store import PriceStore, from_day, to_day, update_price_store
+from ai.utils.synthetic import synthetic_bars
+
+
+class Command(BaseCommand):
+    help = "Benchmark price store lookups per second and incremental update time on synthetic data."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--symbols', type=int, default=500)
+        parser.add_argument('--years', type=int, default=5)
+        parser.add_argument('--lookups', type=int, default=200_000)
+
+    def handle(self, *args, **options):
+        symbols = [f"SYM{i}" for i in range(options['symbols'])]
+        today = date.today()
+        start = today - timedelta(days=365 * options['years'])
+        history = synthetic_bars(symbols, start, today - timedelta(days=7))
+        fresh = synthetic_bars(symbols, today - timedelta(days=6), today, seed=1)
+
+        with tempfile.TemporaryDirectory() as path:
+            store = PriceStore(path)
+            t0 = time.perf_counter()
+            store.write_bars(history)
+            self.stdout.write(f"Initial load: {len(history)} bars in {time.perf_counter() - t0:.2f}s")
+
+            # Incremental update only asks for the missing week.
+            requested = []
+
+            def downloader(group, since):
+                requested.append((len(group), since))
+                return fresh[pd.to_datetime(fresh['date']).dt.date >= since]
+
+            t0 = time.perf_counter()
+            written = update_price_store(symbols, store, downloader=downloader, today=today)
+            self.stdout.write(
+                f"Incremental update: {written} bars in {time.perf_counter() - t0:.2f}s "
+                f"({len(requested)} bulk request(s))"
+            )
+
+            rng = np.random.default_rng(2)
+            picks = rng.integers(0, len(symbols), options['lookups'])
+            days = rng.integers(to_day(start), to_day(today) + 1, options['lookups'])
+            queries = [(symbols[s], from_day(d)) for s, d in zip(picks, days)]
+
+            for name, lookup in (('close_asof', store.close_asof), ('price_change', store.price_change)):
+                t0 = time.perf_counter()
+                for symbol, when in queries:
+                    lookup(symbol, when)
+                elapsed = time.perf_counter() - t0
+                self.stdout.write(f"{name}: {len(queries) / elapsed:,.0f} lookups/s")
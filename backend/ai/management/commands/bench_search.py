@@ -0,0 +1,62 @@
+import statistics
+import time
+
+from django.contrib.postgres.search import SearchQuery
+from django.core.management.base import BaseCommand
+from django.db.models import Q
+from django.test import RequestFactory
+
+from ai.models import AnalyzedNews
+from ai.utils.synthetic import seed_news
+from ai.views import SearchView
+
+
+class Command(BaseCommand):
+    help = (
+        "Benchmark /api/search/ against naive icontains filtering. Optionally seeds "
+        "synthetic stories first (use a disposable database)."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--seed', type=int, default=0, help='Synthetic stories to insert first')
+        parser.add_argument('--repeat', type=int, default=5)
+        parser.add_argument('--query', action='append', dest='queries',
+                            help='Query to time (repeatable); defaults to a few finance phrases')
+
+    def handle(self, *args, **options):
+        if options['seed']:
+            t0 = time.perf_counter()
+            seed_news(options['seed'], tag='bench-search')
+            self.stdout.write(f"Seeded {options['seed']:,} stories in {time.perf_counter() - t0:.1f}s")
+        self.stdout.write(f"AnalyzedNews rows: {AnalyzedNews.objects.count():,}")
+
+        factory = RequestFactory()
+        view = SearchView.as_view()
+        # The last default matches a large share of stories, like a common term would
+        default_queries = ['rate hike', 'crude oil', '"bond yield" downgrade',
+                           'bank or shares or profit or growth or sales or tax or oil or rate']
+        for q in options['queries'] or default_queries:
+            matches = AnalyzedNews.objects.filter(search_vector=SearchQuery(q, search_type='websearch', config='english')).count()
+            fts = []
+            for _ in range(options['repeat']):
+                t0 = time.perf_counter()
+                response = view(factory.get('/api/search/', {'q': q}))
+                response.render()
+                fts.append((time.perf_counter() - t0) * 1000)
+
+            words = q.replace('"', '').split()
+            naive = []
+            for _ in range(options['repeat']):
+                condition = Q()
+                for word in words:
+                    condition &= (Q(title__icontains=word) | Q(summary__icontains=word)
+                                  | Q(news_story__description__icontains=word))
+                t0 = time.perf_counter()
+                list(AnalyzedNews.objects.filter(condition).defer('search_vector').order_by('-id')[:20])
+                naive.append((time.perf_counter() - t0) * 1000)
+
+            self.stdout.write(
+                f"{q!r} ({matches:,} matches): search median {statistics.median(fts):.1f} ms "
+                f"(max {max(fts):.1f}); icontains median {statistics.median(naive):.1f} ms "
+                f"(max {max(naive):.1f})"
+            )
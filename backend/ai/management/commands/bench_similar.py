@@ -0,0 +1,66 @@
+import statistics
+import time
+from datetime import datetime, timedelta, timezone
+from types import SimpleNamespace
+
+import chromadb
+import numpy as np
+from django.core.management.base import BaseCommand
+
+from ai.utils.news_index import NewsIndex
+
+
+class Command(BaseCommand):
+    help = (
+        "Benchmark 'similar stories' k-NN latency on an in-process ChromaDB collection "
+        "filled with random unit embeddings."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--stories', type=int, nargs='+', default=[100_000])
+        parser.add_argument('--dim', type=int, default=384, help='Embedding size (all-MiniLM-L6-v2 is 384)')
+        parser.add_argument('--queries', type=int, default=200)
+        parser.add_argument('--k', type=int, default=10)
+
+    def handle(self, *args, **options):
+        rng = np.random.default_rng(0)
+        symbols = [f"SYM{i}" for i in range(500)]
+        now = datetime.now(timezone.utc)
+        for n in options['stories']:
+            # Ephemeral clients share one in-process store, so start each size from empty.
+            client = chromadb.EphemeralClient()
+            if any(c.name == NewsIndex.COLLECTION for c in client.list_collections()):
+                client.delete_collection(NewsIndex.COLLECTION)
+            index = NewsIndex(client=client)
+
+            items = []
+            t0 = time.perf_counter()
+            for start in range(0, n, 5000):
+                count = min(5000, n - start)
+                vectors = rng.normal(size=(count, options['dim'])).astype(np.float32)
+                vectors /= np.linalg.norm(vectors, axis=1, keepdims=True)
+                batch = [
+                    SimpleNamespace(
+                        id=start + i + 1, news_story_id=start + i + 1, summary='synthetic',
+                        published_at=now - timedelta(hours=int(rng.integers(0, 24 * 365))),
+                        tags={'stocks': [{'symbol': symbols[rng.integers(0, len(symbols))]}]},
+                    )
+                    for i in range(count)
+                ]
+                index.upsert(batch, embeddings=vectors.tolist())
+                items.extend(batch[:10])
+            self.stdout.write(f"{n:,} stories indexed in {time.perf_counter() - t0:.1f}s")
+
+            for label, symbol_filter in (('unfiltered', None), ('symbol filter', True)):
+                latencies = []
+                for q in range(options['queries']):
+                    item = items[q % len(items)]
+                    symbols_arg = [item.tags['stocks'][0]['symbol']] if symbol_filter else None
+                    t0 = time.perf_counter()
+                    index.similar(item, k=options['k'], symbols=symbols_arg)
+                    latencies.append((time.perf_counter() - t0) * 1000)
+                latencies.sort()
+                self.stdout.write(
+                    f"  {label}: p50 {statistics.median(latencies):.1f} ms  "
+                    f"p95 {latencies[int(len(latencies) * 0.95) - 1]:.1f} ms"
+                )
@@ -0,0 +1,72 @@
+import json
+import statistics
+import time
+
+from django.core.management.base import BaseCommand
+from django.db import connection
+from django.test import RequestFactory
+
+from ai.models import Stock
+from ai.utils.stocks import compact_tags, get_stock_map, load_stocks
+from ai.utils.synthetic import seed_news
+from ai.views import AnalyzedNewsViewSet
+
+TAG = 'bench-stock-tags'
+
+
+class Command(BaseCommand):
+    help = (
+        "Measure AnalyzedNews row size, table size and /api/analyzed-news/ latency before and "
+        "after compacting stock tags. Seeds rows in the legacy tag layout (use a disposable database)."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--seed', type=int, default=0, help='Legacy-layout stories to insert first')
+        parser.add_argument('--repeat', type=int, default=20)
+
+    def measure(self, label, options):
+        with connection.cursor() as cursor:
+            cursor.execute(
+                "SELECT count(*), avg(pg_column_size(tags)), avg(pg_column_size(a.*)) "
+                "FROM ai_analyzednews a WHERE url LIKE %s",
+                [f"%//{TAG}.local/%"],
+            )
+            rows, tags_bytes, row_bytes = cursor.fetchone()
+            cursor.execute("SELECT sum(pg_total_relation_size(relid)) FROM pg_partition_tree('ai_analyzednews')")
+            table_bytes = int(cursor.fetchone()[0])
+
+        view = AnalyzedNewsViewSet.as_view({'get': 'list'})
+        request = RequestFactory().get('/api/analyzed-news/')
+        timings = []
+        for _ in range(options['repeat']):
+            t0 = time.perf_counter()
+            response = view(request)
+            response.render()
+            timings.append((time.perf_counter() - t0) * 1000)
+        page = json.loads(response.content)['results']
+
+        self.stdout.write(
+            f"{label}: {rows:,} seeded rows, tags {float(tags_bytes or 0):.0f} B/row, "
+            f"row {float(row_bytes or 0):.0f} B/row, table {table_bytes / 1e6:,.1f} MB; "
+            f"list median {statistics.median(timings):.1f} ms (p95 {sorted(timings)[int(len(timings) * 0.95) - 1]:.1f}), "
+            f"{len(response.content) / 1024:.1f} KB for {len(page)} items"
+        )
+
+    def handle(self, *args, **options):
+        if not Stock.objects.exists():
+            self.stdout.write(f"Loaded {load_stocks()} stocks")
+        stocks = get_stock_map()
+        if options['seed']:
+            t0 = time.perf_counter()
+            seed_news(options['seed'], symbols=list(stocks), tag=TAG, stock_metadata=stocks)
+            self.stdout.write(f"Seeded {options['seed']:,} stories in {time.perf_counter() - t0:.1f}s")
+        with connection.cursor() as cursor:
+            cursor.execute("VACUUM FULL ANALYZE ai_analyzednews")
+        self.measure('before', options)
+
+        t0 = time.perf_counter()
+        updated = compact_tags()
+        self.stdout.write(f"Compacted {updated:,} rows in {time.perf_counter() - t0:.1f}s")
+        with connection.cursor() as cursor:
+            cursor.execute("VACUUM FULL ANALYZE ai_analyzednews")
+        self.measure('after', options)
@@ -0,0 +1,207 @@
+import json
+import os
+import re
+import threading
+import time
+import zlib
+from concurrent.futures import ThreadPoolExecutor
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import numpy as np
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.test.utils import override_settings
+
+from ai.utils.openai_utils import CHARS_PER_TOKEN, analyze_news_with_candidates
+from ai.utils.synthetic import synthetic_triage_stories
+from ai.utils.triage import MODES, triage
+
+TITLE_RE = re.compile(r"^Title: (.*)$", re.M)
+FALLBACK_STOCKS = [
+    ('RELIANCE', 'Reliance Industries Limited'), ('TCS', 'Tata Consultancy Services Limited'),
+    ('INFY', 'Infosys Limited'), ('HDFCBANK', 'HDFC Bank Limited'), ('ICICIBANK', 'ICICI Bank Limited'),
+    ('SBIN', 'State Bank of India'), ('ITC', 'ITC Limited'), ('LT', 'Larsen & Toubro Limited'),
+    ('AXISBANK', 'Axis Bank Limited'), ('MARUTI', 'Maruti Suzuki India Limited'),
+]
+
+
+class _StubHTTPServer(ThreadingHTTPServer):
+    daemon_threads = True
+    request_queue_size = 128
+
+
+class StubLLMServer:
+    """
+    OpenAI-compatible chat completions stub.
+
+    Each model answers after ``base_ms + ms_per_token * completion_tokens``
+    scaled by ``time_scale``. The triage model scores a story from its
+    ground-truth label, wrong with probability ``1 - accuracy``. The
+    analysis model returns one signal for relevant stories and none
+    otherwise. Token usage is counted per model.
+    """
+
+    def __init__(self, labels, analysis_model, triage_model, latency, accuracy, time_scale):
+        self.labels = labels
+        self.usage = {model: {'calls': 0, 'prompt_tokens': 0, 'completion_tokens': 0}
+                      for model in (analysis_model, triage_model)}
+        lock = threading.Lock()
+        server = self
+
+        def reply(model, prompt):
+            title = TITLE_RE.search(prompt)
+            relevant = server.labels.get(title.group(1).strip() if title else '', False)
+            if model == triage_model:
+                # Deterministic per story, so every mode sees the same verdicts
+                wrong = zlib.crc32(prompt.encode()) % 1000 >= accuracy * 1000
+                score = 0.9 if relevant != wrong else 0.1
+                return json.dumps({'score': score, 'reason': 'stub'})
+            signals = [{
+                'type': 'buy', 'symbol': 'STUB', 'confidence': 0.7, 'reason': 'Stub signal',
+                'timestamp': '2025-01-01T00:00:00Z',
+            }] if relevant else []
+            news = [{
+                'title': title.group(1) if title else '', 'summary': 'Stub summary ' * 8,
+                'publishedAt': '2025-01-01T00:00:00Z', 'source': 'Stub',
+                'url': 'https://triage.local/', 'tags': {'stocks': ['STUB'] if relevant else [],
+                                                         'sentiment': 'neutral', 'impact': 'low'},
+            }]
+            return json.dumps({'signals': signals, 'news': news})
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_POST(self):
+                request = json.loads(self.rfile.read(int(self.headers['Content-Length'])))
+                model = request['model']
+                prompt = request['messages'][0]['content']
+                content = reply(model, prompt)
+                usage = {'prompt_tokens': len(prompt) // CHARS_PER_TOKEN,
+                         'completion_tokens': len(content) // CHARS_PER_TOKEN}
+                base_ms, ms_per_token = latency[model]
+                time.sleep((base_ms + ms_per_token * usage['completion_tokens']) * time_scale / 1000)
+                with lock:
+                    totals = server.usage.setdefault(model, {'calls': 0, 'prompt_tokens': 0, 'completion_tokens': 0})
+                    totals['calls'] += 1
+                    totals['prompt_tokens'] += usage['prompt_tokens']
+                    totals['completion_tokens'] += usage['completion_tokens']
+                body = json.dumps({
+                    'id': 'stub', 'object': 'chat.completion', 'created': int(time.time()), 'model': model,
+                    'choices': [{'index': 0, 'finish_reason': 'stop',
+                                 'message': {'role': 'assistant', 'content': content}}],
+                    'usage': {**usage, 'total_tokens': sum(usage.values())},
+                }).encode()
+                self.send_response(200)
+                self.send_header('Content-Type', 'application/json')
+                self.send_header('Content-Length', str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, format, *args):
+                pass
+
+        self.httpd = _StubHTTPServer(('127.0.0.1', 0), Handler)
+        self.port = self.httpd.server_address[1]
+        self.thread = threading.Thread(target=self.httpd.serve_forever, daemon=True)
+
+    def __enter__(self):
+        self.thread.start()
+        return self
+
+    def __exit__(self, *exc):
+        self.httpd.shutdown()
+        self.httpd.server_close()
+
+
+def _pair(value):
+    first, second = (float(v) for v in value.split(','))
+    return first, second
+
+
+class Command(BaseCommand):
+    help = (
+        "Benchmark the triage cascade against a stub OpenAI server that simulates the triage and "
+        "analysis models' latencies. Reports per-story latency, model calls, recall of relevant "
+        "stories and LLM cost per 1,000 stories for each triage mode."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--stories', type=int, default=1000)
+        parser.add_argument('--relevant-share', type=float, default=0.3)
+        parser.add_argument('--modes', default=','.join(MODES), help=f"Comma-separated subset of: {', '.join(MODES)}")
+        parser.add_argument('--concurrency', type=int, default=64)
+        parser.add_argument('--triage-accuracy', type=float, default=0.9)
+        parser.add_argument('--analysis-latency', type=_pair, default=(800, 30),
+                            help='Analysis model base ms and ms per output token')
+        parser.add_argument('--triage-latency', type=_pair, default=(250, 5),
+                            help='Triage model base ms and ms per output token')
+        parser.add_argument('--analysis-price', type=_pair, default=(30, 60),
+                            help='Analysis model USD per 1M input and output tokens')
+        parser.add_argument('--triage-price', type=_pair, default=(0.15, 0.6),
+                            help='Triage model USD per 1M input and output tokens')
+        parser.add_argument('--time-scale', type=float, default=0.25,
+                            help='Multiplier on simulated latencies; results are reported unscaled')
+        parser.add_argument('--seed', type=int, default=0)
+
+    def handle(self, *args, **options):
+        modes = [m for m in options['modes'].split(',') if m]
+        if set(modes) - set(MODES):
+            raise CommandError(f"Unknown modes: {', '.join(sorted(set(modes) - set(MODES)))}")
+        from ai.models import Stock
+
+        stocks = list(Stock.objects.values_list('symbol', 'company_name')[:2000]) or FALLBACK_STOCKS
+        symbols = {symbol for symbol, _ in stocks}
+        stories = synthetic_triage_stories(options['stories'], stocks, options['relevant_share'], options['seed'])
+        labels = {news['title']: relevant for news, _, relevant in stories}
+        analysis_model, triage_model = settings.ANALYSIS_MODEL, settings.TRIAGE_MODEL
+        latency = {analysis_model: options['analysis_latency'], triage_model: options['triage_latency']}
+        prices = {analysis_model: options['analysis_price'], triage_model: options['triage_price']}
+        scale = options['time_scale']
+        self.stdout.write(
+            f"{len(stories):,} stories, {sum(labels.values())} relevant; "
+            f"{analysis_model} vs {triage_model} at {options['concurrency']} concurrent stories"
+        )
+
+        saved_env = {key: os.environ.get(key) for key in ('OPENAI_BASE_URL', 'OPENAI_API_KEY')}
+        with StubLLMServer(labels, analysis_model, triage_model, latency, options['triage_accuracy'], scale) as stub:
+            os.environ.update(OPENAI_BASE_URL=f"http://127.0.0.1:{stub.port}/v1", OPENAI_API_KEY='stub')
+            try:
+                for mode in modes:
+                    self.run_mode(mode, stories, symbols, stub, prices, scale, options['concurrency'])
+            finally:
+                for key, value in saved_env.items():
+                    if value is None:
+                        os.environ.pop(key, None)
+                    else:
+                        os.environ[key] = value
+
+    def run_mode(self, mode, stories, symbols, stub, prices, scale, concurrency):
+        for totals in stub.usage.values():
+            totals.update(calls=0, prompt_tokens=0, completion_tokens=0)
+
+        def process(story):
+            news, candidates, relevant = story
+            t0 = time.perf_counter()
+            result = triage(news, candidates, mode=mode, symbols=symbols)
+            if result.passed:
+                analyze_news_with_candidates([news], candidates)
+            return relevant, result.passed, (time.perf_counter() - t0) / scale
+
+        with override_settings(TRIAGE_MODE=mode):
+            t0 = time.perf_counter()
+            with ThreadPoolExecutor(max_workers=concurrency) as pool:
+                outcomes = list(pool.map(process, stories))
+            wall = (time.perf_counter() - t0) / scale
+
+        relevant = sum(1 for r, _, _ in outcomes if r)
+        kept = sum(1 for r, passed, _ in outcomes if r and passed)
+        analyzed = sum(1 for _, passed, _ in outcomes if passed)
+        latencies = np.asarray([seconds for _, _, seconds in outcomes])
+        cost = sum(
+            (usage['prompt_tokens'] * prices[model][0] + usage['completion_tokens'] * prices[model][1]) / 1e6
+            for model, usage in stub.usage.items()
+        ) * 1000 / len(stories)
+        calls = ', '.join(f"{model} {usage['calls']}" for model, usage in stub.usage.items())
+        self.stdout.write(
+            f"{mode:>9}: ${cost:6.2f}/1k stories  latency mean {latencies.mean():5.2f}s  "
+            f"p95 {np.percentile(latencies, 95):5.2f}s  wall {wall:6.1f}s  analyzed {analyzed}  "
+            f"recall {kept / relevant if relevant else 1:.1%}  calls: {calls}"
+        )
@@ -0,0 +1,31 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from ai.models import AnalyzedNews
+from ai.utils.news_index import NewsIndex
+
+
+class Command(BaseCommand):
+    help = "Backfill the analyzed_news vector collection in batches, resuming from --after-id."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=256)
+        parser.add_argument('--after-id', type=int, default=0, help='Only embed rows with a larger id')
+
+    def handle(self, *args, **options):
+        index = NewsIndex()
+        if not index.collection:
+            raise CommandError("ChromaDB news collection not available")
+
+        last_id = options['after_id']
+        total = 0
+        fields = ('id', 'news_story_id', 'summary', 'published_at', 'tags')
+        while True:
+            batch = list(
+                AnalyzedNews.objects.filter(id__gt=last_id).order_by('id').only(*fields)[:options['batch_size']]
+            )
+            if not batch:
+                break
+            total += index.upsert(batch)
+            last_id = batch[-1].id
+            self.stdout.write(f"Embedded {total} rows (last id {last_id})")
+        self.stdout.write(self.style.SUCCESS(f"Backfill complete: {total} rows embedded."))
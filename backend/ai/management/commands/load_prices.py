@@ -0,0 +1,29 @@
+import pandas as pd
+from django.core.management.base import BaseCommand, CommandError
+
+from ai.utils.price_store import FIELDS, PriceStore, load_universe_symbols, update_price_store
+
+
+class Command(BaseCommand):
+    help = (
+        "Fill the local price store. With --csv, seed it offline from a long-format "
+        "file (symbol,date,open,high,low,close,volume); otherwise download missing bars."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--csv', help='Seed bars from this CSV instead of Yahoo')
+        parser.add_argument('--path', help='Store directory (defaults to PRICE_STORE_DIR)')
+
+    def handle(self, *args, **options):
+        store = PriceStore(options['path'])
+        if options['csv']:
+            bars = pd.read_csv(options['csv'])
+            missing = {'symbol', 'date', *FIELDS} - set(bars.columns)
+            if missing:
+                raise CommandError(f"CSV is missing columns: {', '.join(sorted(missing))}")
+            written = store.write_bars(bars)
+        else:
+            written = update_price_store(load_universe_symbols(), store)
+        self.stdout.write(self.style.SUCCESS(
+            f"Wrote {written} bars; store holds {len(store.symbols)} symbols over {store.n_days} days."
+        ))
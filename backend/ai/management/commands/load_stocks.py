@@ -0,0 +1,14 @@
+from django.core.management.base import BaseCommand
+
+from ai.utils.stocks import load_stocks
+
+
+class Command(BaseCommand):
+    help = "Load or refresh the Stock reference table from data/stock_universe.csv."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--csv', help='CSV with CompanyName, Industry, Symbol, Series and ISIN Code columns')
+
+    def handle(self, *args, **options):
+        count = load_stocks(options['csv'])
+        self.stdout.write(f"Loaded {count} stocks")
@@ -0,0 +1,149 @@
+import json
+import time
+from datetime import date, timedelta
+from urllib.parse import quote
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+
+from ai.models import Signal
+from ai.utils.loadtest import LocalServer, check_thresholds, peak_rss_mb, run_scenario
+from ai.utils.partitions import PARTITIONED_TABLES, ensure_partitions
+from ai.utils.synthetic import WORDS, seed_news_rows, seed_signal_rows
+from scrapy.models import NewsStory
+
+TAG = 'loadtest'
+SYMBOLS = ('RELIANCE', 'TCS', 'INFY', 'HDFCBANK', 'ICICIBANK', 'SBIN', 'ITC', 'LT', 'AXISBANK', 'MARUTI')
+
+SCENARIOS = {
+    'signals-list': lambda ids: lambda rng: f"/api/signals/?page={rng.randint(1, 5)}",
+    'signals-detail': lambda ids: lambda rng: f"/api/signals/{rng.choice(ids['ai_signal'])}/",
+    'news-list': lambda ids: lambda rng: f"/api/analyzed-news/?page={rng.randint(1, 5)}",
+    'news-list-light': lambda ids: lambda rng: f"/api/analyzed-news/?view=list&page={rng.randint(1, 5)}",
+    'news-detail': lambda ids: lambda rng: f"/api/analyzed-news/{rng.choice(ids['ai_analyzednews'])}/",
+    'news-search': lambda ids: lambda rng: f"/api/search/?q={quote(rng.choice(WORDS))}",
+}
+THRESHOLDS = ('max_p95_ms', 'max_p99_ms', 'min_rps', 'max_queries_per_request', 'max_error_rate')
+
+
+def _sample_ids(table, n=1000):
+    """Ids spread across ``table`` without a full scan; falls back to the newest rows."""
+    with connection.cursor() as cursor:
+        cursor.execute(f'SELECT id FROM "{table}" TABLESAMPLE SYSTEM (1) LIMIT %s', [n])
+        ids = [row[0] for row in cursor.fetchall()]
+        if len(ids) < 100:
+            cursor.execute(f'SELECT id FROM "{table}" ORDER BY id DESC LIMIT %s', [n])
+            ids = [row[0] for row in cursor.fetchall()]
+    return ids
+
+
+class Command(BaseCommand):
+    help = (
+        "Load-test the API locally: top up a synthetic dataset to the requested size, serve the "
+        "WSGI app in-process and drive list, detail and search endpoints at each concurrency. "
+        "Reports RPS, latency percentiles, queries per request and peak memory, and exits non-zero "
+        "when a threshold is breached. Use a disposable database."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--news', type=int, default=0,
+                            help='Target number of synthetic stories (each with analyzed news)')
+        parser.add_argument('--signals', type=int, default=0, help='Target number of synthetic signals')
+        parser.add_argument('--days', type=int, default=365, help='History the seeded rows span')
+        parser.add_argument('--scenarios', default=','.join(SCENARIOS),
+                            help=f"Comma-separated subset of: {', '.join(SCENARIOS)}")
+        parser.add_argument('--concurrency', default='1,8,32', help='Comma-separated client counts')
+        parser.add_argument('--duration', type=float, default=10.0, help='Seconds per scenario and concurrency')
+        parser.add_argument('--requests', type=int, help='Stop a run after this many requests')
+        parser.add_argument('--max-p95-ms', type=float)
+        parser.add_argument('--max-p99-ms', type=float)
+        parser.add_argument('--min-rps', type=float)
+        parser.add_argument('--max-queries-per-request', type=float)
+        parser.add_argument('--max-error-rate', type=float, default=0.0)
+        parser.add_argument('--max-peak-rss-mb', type=float)
+        parser.add_argument('--thresholds', help='JSON file of per-scenario overrides, e.g. '
+                                                 '{"news-search": {"max_p95_ms": 300}}')
+        parser.add_argument('--output', help='Write the results as JSON to this path')
+
+    def seed(self, options):
+        if options['news'] or options['signals']:
+            since = date.today() - timedelta(days=options['days'])
+            for table in PARTITIONED_TABLES:
+                ensure_partitions(table, since=since)
+
+        stories = NewsStory.objects.filter(link__startswith=f"https://{TAG}.local/news/bulk/")
+        existing = stories.count()
+        if options['news'] > existing:
+            t0 = time.perf_counter()
+            seed_news_rows(options['news'] - existing, symbols=SYMBOLS, days=options['days'], tag=TAG,
+                           start=existing)
+            self.stdout.write(f"Seeded {options['news'] - existing:,} stories in {time.perf_counter() - t0:.1f}s")
+
+        existing = Signal.objects.filter(reason=TAG).count()
+        if options['signals'] > existing:
+            story_ids = list(stories.values_list('id', flat=True)[:10_000])
+            if not story_ids:
+                raise CommandError("Seeding signals needs synthetic stories; pass --news as well")
+            t0 = time.perf_counter()
+            seed_signal_rows(options['signals'] - existing, story_ids, symbols=SYMBOLS, days=options['days'],
+                             reason=TAG)
+            self.stdout.write(f"Seeded {options['signals'] - existing:,} signals in {time.perf_counter() - t0:.1f}s")
+
+        with connection.cursor() as cursor:
+            for table in PARTITIONED_TABLES:
+                cursor.execute(f'ANALYZE "{table}"')
+
+    def handle(self, *args, **options):
+        from core.wsgi import application
+
+        names = [name for name in options['scenarios'].split(',') if name]
+        unknown = set(names) - set(SCENARIOS)
+        if unknown:
+            raise CommandError(f"Unknown scenarios: {', '.join(sorted(unknown))}")
+        overrides = {}
+        if options['thresholds']:
+            with open(options['thresholds']) as f:
+                overrides = json.load(f)
+        defaults = {key: options[key] for key in THRESHOLDS}
+
+        self.seed(options)
+        ids = {table: _sample_ids(table) for table in PARTITIONED_TABLES}
+        if not all(ids.values()):
+            raise CommandError("No signals or analyzed news to test against; seed with --news/--signals")
+        with connection.cursor() as cursor:
+            for table in PARTITIONED_TABLES:
+                cursor.execute(f'SELECT count(*) FROM "{table}"')
+                self.stdout.write(f"{table}: {cursor.fetchone()[0]:,} rows")
+        # Server threads open their own connections; don't hold this one open for the whole run.
+        connection.close()
+
+        results, breaches = [], []
+        with LocalServer(application) as server:
+            for concurrency in [int(c) for c in options['concurrency'].split(',') if c]:
+                for name in names:
+                    result = run_scenario(name, server.port, SCENARIOS[name](ids), concurrency,
+                                          options['duration'], options['requests'])
+                    summary = {'scenario': name, 'concurrency': concurrency, **result.summary()}
+                    results.append(summary)
+                    self.stdout.write(
+                        f"{name:16} c={concurrency:<3} {summary['rps']:8.1f} rps  "
+                        f"p50 {summary['p50_ms']:7.1f}  p95 {summary['p95_ms']:7.1f}  "
+                        f"p99 {summary['p99_ms']:7.1f}  max {summary['max_ms']:7.1f} ms  "
+                        f"{summary['queries_per_request']:4.1f} q/req  "
+                        f"{summary['errors']}/{summary['requests']} errors"
+                    )
+                    limits = {**defaults, **overrides.get(name, {})}
+                    for breach in check_thresholds(summary, limits):
+                        breaches.append(f"{name} c={concurrency}: {breach}")
+
+        peak = peak_rss_mb()
+        self.stdout.write(f"Peak RSS (server and clients): {peak:,.1f} MB")
+        if options['max_peak_rss_mb'] is not None and peak > options['max_peak_rss_mb']:
+            breaches.append(f"peak RSS {peak:.1f} MB > {options['max_peak_rss_mb']}")
+
+        if options['output']:
+            with open(options['output'], 'w') as f:
+                json.dump({'results': results, 'peak_rss_mb': peak, 'breaches': breaches}, f, indent=2)
+        if breaches:
+            raise CommandError("Thresholds breached:\n  " + "\n  ".join(breaches))
+        self.stdout.write(self.style.SUCCESS("All thresholds met"))
@@ -0,0 +1,33 @@
+from django.core.management.base import BaseCommand
+from django.db import connection, transaction
+
+from ai.models import AnalyzedNews, Signal, SymbolRollup
+from ai.utils.rollups import RollupDeltas
+
+
+class Command(BaseCommand):
+    help = "Rebuild the per-symbol rollup table from AnalyzedNews and Signal rows."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--chunk-size', type=int, default=2000)
+
+    def handle(self, *args, **options):
+        chunk_size = options['chunk_size']
+        rollups = RollupDeltas()
+        with transaction.atomic():
+            # run_persist applies its deltas with row-exclusive writes to the rollup table, which
+            # this lock blocks. A persist that already wrote its deltas has committed before the
+            # lock is granted, so the scans below see its rows; one that hasn't waits and applies
+            # them on top of the rebuilt table. Persisting stalls for the length of the rebuild.
+            with connection.cursor() as cursor:
+                cursor.execute(f'LOCK TABLE {SymbolRollup._meta.db_table} IN SHARE ROW EXCLUSIVE MODE')
+            news_rows = AnalyzedNews.objects.values_list('tags', 'published_at').iterator(chunk_size=chunk_size)
+            for tags, published_at in news_rows:
+                rollups.add_news(tags, published_at)
+            signal_rows = Signal.objects.values_list('symbol', 'type', 'timestamp').iterator(chunk_size=chunk_size)
+            for symbol, signal_type, timestamp in signal_rows:
+                rollups.add_signal(symbol, signal_type, timestamp)
+
+            SymbolRollup.objects.all().delete()
+            created = SymbolRollup.objects.bulk_create(rollups.rows(), batch_size=chunk_size)
+        self.stdout.write(self.style.SUCCESS(f"Rebuilt {len(created)} rollup rows."))
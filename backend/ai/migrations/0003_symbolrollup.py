@@ -0,0 +1,34 @@
+# Generated by Django 5.2.18 on 2026-10-19 15:03
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('ai', '0002_alter_signal_type'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='SymbolRollup',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('symbol', models.CharField(max_length=10)),
+                ('granularity', models.CharField(choices=[('1h', 'Hourly'), ('1d', 'Daily'), ('1w', 'Weekly')], max_length=2)),
+                ('bucket_start', models.DateTimeField()),
+                ('news_count', models.PositiveIntegerField(default=0)),
+                ('positive_count', models.PositiveIntegerField(default=0)),
+                ('negative_count', models.PositiveIntegerField(default=0)),
+                ('neutral_count', models.PositiveIntegerField(default=0)),
+                ('impact_score', models.PositiveIntegerField(default=0)),
+                ('signal_count', models.PositiveIntegerField(default=0)),
+                ('buy_count', models.PositiveIntegerField(default=0)),
+                ('sell_count', models.PositiveIntegerField(default=0)),
+            ],
+            options={
+                'indexes': [models.Index(fields=['granularity', 'bucket_start'], name='ai_rollup_gran_bucket_idx')],
+                'constraints': [models.UniqueConstraint(fields=('symbol', 'granularity', 'bucket_start'), name='unique_symbol_rollup_bucket')],
+            },
+        ),
+    ]
@@ -0,0 +1,74 @@
+# Generated by Django 5.2.18 on 2026-10-19 15:04
+
+import django.contrib.postgres.indexes
+import django.contrib.postgres.search
+from django.db import migrations
+
+SEARCH_VECTOR_SQL = """
+CREATE OR REPLACE FUNCTION ai_analyzednews_search_vector_update() RETURNS trigger AS $$
+BEGIN
+    NEW.search_vector :=
+        setweight(to_tsvector('english', coalesce(NEW.title, '')), 'A') ||
+        setweight(to_tsvector('english', coalesce(NEW.summary, '')), 'B') ||
+        setweight(to_tsvector('english', coalesce((
+            SELECT string_agg(point, ' ')
+            FROM jsonb_array_elements_text(
+                CASE WHEN jsonb_typeof(NEW.tags -> 'key_points') = 'array'
+                     THEN NEW.tags -> 'key_points' ELSE '[]'::jsonb END
+            ) AS point
+        ), '')), 'B') ||
+        setweight(to_tsvector('english', coalesce((
+            SELECT description FROM scrapy_newsstory WHERE id = NEW.news_story_id
+        ), '')), 'C');
+    RETURN NEW;
+END
+$$ LANGUAGE plpgsql;
+
+CREATE TRIGGER ai_analyzednews_search_vector_trigger
+    BEFORE INSERT OR UPDATE OF title, summary, tags, news_story_id ON ai_analyzednews
+    FOR EACH ROW EXECUTE FUNCTION ai_analyzednews_search_vector_update();
+
+-- Re-index analyzed rows when their story's description changes.
+CREATE OR REPLACE FUNCTION scrapy_newsstory_search_vector_refresh() RETURNS trigger AS $$
+BEGIN
+    UPDATE ai_analyzednews SET title = title WHERE news_story_id = NEW.id;
+    RETURN NULL;
+END
+$$ LANGUAGE plpgsql;
+
+CREATE TRIGGER scrapy_newsstory_search_vector_trigger
+    AFTER UPDATE OF description ON scrapy_newsstory
+    FOR EACH ROW WHEN (OLD.description IS DISTINCT FROM NEW.description)
+    EXECUTE FUNCTION scrapy_newsstory_search_vector_refresh();
+
+-- Backfill existing rows through the trigger.
+UPDATE ai_analyzednews SET title = title;
+"""
+
+DROP_SEARCH_VECTOR_SQL = """
+DROP TRIGGER IF EXISTS scrapy_newsstory_search_vector_trigger ON scrapy_newsstory;
+DROP FUNCTION IF EXISTS scrapy_newsstory_search_vector_refresh();
+DROP TRIGGER IF EXISTS ai_analyzednews_search_vector_trigger ON ai_analyzednews;
+DROP FUNCTION IF EXISTS ai_analyzednews_search_vector_update();
+"""
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('ai', '0003_symbolrollup'),
+        ('scrapy', '0002_delete_scheduledtask'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='analyzednews',
+            name='search_vector',
+            field=django.contrib.postgres.search.SearchVectorField(editable=False, null=True),
+        ),
+        migrations.RunSQL(SEARCH_VECTOR_SQL, DROP_SEARCH_VECTOR_SQL),
+        migrations.AddIndex(
+            model_name='analyzednews',
+            index=django.contrib.postgres.indexes.GinIndex(fields=['search_vector'], name='ai_analyzednews_search_gin'),
+        ),
+    ]
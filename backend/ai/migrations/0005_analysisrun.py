@@ -0,0 +1,30 @@
+# Generated by Django 5.2.18 on 2026-10-19 15:10
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('ai', '0004_analyzednews_search_vector'),
+        ('scrapy', '0002_delete_scheduledtask'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='AnalysisRun',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('stage', models.CharField(choices=[('retrieval', 'Candidate retrieval'), ('llm', 'LLM analysis'), ('prices', 'Price enrichment'), ('persist', 'Persistence'), ('done', 'Done')], default='retrieval', max_length=10)),
+                ('candidates', models.JSONField(blank=True, null=True)),
+                ('llm_result', models.JSONField(blank=True, null=True)),
+                ('enriched', models.JSONField(blank=True, null=True)),
+                ('attempts', models.PositiveIntegerField(default=0)),
+                ('last_error', models.TextField(blank=True)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('news_story', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, related_name='analysis_run', to='scrapy.newsstory')),
+            ],
+        ),
+    ]
@@ -0,0 +1,136 @@
+from datetime import date
+
+from django.db import migrations
+
+# table -> partition column
+TABLES = {
+    'ai_signal': 'timestamp',
+    'ai_analyzednews': 'published_at',
+}
+MONTHS_AHEAD = 3
+# Rows older than this stay in the default partition instead of getting one partition each
+MAX_MONTHS_BACK = 120
+
+
+def _add_months(month, n):
+    index = month.year * 12 + month.month - 1 + n
+    return date(index // 12, index % 12 + 1, 1)
+
+
+def _fetch(cursor, sql, params=None):
+    cursor.execute(sql, params)
+    return [row[0] for row in cursor.fetchall()]
+
+
+def _rows(cursor, sql, params):
+    cursor.execute(sql, params)
+    return cursor.fetchall()
+
+
+def _swap_table(cursor, table, partition_by=None):
+    """
+    Rebuild ``table`` as a partitioned (or, in reverse, plain) table in place.
+
+    Secondary indexes, foreign keys and triggers are recreated from their
+    original definitions, so they keep their names. The primary key becomes
+    ``(id, <partition column>)``, as Postgres requires the partition key in
+    every unique constraint.
+    """
+    column = TABLES[table]
+    old = f"{table}_old"
+    index_defs = _fetch(
+        cursor,
+        "SELECT pg_get_indexdef(indexrelid) FROM pg_index "
+        "WHERE indrelid = %s::regclass AND NOT indisprimary "
+        "AND indexrelid NOT IN (SELECT conindid FROM pg_constraint WHERE conrelid = %s::regclass)",
+        [table, table],
+    )
+    constraint_defs = [
+        f'ALTER TABLE "{table}" ADD CONSTRAINT "{name}" {definition}'
+        for name, definition in _rows(
+            cursor,
+            "SELECT conname, pg_get_constraintdef(oid) FROM pg_constraint "
+            "WHERE conrelid = %s::regclass AND contype IN ('f', 'c')",
+            [table],
+        )
+    ]
+    trigger_defs = _fetch(
+        cursor,
+        "SELECT pg_get_triggerdef(oid) FROM pg_trigger WHERE tgrelid = %s::regclass AND NOT tgisinternal",
+        [table],
+    )
+    old_sequence = _fetch(cursor, "SELECT pg_get_serial_sequence(%s, 'id')", [table])[0]
+
+    cursor.execute(f'ALTER TABLE "{table}" RENAME TO "{old}"')
+    cursor.execute(f'ALTER TABLE "{old}" RENAME CONSTRAINT "{table}_pkey" TO "{old}_pkey"')
+    partition_clause = f'PARTITION BY RANGE ("{column}")' if partition_by else ''
+    cursor.execute(
+        f'CREATE TABLE "{table}" (LIKE "{old}" INCLUDING DEFAULTS INCLUDING IDENTITY) {partition_clause}'
+    )
+    primary_key = f'id, "{column}"' if partition_by else 'id'
+    cursor.execute(f'ALTER TABLE "{table}" ADD CONSTRAINT "{table}_pkey" PRIMARY KEY ({primary_key})')
+    if partition_by:
+        _create_initial_partitions(cursor, table, old, column)
+
+    cursor.execute(f'INSERT INTO "{table}" OVERRIDING SYSTEM VALUE SELECT * FROM "{old}"')
+    new_sequence = _fetch(cursor, "SELECT pg_get_serial_sequence(%s, 'id')", [table])[0]
+    if new_sequence is None:
+        # A serial (non-identity) id: the copied default still points at the old sequence.
+        cursor.execute(f'ALTER SEQUENCE {old_sequence} OWNED BY "{table}".id')
+    else:
+        cursor.execute(
+            f"SELECT setval(%s, coalesce((SELECT max(id) FROM \"{table}\"), 0) + 1, false)",
+            [new_sequence],
+        )
+    cursor.execute(f'DROP TABLE "{old}"')
+    if new_sequence is not None and old_sequence is not None:
+        cursor.execute(f"ALTER SEQUENCE {new_sequence} RENAME TO {old_sequence.split('.')[-1]}")
+
+    for statement in index_defs + constraint_defs + trigger_defs:
+        cursor.execute(statement)
+
+
+def _create_initial_partitions(cursor, table, source, column):
+    """Monthly partitions for the existing rows through ``MONTHS_AHEAD``, plus a default."""
+    today = date.today()
+    current = date(today.year, today.month, 1)
+    oldest = _fetch(cursor, f'SELECT min("{column}") FROM "{source}"')[0]
+    first = max(
+        date(oldest.year, oldest.month, 1) if oldest else current,
+        _add_months(current, -MAX_MONTHS_BACK),
+    )
+    month = min(first, current)
+    while month <= _add_months(current, MONTHS_AHEAD):
+        end = _add_months(month, 1)
+        cursor.execute(
+            f'CREATE TABLE "{table}_p{month:%Y_%m}" PARTITION OF "{table}" '
+            f"FOR VALUES FROM ('{month} 00:00:00+00') TO ('{end} 00:00:00+00')"
+        )
+        month = end
+    cursor.execute(f'CREATE TABLE "{table}_default" PARTITION OF "{table}" DEFAULT')
+
+
+def partition_tables(apps, schema_editor):
+    with schema_editor.connection.cursor() as cursor:
+        for table in TABLES:
+            _swap_table(cursor, table, partition_by=TABLES[table])
+            # Recent-window scans and ORDER BY <time> DESC within the pruned partitions
+            cursor.execute(f'CREATE INDEX "{table}_{TABLES[table]}_idx" ON "{table}" ("{TABLES[table]}")')
+
+
+def unpartition_tables(apps, schema_editor):
+    with schema_editor.connection.cursor() as cursor:
+        for table in TABLES:
+            cursor.execute(f'DROP INDEX "{table}_{TABLES[table]}_idx"')
+            _swap_table(cursor, table)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('ai', '0006_archivedpartition'),
+    ]
+
+    operations = [
+        migrations.RunPython(partition_tables, unpartition_tables),
+    ]
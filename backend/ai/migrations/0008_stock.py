@@ -0,0 +1,24 @@
+# Generated by Django 5.2.18 on 2026-10-19 15:30
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('ai', '0007_partition_time_series'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='Stock',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('symbol', models.CharField(max_length=20, unique=True)),
+                ('company_name', models.CharField(max_length=200)),
+                ('industry', models.CharField(blank=True, max_length=100)),
+                ('series', models.CharField(blank=True, max_length=10)),
+                ('isin', models.CharField(blank=True, max_length=12)),
+            ],
+        ),
+    ]
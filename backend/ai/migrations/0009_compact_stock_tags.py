@@ -0,0 +1,45 @@
+from django.db import migrations
+
+BATCH_SIZE = 10_000
+
+# Keep only symbol and price of each tagged stock and drop matched_stocks.
+# A snapshot of ai.utils.stocks.COMPACT_TAGS_SQL as of this migration.
+COMPACT_TAGS_SQL = """
+UPDATE ai_analyzednews SET tags = (tags - 'matched_stocks') || jsonb_build_object('stocks', coalesce((
+    SELECT jsonb_agg(CASE WHEN jsonb_typeof(stock) = 'object'
+                          THEN jsonb_strip_nulls(jsonb_build_object('symbol', stock -> 'symbol', 'price', stock -> 'price'))
+                          ELSE stock END ORDER BY position)
+    FROM jsonb_array_elements(CASE WHEN jsonb_typeof(tags -> 'stocks') = 'array'
+                                   THEN tags -> 'stocks' ELSE '[]'::jsonb END) WITH ORDINALITY AS s(stock, position)
+), '[]'::jsonb))
+WHERE id >= %s AND id < %s AND (
+    tags ? 'matched_stocks' OR EXISTS (
+        SELECT 1 FROM jsonb_array_elements(CASE WHEN jsonb_typeof(tags -> 'stocks') = 'array'
+                                                THEN tags -> 'stocks' ELSE '[]'::jsonb END) AS stock
+        WHERE jsonb_typeof(stock) = 'object' AND stock - 'symbol' - 'price' <> '{}'::jsonb
+    )
+)
+"""
+
+
+def compact(apps, schema_editor):
+    with schema_editor.connection.cursor() as cursor:
+        cursor.execute("SELECT min(id), max(id) FROM ai_analyzednews")
+        low, high = cursor.fetchone()
+        if low is None:
+            return
+        for start in range(low, high + 1, BATCH_SIZE):
+            cursor.execute(COMPACT_TAGS_SQL, [start, start + BATCH_SIZE])
+
+
+class Migration(migrations.Migration):
+    # Each batch commits on its own instead of holding every row lock until the end
+    atomic = False
+
+    dependencies = [
+        ('ai', '0008_stock'),
+    ]
+
+    operations = [
+        migrations.RunPython(compact, migrations.RunPython.noop),
+    ]
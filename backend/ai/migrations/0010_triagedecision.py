@@ -0,0 +1,36 @@
+# Generated by Django 5.2.18 on 2026-10-19 15:54
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('ai', '0009_compact_stock_tags'),
+        ('scrapy', '0003_articlebody'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='analysisrun',
+            name='stage',
+            field=models.CharField(choices=[('retrieval', 'Candidate retrieval'), ('triage', 'Triage'), ('llm', 'LLM analysis'), ('prices', 'Price enrichment'), ('persist', 'Persistence'), ('done', 'Done')], default='retrieval', max_length=10),
+        ),
+        migrations.CreateModel(
+            name='TriageDecision',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('tier', models.CharField(choices=[('heuristic', 'Heuristic'), ('model', 'Model')], max_length=10)),
+                ('model', models.CharField(blank=True, max_length=50)),
+                ('score', models.FloatField(null=True)),
+                ('passed', models.BooleanField(null=True)),
+                ('reason', models.TextField(blank=True)),
+                ('features', models.JSONField(blank=True, default=dict)),
+                ('thresholds', models.JSONField(default=dict)),
+                ('latency_ms', models.FloatField(default=0)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('news_story', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='triage_decisions', to='scrapy.newsstory')),
+            ],
+        ),
+    ]
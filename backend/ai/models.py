@@ -1,8 +1,21 @@
+from django.contrib.postgres.indexes import GinIndex
+from django.contrib.postgres.search import SearchVectorField
 from django.db import models
 from scrapy.models import NewsStory
 
 # Create your models here.
 
+class Stock(models.Model):
+    """Reference data for one listed stock, loaded from ``data/stock_universe.csv``."""
+    symbol = models.CharField(max_length=20, unique=True)
+    company_name = models.CharField(max_length=200)
+    industry = models.CharField(max_length=100, blank=True)
+    series = models.CharField(max_length=10, blank=True)
+    isin = models.CharField(max_length=12, blank=True)
+
+    def __str__(self):
+        return self.symbol
+
 class Signal(models.Model):
     SIGNAL_TYPES = (('buy', 'Buy'), ('sell', 'Sell'), ('entry', 'Entry'))
     news_story = models.ForeignKey(NewsStory, on_delete=models.CASCADE)
@@ -21,4 +34,105 @@ class AnalyzedNews(models.Model):
     published_at = models.DateTimeField()
     source = models.CharField(max_length=100)
     url = models.URLField()
+    # ``stocks`` holds ``{"symbol", "price"}`` only; company metadata comes from ``Stock``
     tags = models.JSONField()
+    # Maintained by a database trigger from title, summary, key points and the story description
+    search_vector = SearchVectorField(null=True, editable=False)
+
+    class Meta:
+        indexes = [
+            GinIndex(fields=['search_vector'], name='ai_analyzednews_search_gin'),
+        ]
+
+
+class SymbolRollup(models.Model):
+    """Per-symbol news and signal counters for one time bucket."""
+    GRANULARITIES = (('1h', 'Hourly'), ('1d', 'Daily'), ('1w', 'Weekly'))
+    symbol = models.CharField(max_length=10)
+    granularity = models.CharField(max_length=2, choices=GRANULARITIES)
+    bucket_start = models.DateTimeField()
+    news_count = models.PositiveIntegerField(default=0)
+    positive_count = models.PositiveIntegerField(default=0)
+    negative_count = models.PositiveIntegerField(default=0)
+    neutral_count = models.PositiveIntegerField(default=0)
+    impact_score = models.PositiveIntegerField(default=0)
+    signal_count = models.PositiveIntegerField(default=0)
+    buy_count = models.PositiveIntegerField(default=0)
+    sell_count = models.PositiveIntegerField(default=0)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=['symbol', 'granularity', 'bucket_start'], name='unique_symbol_rollup_bucket'),
+        ]
+        indexes = [
+            models.Index(fields=['granularity', 'bucket_start'], name='ai_rollup_gran_bucket_idx'),
+        ]
+
+
+class AnalysisRun(models.Model):
+    """Checkpointed progress of one story through the staged analysis pipeline."""
+    STAGES = (
+        ('retrieval', 'Candidate retrieval'),
+        ('triage', 'Triage'),
+        ('llm', 'LLM analysis'),
+        ('prices', 'Price enrichment'),
+        ('persist', 'Persistence'),
+        ('done', 'Done'),
+    )
+    news_story = models.OneToOneField(NewsStory, on_delete=models.CASCADE, related_name='analysis_run')
+    # The next stage to run; each stage's output is checkpointed below
+    stage = models.CharField(max_length=10, choices=STAGES, default='retrieval')
+    candidates = models.JSONField(null=True, blank=True)
+    llm_result = models.JSONField(null=True, blank=True)
+    enriched = models.JSONField(null=True, blank=True)
+    attempts = models.PositiveIntegerField(default=0)
+    last_error = models.TextField(blank=True)
+    created_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    def __str__(self):
+        return f"{self.news_story_id}: {self.stage}"
+
+
+class TriageDecision(models.Model):
+    """
+    One triage tier's verdict on a story, kept for audit and threshold tuning.
+
+    ``passed`` is None when the tier was unsure and deferred to the next one.
+    """
+    TIERS = (('heuristic', 'Heuristic'), ('model', 'Model'))
+    news_story = models.ForeignKey(NewsStory, on_delete=models.CASCADE, related_name='triage_decisions')
+    tier = models.CharField(max_length=10, choices=TIERS)
+    # Empty for the heuristic tier
+    model = models.CharField(max_length=50, blank=True)
+    score = models.FloatField(null=True)
+    passed = models.BooleanField(null=True)
+    reason = models.TextField(blank=True)
+    features = models.JSONField(default=dict, blank=True)
+    # Thresholds in force when the decision was made
+    thresholds = models.JSONField(default=dict)
+    latency_ms = models.FloatField(default=0)
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    def __str__(self):
+        return f"{self.news_story_id} {self.tier}: {self.passed}"
+
+
+class ArchivedPartition(models.Model):
+    """A monthly partition exported to Parquet and dropped from the database."""
+    table = models.CharField(max_length=63)
+    range_start = models.DateField()
+    range_end = models.DateField()
+    # Empty when the partition held no rows and no file was written
+    path = models.CharField(max_length=500, blank=True)
+    row_count = models.PositiveBigIntegerField(default=0)
+    size_bytes = models.PositiveBigIntegerField(default=0)
+    archived_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=['table', 'range_start'], name='unique_archived_partition'),
+        ]
+
+    def __str__(self):
+        return f"{self.table} {self.range_start:%Y-%m}"
@@ -0,0 +1,321 @@
+"""
+Staged news analysis pipeline.
+
+Each stage reads the previous stage's checkpoint from ``AnalysisRun``,
+writes its own, and advances ``AnalysisRun.stage``. A stage that has
+already run is a no-op, so a retried or re-dispatched story resumes at the
+first stage that hasn't completed and never pays for a GPT call twice.
+
+    retrieval -> triage -> llm -> prices -> persist -> done
+
+Triage can send a story straight to ``done`` when it isn't worth the
+analysis model; its decisions are kept in ``TriageDecision``.
+"""
+import json
+import logging
+import re
+from datetime import datetime, time, timedelta, timezone as dt_timezone
+from itertools import count
+
+from django.conf import settings
+from django.db import transaction
+from django.db.models import Exists, F, OuterRef, Q
+from django.utils import timezone
+from django_redis import get_redis_connection
+
+from ai.models import AnalysisRun, AnalyzedNews, Signal, TriageDecision
+from ai.utils.news_index import enqueue_for_embedding
+from ai.utils.openai_utils import (
+    analyze_news_streaming, analyze_news_with_candidates, format_news_text, truncate_to_tokens,
+)
+from ai.utils.partitions import retention_cutoff
+from ai.utils.rollups import RollupDeltas, tag_symbols
+from ai.utils.stock_universe import StockUniverse
+from ai.utils.triage import triage
+from ai.utils.yahoo_utils import get_stock_price
+from scrapy.models import ArticleBody, NewsStory
+
+logger = logging.getLogger(__name__)
+
+STAGE_ORDER = [stage for stage, _ in AnalysisRun.STAGES]
+
+_stock_universe = None
+
+
+class StageUnavailable(Exception):
+    """A dependency of a stage is down; the stage should be retried later."""
+
+
+def get_stock_universe() -> StockUniverse:
+    """Per-process stock universe, reconnecting if ChromaDB was unavailable."""
+    global _stock_universe
+    if _stock_universe is None or _stock_universe.collection is None:
+        _stock_universe = StockUniverse()
+    return _stock_universe
+
+
+def article_text(news_story: NewsStory) -> str:
+    """The fetched article body of ``news_story``, or ``''`` if there is none."""
+    try:
+        return news_story.article_body.text
+    except ArticleBody.DoesNotExist:
+        return ''
+
+
+def news_data(news_story: NewsStory) -> dict:
+    body = article_text(news_story)
+    return {
+        "title": news_story.title,
+        "description": news_story.description,
+        "datetime": news_story.datetime.isoformat(),
+        "source": getattr(news_story, 'source', ''),
+        "link": news_story.link,
+        "body": truncate_to_tokens(body, settings.ARTICLE_PROMPT_TOKENS),
+    }
+
+
+def _get_run(news_story_id: int) -> AnalysisRun:
+    try:
+        return AnalysisRun.objects.select_related('news_story__article_body').get(news_story_id=news_story_id)
+    except AnalysisRun.DoesNotExist:
+        news_story = NewsStory.objects.get(id=news_story_id)
+        run, _ = AnalysisRun.objects.get_or_create(news_story=news_story)
+        return run
+
+
+def _is_done(run: AnalysisRun, stage: str) -> bool:
+    return STAGE_ORDER.index(run.stage) > STAGE_ORDER.index(stage)
+
+
+def _advance(run: AnalysisRun, stage: str, **checkpoint) -> None:
+    for field, value in checkpoint.items():
+        setattr(run, field, value)
+    run.stage = STAGE_ORDER[STAGE_ORDER.index(stage) + 1]
+    run.last_error = ''
+    run.save(update_fields=[*checkpoint, 'stage', 'last_error', 'updated_at'])
+
+
+def record_failure(news_story_id: int, error: Exception) -> None:
+    """
+    Keep the latest error and attempt count on the run.
+
+    ``updated_at`` is bumped too (``update()`` skips ``auto_now``), so the
+    backfill treats a story that just failed as in flight.
+    """
+    AnalysisRun.objects.filter(news_story_id=news_story_id).update(
+        attempts=F('attempts') + 1, last_error=str(error)[:2000], updated_at=timezone.now()
+    )
+
+
+def run_retrieval(news_story_id: int) -> None:
+    """Find candidate stocks for the story in the ChromaDB stock universe."""
+    run = _get_run(news_story_id)
+    if _is_done(run, 'retrieval'):
+        return
+    stock_universe = get_stock_universe()
+    if stock_universe.collection is None:
+        raise StageUnavailable("ChromaDB stock universe unavailable")
+    news_text = format_news_text([news_data(run.news_story)])
+    candidates = stock_universe.get_relevant_stocks(news_text, n_results=5)
+    _advance(run, 'retrieval', candidates=candidates)
+
+
+def run_triage(news_story_id: int) -> None:
+    """Decide whether the story is worth the analysis model; a rejected story finishes here."""
+    run = _get_run(news_story_id)
+    if _is_done(run, 'triage'):
+        return
+    result = triage(news_data(run.news_story), run.candidates or [])
+    with transaction.atomic():
+        TriageDecision.objects.bulk_create([
+            TriageDecision(news_story=run.news_story, **decision) for decision in result.decisions
+        ])
+        if result.passed:
+            _advance(run, 'triage')
+        else:
+            run.stage = 'done'
+            run.last_error = ''
+            run.save(update_fields=['stage', 'last_error', 'updated_at'])
+
+
+def publish_live_signal(news_story_id: int, signal: dict, attempt: int, index: int) -> None:
+    """
+    Push a signal to ``LIVE_SIGNALS_CHANNEL`` as soon as it is parsed.
+
+    Subscribers see it before prices and persistence; the persisted
+    ``Signal`` follows once the story's remaining stages finish. A failed
+    stream is retried and publishes its signals again, so each message
+    carries ``key`` (story and position in the response) and ``attempt``:
+    subscribers keep one signal per key, and a message from a later
+    attempt of a story replaces everything from earlier ones.
+    """
+    message = {
+        'news_story_id': news_story_id, 'attempt': attempt, 'index': index,
+        'key': f"{news_story_id}:{index}", 'signal': signal,
+    }
+    try:
+        get_redis_connection('default').publish(settings.LIVE_SIGNALS_CHANNEL, json.dumps(message))
+    except Exception as e:
+        logger.warning(f"Could not publish live signal for story {news_story_id}: {e}")
+
+
+def run_llm(news_story_id: int) -> None:
+    """
+    Analyze the story with GPT against the retrieved candidates.
+
+    With ``LLM_STREAMING`` the completion is parsed as it arrives. Each
+    signal is published as it closes, and malformed items are dropped
+    one by one instead of failing the whole response. A response that is
+    cut off or has nothing usable raises, so the stage is retried rather
+    than completing without analysis.
+    """
+    run = _get_run(news_story_id)
+    if _is_done(run, 'llm'):
+        return
+    news_items = [news_data(run.news_story)]
+    if settings.LLM_STREAMING:
+        attempt, signals = run.attempts + 1, count()
+
+        def on_item(key, item):
+            if key == 'signals':
+                publish_live_signal(news_story_id, item, attempt, next(signals))
+
+        result = analyze_news_streaming(news_items, run.candidates or [], on_item=on_item)
+    else:
+        result = analyze_news_with_candidates(news_items, run.candidates or [])
+    _advance(run, 'llm', llm_result=result)
+
+
+def run_prices(news_story_id: int) -> None:
+    """Attach prices to signals and matched stocks."""
+    run = _get_run(news_story_id)
+    if _is_done(run, 'prices'):
+        return
+    result = run.llm_result or {}
+
+    signals = []
+    for signal in result.get("signals", []):
+        symbol = signal.get("symbol")
+        if not symbol:
+            continue
+        timestamp = signal.get("timestamp") or datetime.utcnow().isoformat()
+        price_info = get_stock_price(symbol, at=timestamp)
+        price = price_info.get('current_price') if price_info else None
+        if price is None:
+            continue
+        signals.append({**signal, "timestamp": timestamp, "price": price})
+
+    news_items = []
+    for news in result.get("news", []):
+        tags = dict(news.get("tags", {}))
+        # Company metadata is hydrated from ``Stock`` on read, so only symbol and price are kept.
+        stocks_with_prices = []
+        for symbol in tag_symbols({"stocks": tags.get("stocks", []) + tags.pop("matched_stocks", [])}):
+            price_info = get_stock_price(symbol)
+            price = price_info.get('current_price') if price_info else None
+            if price is not None:
+                stocks_with_prices.append({"symbol": symbol, "price": price})
+        tags["stocks"] = stocks_with_prices
+        news_items.append({**news, "tags": tags})
+
+    _advance(run, 'prices', enriched={"signals": signals, "news": news_items})
+
+
+def run_persist(news_story_id: int) -> None:
+    """
+    Save signals, analyzed news and rollups.
+
+    The rows and the move to ``done`` commit in one transaction, so a
+    retried persist never writes duplicates. Analyzed news stores the
+    fetched article body as its content, or the story's description when
+    the fetch failed, never text written by GPT.
+    """
+    with transaction.atomic():
+        run = AnalysisRun.objects.select_for_update().select_related('news_story').get(
+            news_story_id=news_story_id
+        )
+        if _is_done(run, 'persist'):
+            return
+        news_story = run.news_story
+        enriched = run.enriched or {}
+        content = article_text(news_story) or news_story.description
+
+        rollups = RollupDeltas()
+        for signal in enriched.get("signals", []):
+            saved = Signal.objects.create(
+                news_story=news_story,
+                type=signal.get("type"),
+                symbol=signal["symbol"],
+                price=signal["price"],
+                timestamp=signal["timestamp"],
+                confidence=signal.get("confidence"),
+                reason=signal.get("reason"),
+            )
+            rollups.add_signal(saved.symbol, saved.type, saved.timestamp)
+
+        analyzed_ids = []
+        for news in enriched.get("news", []):
+            analyzed = AnalyzedNews.objects.create(
+                news_story=news_story,
+                title=news.get("title"),
+                summary=news.get("summary"),
+                content=content,
+                published_at=news.get("publishedAt"),
+                source=news.get("source"),
+                url=news.get("url"),
+                tags=news["tags"],
+            )
+            rollups.add_news(analyzed.tags, analyzed.published_at)
+            analyzed_ids.append(analyzed.id)
+        rollups.apply()
+        _advance(run, 'persist')
+        transaction.on_commit(lambda: enqueue_for_embedding(analyzed_ids))
+
+
+STAGES = {
+    'retrieval': run_retrieval,
+    'triage': run_triage,
+    'llm': run_llm,
+    'prices': run_prices,
+    'persist': run_persist,
+}
+
+
+def run_pipeline(news_story_id: int) -> None:
+    """Run every remaining stage in-process, e.g. from a management command."""
+    for stage in STAGE_ORDER[:-1]:
+        STAGES[stage](news_story_id)
+
+
+def unanalyzed_stories(since=None, until=None, source=None, min_age_minutes=30):
+    """
+    Stories whose analysis never completed, as an anti-join on ``AnalysisRun``/``AnalyzedNews``.
+
+    Stories analyzed before the staged pipeline have ``AnalyzedNews`` rows
+    but no run. Stories created or with a run touched in the last
+    ``min_age_minutes`` are treated as in flight and left alone, and runs
+    that failed ``MAX_ANALYSIS_ATTEMPTS`` times are given up on. Stories
+    older than the partition retention window are skipped: their analysis
+    may have been archived, and new rows for them would land in the
+    default partition. ``source`` is a prefix of the story's link host,
+    since stories don't store a source.
+    """
+    cutoff = timezone.now() - timedelta(minutes=min_age_minutes)
+    stories = NewsStory.objects.filter(
+        ~Exists(AnalysisRun.objects.filter(news_story=OuterRef('pk')).filter(
+            Q(stage='done') | Q(updated_at__gte=cutoff) | Q(attempts__gte=settings.MAX_ANALYSIS_ATTEMPTS)
+        )),
+        ~Exists(AnalyzedNews.objects.filter(news_story=OuterRef('pk'))),
+    )
+    if min_age_minutes:
+        stories = stories.filter(datetime__lt=cutoff)
+    retention_start = retention_cutoff()
+    if retention_start:
+        stories = stories.filter(datetime__gte=datetime.combine(retention_start, time.min, tzinfo=dt_timezone.utc))
+    if since:
+        stories = stories.filter(datetime__gte=since)
+    if until:
+        stories = stories.filter(datetime__lt=until)
+    if source:
+        stories = stories.filter(link__iregex=rf"^[a-z]+://{re.escape(source)}")
+    return stories
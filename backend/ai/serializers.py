@@ -1,19 +1,33 @@
 from rest_framework import serializers
 from .models import Signal, AnalyzedNews
+from .utils.rollups import tag_symbols
+from .utils.stocks import get_stock_map, hydrate_tags
+
+def camel_case(key):
+    parts = key.split('_')
+    return parts[0] + ''.join(word.capitalize() for word in parts[1:])
 
 class CamelCaseModelSerializer(serializers.ModelSerializer):
+    """
+    Model serializer with camelCase output keys.
+
+    ``fields`` keeps only the named (snake_case) fields, for sparse fieldsets.
+    """
+
+    def __init__(self, *args, fields=None, **kwargs):
+        super().__init__(*args, **kwargs)
+        if fields is not None:
+            for name in set(self.fields) - set(fields):
+                self.fields.pop(name)
+
     def to_representation(self, instance):
         ret = super().to_representation(instance)
         new_ret = {}
         for key, value in ret.items():
             if key == 'id':
                 new_ret['id'] = str(value)
-            elif '_' in key:
-                parts = key.split('_')
-                camel = parts[0] + ''.join(word.capitalize() for word in parts[1:])
-                new_ret[camel] = value
             else:
-                new_ret[key] = value
+                new_ret[camel_case(key)] = value
         return new_ret
 
 class SignalSerializer(CamelCaseModelSerializer):
@@ -24,4 +38,40 @@ class SignalSerializer(CamelCaseModelSerializer):
 class AnalyzedNewsSerializer(CamelCaseModelSerializer):
     class Meta:
         model = AnalyzedNews
-        fields = '__all__' 
\ No newline at end of file
+        exclude = ('search_vector',)
+
+    def to_representation(self, instance):
+        ret = super().to_representation(instance)
+        if 'tags' in ret:
+            ret['tags'] = hydrate_tags(ret['tags'], self._stocks())
+        return ret
+
+    def _stocks(self):
+        # Looked up once per serializer, not once per row of a list page
+        if not hasattr(self, '_stock_map'):
+            self._stock_map = get_stock_map()
+        return self._stock_map
+
+class AnalyzedNewsListSerializer(CamelCaseModelSerializer):
+    """
+    Lightweight list representation: no ``content`` and only the summary tags.
+
+    ``tags.stocks`` is a list of symbols. Expects the ``list_tags``
+    annotation from ``AnalyzedNewsViewSet``, so the full ``tags`` JSON is
+    never read from Postgres.
+    """
+    tags = serializers.SerializerMethodField()
+
+    class Meta:
+        model = AnalyzedNews
+        fields = ('id', 'title', 'summary', 'published_at', 'source', 'url', 'tags')
+
+    def get_tags(self, instance):
+        tags = {key: value for key, value in instance.list_tags.items() if value is not None}
+        tags['stocks'] = tag_symbols(tags)
+        return tags
+
+class SearchResultSerializer(AnalyzedNewsSerializer):
+    rank = serializers.FloatField(read_only=True)
+    title_headline = serializers.CharField(read_only=True)
+    summary_headline = serializers.CharField(read_only=True)
@@ -1,83 +1,152 @@
-from celery import shared_task
-from ai.utils.openai_utils import analyze_news_with_gpt
-from ai.utils.stock_universe import StockUniverse
+from celery import chain, shared_task
 from scrapy.models import NewsStory
-from ai.models import Signal, AnalyzedNews
-from ai.utils.yahoo_utils import get_stock_price
+from ai.models import AnalyzedNews
+from ai import pipeline
 import logging
-from datetime import datetime
+from ai.utils.price_store import load_universe_symbols, update_price_store
+from ai.utils.news_index import NewsIndex, enqueue_for_embedding, pop_pending
+from ai.utils.partitions import PARTITIONED_TABLES, archive_old_partitions, ensure_partitions
+from django.conf import settings
+from django.db.models import F
+from django.core.exceptions import ValidationError
 
 logger = logging.getLogger(__name__)
 
-# Initialize stock universe for all tasks
-stock_universe = StockUniverse()
+# Stages retry with backoff on any error except a missing story and errors
+# that would recur on every attempt: bad data in a checkpoint or response
+# (KeyError, TypeError, ValueError such as a malformed timestamp) and model
+# field validation. Queue routing and per-queue concurrency live in settings
+# and docker-compose.
+STAGE_OPTIONS = dict(
+    bind=True,
+    autoretry_for=(Exception,),
+    dont_autoretry_for=(NewsStory.DoesNotExist, KeyError, TypeError, ValueError, ValidationError),
+    retry_backoff=True,
+    retry_backoff_max=600,
+    retry_jitter=True,
+    max_retries=5,
+)
 
-@shared_task
-def analyze_news_task(news_story_id):
-    """
-    Analyze a news story using GPT and save signals and analyzed news to the database.
-    """
+
+def _run_stage(task, stage, news_story_id):
     try:
-        news_story = NewsStory.objects.get(id=news_story_id)
-        news_data = {
-            "title": news_story.title,
-            "description": news_story.description,
-            "datetime": news_story.datetime.isoformat(),
-            "source": getattr(news_story, 'source', ''),
-            "link": news_story.link
-        }
-        result = analyze_news_with_gpt([news_data], stock_universe)
-
-        # Save trading signals
-        for signal in result.get("signals", []):
-            symbol = signal.get("symbol")
-            if not symbol:
-                continue
-            timestamp = signal.get("timestamp") or datetime.utcnow().isoformat()
-            price_info = get_stock_price(symbol)
-            price = price_info.get('current_price') if price_info else None
-            if price is None:
-                continue
-            Signal.objects.create(
-                news_story=news_story,
-                type=signal.get("type"),
-                symbol=symbol,
-                price=price,
-                timestamp=timestamp,
-                confidence=signal.get("confidence"),
-                reason=signal.get("reason"),
-            )
-
-        # Save analyzed news
-        for news in result.get("news", []):
-            tags = news.get("tags", {})
-            matched_stocks = tags.get("matched_stocks", [])
-            stocks_with_prices = []
-            for stock in matched_stocks:
-                price_info = get_stock_price(stock["symbol"])
-                price = price_info.get('current_price') if price_info else None
-                if price is not None:
-                    stocks_with_prices.append({
-                        "symbol": stock["symbol"],
-                        "price": price,
-                        "company_name": stock["company_name"],
-                        "industry": stock["industry"],
-                        "isin": stock["isin"],
-                        "series": stock["series"]
-                    })
-            tags["stocks"] = stocks_with_prices
-            AnalyzedNews.objects.create(
-                news_story=news_story,
-                title=news.get("title"),
-                summary=news.get("summary"),
-                content=news.get("content"),
-                published_at=news.get("publishedAt"),
-                source=news.get("source"),
-                url=news.get("url"),
-                tags=tags,
-            )
+        pipeline.STAGES[stage](news_story_id)
     except NewsStory.DoesNotExist:
         logger.error(f"News story with ID {news_story_id} not found")
+        raise
     except Exception as e:
-        logger.error(f"Error in analyze_news_task: {e}")
-        
\ No newline at end of file
+        logger.warning(f"Stage {stage} failed for story {news_story_id} "
+                       f"(attempt {task.request.retries + 1}): {e}")
+        pipeline.record_failure(news_story_id, e)
+        raise
+    return news_story_id
+
+
+@shared_task(**STAGE_OPTIONS)
+def retrieve_candidates_task(self, news_story_id):
+    """Stage 1: candidate stocks from ChromaDB."""
+    return _run_stage(self, 'retrieval', news_story_id)
+
+
+@shared_task(**STAGE_OPTIONS)
+def triage_task(self, news_story_id):
+    """Stage 2: heuristic and small-model triage; rejected stories skip the remaining stages."""
+    return _run_stage(self, 'triage', news_story_id)
+
+
+@shared_task(**STAGE_OPTIONS, rate_limit=settings.LLM_TASK_RATE_LIMIT)
+def llm_analysis_task(self, news_story_id):
+    """Stage 3: GPT analysis; the result is checkpointed before anything else can fail."""
+    return _run_stage(self, 'llm', news_story_id)
+
+
+@shared_task(**STAGE_OPTIONS)
+def enrich_prices_task(self, news_story_id):
+    """Stage 4: prices for signals and matched stocks."""
+    return _run_stage(self, 'prices', news_story_id)
+
+
+@shared_task(**STAGE_OPTIONS)
+def persist_analysis_task(self, news_story_id):
+    """Stage 5: signals, analyzed news and rollups in one transaction."""
+    return _run_stage(self, 'persist', news_story_id)
+
+
+@shared_task
+def analyze_news_task(news_story_id):
+    """
+    Analyze a news story through the staged pipeline.
+
+    Dispatches the full chain; stages that already completed for this story
+    are skipped, so calling this again resumes a failed run.
+    """
+    result = chain(
+        retrieve_candidates_task.si(news_story_id),
+        triage_task.s(),
+        llm_analysis_task.s(),
+        enrich_prices_task.s(),
+        persist_analysis_task.s(),
+    ).apply_async()
+    return result.id
+
+
+@shared_task
+def backfill_unanalyzed_task(limit=100):
+    """
+    Re-dispatch up to ``limit`` stories whose analysis never completed.
+
+    Stories with the fewest failed attempts go first, so stories that keep
+    failing can't crowd the rest of the backlog out of every batch.
+    """
+    stories = pipeline.unanalyzed_stories().order_by(F('analysis_run__attempts').asc(nulls_first=True), 'id')
+    story_ids = list(stories.values_list('id', flat=True)[:limit])
+    for story_id in story_ids:
+        analyze_news_task.delay(story_id)
+    logger.info(f"Re-dispatched analysis for {len(story_ids)} stories")
+    return len(story_ids)
+
+
+@shared_task
+def update_price_store_task():
+    """
+    Download the daily bars missing from the local price store for the whole universe.
+    """
+    written = update_price_store(load_universe_symbols())
+    logger.info(f"Price store updated with {written} bars")
+    return written
+
+
+@shared_task
+def embed_pending_news_task():
+    """
+    Embed queued AnalyzedNews summaries into the news vector collection in batches.
+    """
+    index = NewsIndex()
+    if not index.collection:
+        logger.error("News index unavailable; pending embeddings left queued")
+        return 0
+    total = 0
+    while True:
+        ids = pop_pending(settings.NEWS_EMBED_BATCH_SIZE)
+        if not ids:
+            break
+        items = AnalyzedNews.objects.filter(id__in=ids).only('id', 'news_story_id', 'summary', 'published_at', 'tags')
+        try:
+            total += index.upsert(items)
+        except Exception as e:
+            enqueue_for_embedding(ids)
+            logger.error(f"Error embedding analyzed news batch: {e}")
+            break
+    logger.info(f"Embedded {total} analyzed news items")
+    return total
+
+
+@shared_task
+def maintain_partitions_task():
+    """
+    Create the upcoming monthly partitions and archive those past the retention window.
+    """
+    created = [name for table in PARTITIONED_TABLES for name in ensure_partitions(table)]
+    archived = archive_old_partitions()
+    logger.info(f"Created partitions {created}; archived {len(archived)} partitions")
+    return {"created": created, "archived": [str(a) for a in archived]}
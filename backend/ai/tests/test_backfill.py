@@ -0,0 +1,88 @@
+from datetime import timedelta
+from unittest import mock
+
+from django.core.cache import cache
+from django.core.management import call_command
+from django.test import TestCase, override_settings
+from django.utils import timezone
+
+from ai import pipeline
+from ai.management.commands.backfill_analysis import Command as BackfillCommand
+from ai.models import AnalysisRun
+from ai.tasks import backfill_unanalyzed_task
+from scrapy.models import NewsStory
+
+
+@override_settings(MAX_ANALYSIS_ATTEMPTS=3, PARTITION_RETENTION_MONTHS=0)
+class BackfillTests(TestCase):
+    """Which stories the scheduled backfill sends back through the pipeline."""
+
+    def story(self, i, link=None):
+        return NewsStory.objects.create(
+            title=f"Story {i}", link=link or f"https://example.com/news/{i}",
+            datetime=timezone.now() - timedelta(days=1), description='Description',
+        )
+
+    def stale_run(self, story):
+        """A run last touched long enough ago that the backfill may pick it up."""
+        AnalysisRun.objects.create(news_story=story, stage='llm')
+        AnalysisRun.objects.filter(news_story=story).update(updated_at=timezone.now() - timedelta(hours=1))
+
+    def fail(self, story):
+        """A dispatch of ``story`` that fails, then enough time passing for the backfill to look again."""
+        pipeline.record_failure(story.id, RuntimeError('GPT unavailable'))
+        AnalysisRun.objects.filter(news_story=story).update(updated_at=timezone.now() - timedelta(hours=1))
+
+    def backfill(self, limit=100):
+        with mock.patch('ai.tasks.analyze_news_task.delay') as delay:
+            backfill_unanalyzed_task(limit)
+        return [call.args[0] for call in delay.call_args_list]
+
+    def test_failure_counts_as_in_flight(self):
+        story = self.story(1)
+        self.stale_run(story)
+        pipeline.record_failure(story.id, RuntimeError('GPT unavailable'))
+        self.assertEqual(self.backfill(), [])
+
+    def test_run_that_keeps_failing_stops_being_dispatched(self):
+        story = self.story(1)
+        self.stale_run(story)
+        dispatches = 0
+        for _ in range(10):
+            if story.id in self.backfill():
+                dispatches += 1
+                self.fail(story)
+        self.assertEqual(dispatches, 3)
+        self.assertEqual(AnalysisRun.objects.get(news_story=story).attempts, 3)
+
+    def test_failing_stories_go_last(self):
+        failing = [self.story(i) for i in range(3)]
+        for story in failing:
+            self.stale_run(story)
+            self.fail(story)
+        fresh = self.story(3)
+        self.assertEqual(self.backfill(limit=1), [fresh.id])
+
+    def test_source_is_a_host_prefix(self):
+        et = self.story(1, 'https://economictimes.indiatimes.com/news/1')
+        self.story(2, 'https://example.com/economictimes.indiatimes.com/2')
+        stories = pipeline.unanalyzed_stories(source='economictimes.indiatimes.com')
+        self.assertEqual(list(stories.values_list('id', flat=True)), [et.id])
+
+    def test_checkpoint_stops_before_a_failed_story(self):
+        stories = [self.story(i) for i in range(5)]
+        failed = stories[2].id
+        analyzed = []
+
+        def analyze(command, story_id, limiter):
+            analyzed.append(story_id)
+            return story_id != failed
+
+        cache.clear()
+        with mock.patch.object(BackfillCommand, '_analyze', analyze):
+            call_command('backfill_analysis', limit=5, chunk_size=2, min_age_minutes=0, stdout=mock.Mock())
+            self.assertEqual(sorted(analyzed), [s.id for s in stories])
+            analyzed.clear()
+            call_command('backfill_analysis', limit=5, min_age_minutes=0, stdout=mock.Mock())
+        # The resumed run starts at the failure instead of after the last chunk
+        self.assertEqual(analyzed[0], failed)
@@ -0,0 +1,79 @@
+import json
+from unittest import mock
+
+from django.test import SimpleTestCase
+
+from ai.utils.json_stream import ItemStreamParser
+from ai.utils.openai_utils import IncompleteResponseError, analyze_news_streaming
+
+SIGNAL = {'type': 'BUY', 'symbol': 'TCS', 'reason': 'Said "record" {orders} \\ [guidance]',
+          'timestamp': '2025-01-01T09:15:00Z'}
+NEWS = {'title': 'TCS wins deal', 'summary': 'Nested', 'publishedAt': '2025-01-01T09:00:00Z',
+        'source': 'ET', 'url': 'https://example.com/1',
+        'tags': {'stocks': [{'symbol': 'TCS', 'price': {'close': 4000}}], 'sectors': ['IT']}}
+RESPONSE = '```json\n' + json.dumps({'signals': [SIGNAL], 'note': {'signals': [{}]}, 'news': [NEWS]}) + '\n```'
+
+
+def feed_all(parser, chunks):
+    items = [pair for chunk in chunks for pair in parser.feed(chunk)]
+    parser.close()
+    return items
+
+
+class ItemStreamParserTests(SimpleTestCase):
+    """Items are emitted intact whatever the chunk boundaries."""
+
+    def test_every_split_point(self):
+        # Covers splits inside strings, right after a backslash and inside nested objects
+        for cut in range(1, len(RESPONSE)):
+            with self.subTest(cut=cut, around=RESPONSE[cut - 5:cut + 5]):
+                parser = ItemStreamParser()
+                items = feed_all(parser, [RESPONSE[:cut], RESPONSE[cut:]])
+                self.assertEqual(items, [('signals', SIGNAL), ('news', NEWS)])
+                self.assertTrue(parser.finished)
+                self.assertEqual(parser.dropped, 0)
+
+    def test_one_character_chunks(self):
+        parser = ItemStreamParser()
+        self.assertEqual(feed_all(parser, RESPONSE), [('signals', SIGNAL), ('news', NEWS)])
+
+    def test_only_top_level_keys_are_read(self):
+        # The nested "signals" under "note" is not an item list
+        parser = ItemStreamParser()
+        items = feed_all(parser, [RESPONSE])
+        self.assertNotIn(('signals', {}), items)
+
+    def test_truncated_item_is_dropped(self):
+        text = RESPONSE[:RESPONSE.index('"tags"')]
+        parser = ItemStreamParser()
+        self.assertEqual(feed_all(parser, [text]), [('signals', SIGNAL)])
+        self.assertEqual(parser.dropped, 1)
+        self.assertTrue(parser.started)
+        self.assertFalse(parser.finished)
+
+
+@mock.patch('ai.utils.openai_utils.build_analysis_prompt', return_value='prompt')
+class AnalyzeNewsStreamingTests(SimpleTestCase):
+    """Complete, cut-off and refused streamed completions."""
+
+    def analyze(self, chunks):
+        with mock.patch('ai.utils.openai_utils.stream_gpt_response', return_value=iter(chunks)):
+            return analyze_news_streaming([{'title': 'TCS wins deal'}], [])
+
+    def test_complete_response(self, _):
+        chunks = [RESPONSE[i:i + 7] for i in range(0, len(RESPONSE), 7)]
+        self.assertEqual(self.analyze(chunks), {'signals': [SIGNAL], 'news': [NEWS]})
+
+    def test_cut_off_response(self, _):
+        # Every item closed, but the top-level object never was
+        text = RESPONSE[:RESPONSE.rindex(']') + 1]
+        with self.assertRaisesRegex(IncompleteResponseError, 'cut off'):
+            self.analyze([text])
+
+    def test_cut_off_inside_an_item(self, _):
+        with self.assertRaisesRegex(IncompleteResponseError, 'cut off'):
+            self.analyze([RESPONSE[:RESPONSE.index('"tags"')]])
+
+    def test_refusal(self, _):
+        with self.assertRaisesRegex(IncompleteResponseError, 'no JSON object'):
+            self.analyze(["I can't help with that."])
@@ -0,0 +1,80 @@
+import tempfile
+import threading
+from datetime import date, timedelta
+
+import pandas as pd
+from django.test import SimpleTestCase
+
+from ai.utils.price_store import FIELDS, PriceStore, to_day, update_price_store
+
+
+def bars(symbols, day, close=1.0):
+    return pd.DataFrame([
+        {'symbol': symbol, 'date': day, **{field: close for field in FIELDS}} for symbol in symbols
+    ])
+
+
+class PriceStoreTests(SimpleTestCase):
+    """Versioned writes and the no-data markers of the price store."""
+
+    def setUp(self):
+        tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        self.path = tmp.name
+
+    def test_reader_never_mixes_versions(self):
+        store = PriceStore(self.path)
+        store.write_bars(bars(['S0'], date(2025, 1, 1)))
+        done = threading.Event()
+        mismatches = []
+
+        def read():
+            while not done.is_set():
+                reader = PriceStore(self.path)
+                shapes = {array.shape[-1] for name, array in reader.arrays.items() if array.ndim == 2}
+                if shapes != {len(reader.symbols)}:
+                    mismatches.append((shapes, len(reader.symbols)))
+
+        thread = threading.Thread(target=read)
+        thread.start()
+        try:
+            # Every write adds a symbol and a day, so every array changes shape
+            for i in range(1, 30):
+                store.write_bars(bars([f'S{i}'], date(2025, 1, 1) + timedelta(days=i)))
+        finally:
+            done.set()
+            thread.join()
+        self.assertEqual(mismatches, [])
+        self.assertEqual(len(PriceStore(self.path).symbols), 30)
+        self.assertEqual(len(store._versions()), PriceStore.KEEP_VERSIONS)
+
+    def test_reader_sees_new_version(self):
+        reader = PriceStore(self.path)
+        PriceStore(self.path).write_bars(bars(['A'], date(2025, 1, 1)))
+        self.assertTrue(reader.is_stale())
+        reader.load()
+        self.assertFalse(reader.is_stale())
+        self.assertEqual(reader.close_asof('A', date(2025, 1, 2)), 1.0)
+
+    def test_symbol_without_bars_is_not_downloaded_again(self):
+        requests = []
+        today = date(2025, 3, 10)
+
+        def downloader(symbols, start):
+            requests.append((sorted(symbols), start))
+            return bars([s for s in symbols if s != 'DEAD'], today)
+
+        store = PriceStore(self.path)
+        update_price_store(['LIVE', 'DEAD'], store, downloader, today=today)
+        self.assertEqual(store.checked, {'DEAD': to_day(today) - 1})
+
+        requests.clear()
+        today += timedelta(days=1)
+        update_price_store(['LIVE', 'DEAD'], PriceStore(self.path), downloader, today=today)
+        # Both only ask from the day after their last bar or check, not for full history
+        self.assertEqual(requests, [(['DEAD'], today - timedelta(days=1)), (['LIVE'], today)])
+
+    def test_empty_response_marks_nothing(self):
+        store = PriceStore(self.path)
+        update_price_store(['A'], store, lambda symbols, start: bars([], start), today=date(2025, 3, 10))
+        self.assertEqual(store.checked, {})
@@ -0,0 +1,68 @@
+from datetime import timedelta
+from unittest import mock
+
+from django.test import TestCase, override_settings
+from django.utils import timezone
+
+from ai.models import AnalyzedNews
+from scrapy.models import NewsStory
+
+
+class TimeBoundsTests(TestCase):
+    """``since``/``until`` validation on the backtest and archive endpoints."""
+
+    def test_backtest_rejects_malformed_bounds(self):
+        for params in ({'since': 'foo'}, {'until': '2025-13-01'}, {'since': '2025-02-30T00:00:00'}):
+            with self.subTest(params=params):
+                response = self.client.get('/api/backtest/', params)
+                self.assertEqual(response.status_code, 400)
+                self.assertIn('must be an ISO8601', response.json()['detail'])
+
+    def test_backtest_accepts_datetimes_and_dates(self):
+        with mock.patch('ai.views.get_price_store'), \
+                mock.patch('ai.views.run_backtest', return_value={}) as run_backtest, \
+                mock.patch('ai.views.load_signals', side_effect=lambda queryset: queryset) as load_signals:
+            response = self.client.get('/api/backtest/', {'since': '2025-01-01', 'until': '2025-02-01T09:15:00+05:30'})
+        self.assertEqual(response.status_code, 200)
+        self.assertTrue(run_backtest.called)
+        sql = str(load_signals.call_args.args[0].query)
+        self.assertIn('2025-01-01 00:00:00+00:00', sql)
+        self.assertIn('2025-02-01 09:15:00+05:30', sql)
+
+    def test_archive_rejects_malformed_bounds(self):
+        response = self.client.get('/api/archive/signals/', {'since': 'yesterday'})
+        self.assertEqual(response.status_code, 400)
+
+
+@override_settings(SEARCH_RANK_LIMIT=5)
+class SearchTests(TestCase):
+    """Capped ranking and pagination of ``/api/search/``."""
+
+    def setUp(self):
+        now = timezone.now()
+        for i in range(8):
+            story = NewsStory.objects.create(
+                title=f"Story {i}", link=f"https://example.com/news/{i}", datetime=now, description='',
+            )
+            AnalyzedNews.objects.create(
+                news_story=story, title='Bank results', summary='bank ' * (i % 3 + 1), content='',
+                published_at=now - timedelta(hours=i), source='example', url=story.link, tags={},
+            )
+
+    def search(self, **params):
+        response = self.client.get('/api/search/', {'q': 'bank', **params})
+        self.assertEqual(response.status_code, 200)
+        return response.json()
+
+    def test_flags_truncated_results(self):
+        data = self.search()
+        self.assertEqual(data['count'], 5)
+        self.assertTrue(data['truncated'])
+        with self.settings(SEARCH_RANK_LIMIT=0):
+            self.assertFalse(self.search()['truncated'])
+
+    def test_pages_cover_every_match_once(self):
+        with mock.patch('ai.views.SearchPagination.page_size', 2):
+            ids = [row['id'] for page in (1, 2, 3) for row in self.search(page=page)['results']]
+        newest = AnalyzedNews.objects.order_by('-published_at').values_list('id', flat=True)[:5]
+        self.assertEqual(sorted(ids), sorted(str(pk) for pk in newest))
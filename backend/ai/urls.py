@@ -1,8 +1,14 @@
+from django.urls import path
 from rest_framework.routers import DefaultRouter
-from .views import SignalViewSet, AnalyzedNewsViewSet
+from .views import SignalViewSet, AnalyzedNewsViewSet, ArchiveView, BacktestView, RollupView, SearchView
 
 router = DefaultRouter()
 router.register(r'signals', SignalViewSet)
 router.register(r'analyzed-news', AnalyzedNewsViewSet)
 
-urlpatterns = router.urls 
\ No newline at end of file
+urlpatterns = router.urls + [
+    path('backtest/', BacktestView.as_view(), name='backtest'),
+    path('rollups/', RollupView.as_view(), name='rollups'),
+    path('search/', SearchView.as_view(), name='search'),
+    path('archive/<str:kind>/', ArchiveView.as_view(), name='archive'),
+]
@@ -0,0 +1,134 @@
+import logging
+from typing import Any, Dict, Iterable, List
+
+import numpy as np
+import pandas as pd
+
+from ai.utils.price_store import EPOCH, PriceStore
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_HORIZONS = (1, 5, 20)
+CONFIDENCE_BINS = [0.0, 0.25, 0.5, 0.75, 1.0]
+CONFIDENCE_LABELS = ['0-0.25', '0.25-0.5', '0.5-0.75', '0.75-1']
+# 'entry' signals are treated as long entries.
+DIRECTIONS = {'buy': 1.0, 'entry': 1.0, 'sell': -1.0}
+
+
+def load_signals(queryset=None) -> pd.DataFrame:
+    """
+    Load signals with the sentiment of their analyzed story into a DataFrame.
+
+    Columns: ``symbol``, ``type``, ``timestamp``, ``confidence``, ``sentiment``.
+    """
+    from ai.models import AnalyzedNews, Signal
+
+    queryset = queryset if queryset is not None else Signal.objects.all()
+    signals = pd.DataFrame.from_records(
+        queryset.values_list('news_story_id', 'symbol', 'type', 'timestamp', 'confidence'),
+        columns=['news_story_id', 'symbol', 'type', 'timestamp', 'confidence'],
+    )
+    sentiment = pd.DataFrame.from_records(
+        AnalyzedNews.objects.filter(news_story_id__in=queryset.values('news_story_id'))
+        .values_list('news_story_id', 'tags__sentiment'),
+        columns=['news_story_id', 'sentiment'],
+    ).drop_duplicates('news_story_id')
+    return signals.merge(sentiment, on='news_story_id', how='left').drop(columns='news_story_id')
+
+
+def forward_returns(signals: pd.DataFrame, store: PriceStore,
+                    horizons: Iterable[int] = DEFAULT_HORIZONS) -> pd.DataFrame:
+    """
+    Attach entry price and forward returns to every signal.
+
+    Entry is the close on or before the signal's day; the exit for horizon
+    ``h`` is the close ``h`` trading days later. Returns for horizons that
+    run past the end of the store are NaN.
+    """
+    out = signals.copy()
+    horizons = list(horizons)
+    if not store.n_days:
+        out['entry_price'] = np.nan
+        for h in horizons:
+            out[f'return_{h}'] = np.nan
+        return out
+
+    close = store.arrays['close_ffill']
+    trading_rank = np.asarray(store.arrays['trading_rank'])
+    trading_days = np.asarray(store.arrays['trading_days'])
+
+    cols = out['symbol'].map(store.symbol_index).to_numpy(dtype=float)
+    timestamps = pd.to_datetime(out['timestamp'], utc=True, errors='coerce').dt.tz_localize(None).dt.normalize()
+    rows = (timestamps - pd.Timestamp(EPOCH)).dt.days.to_numpy() - store.start_day
+    valid = ~np.isnan(cols) & (rows >= 0)
+    cols = np.where(valid, cols, 0).astype(np.int64)
+    rows = np.minimum(np.where(valid, rows, 0), store.n_days - 1).astype(np.int64)
+    ranks = trading_rank[rows]
+    valid &= ranks >= 0
+
+    entry = np.where(valid, close[rows, cols], np.nan)
+    out['entry_price'] = entry
+    for h in horizons:
+        exit_ranks = ranks + h
+        ok = valid & (exit_ranks < len(trading_days))
+        exit_rows = np.zeros(len(out), dtype=np.int64)
+        exit_rows[ok] = trading_days[exit_ranks[ok]] - store.start_day
+        exit_price = np.where(ok, close[exit_rows, cols], np.nan)
+        out[f'return_{h}'] = exit_price / entry - 1.0
+    return out
+
+
+def _summarize(frame: pd.DataFrame, by: str, h: int) -> List[Dict[str, Any]]:
+    grouped = frame.groupby(by, observed=True, dropna=True).agg(
+        count=(f'return_{h}', 'size'),
+        hit_rate=(f'hit_{h}', 'mean'),
+        mean_return=(f'signed_{h}', 'mean'),
+        mean_pnl=(f'pnl_{h}', 'mean'),
+        total_pnl=(f'pnl_{h}', 'sum'),
+    ).reset_index()
+    return grouped.replace({np.nan: None}).to_dict('records')
+
+
+def run_backtest(signals: pd.DataFrame, store: PriceStore,
+                 horizons: Iterable[int] = DEFAULT_HORIZONS,
+                 slippage_bps: float = 10.0) -> Dict[str, Any]:
+    """
+    Backtest signals against the price store.
+
+    Every signal is a unit position held for ``h`` trading days. PnL is the
+    direction-signed return less ``slippage_bps`` on entry and on exit.
+
+    Returns:
+        dict: Overall, per-confidence-bucket, per-symbol and per-sentiment
+        stats for each horizon
+    """
+    horizons = sorted(set(int(h) for h in horizons))
+    frame = forward_returns(signals, store, horizons)
+    direction = frame['type'].map(DIRECTIONS).to_numpy(dtype=float)
+    confidence = pd.to_numeric(frame['confidence'], errors='coerce').clip(0, 1)
+    frame['confidence_bucket'] = pd.cut(confidence, CONFIDENCE_BINS, labels=CONFIDENCE_LABELS,
+                                        include_lowest=True)
+    frame['sentiment'] = frame['sentiment'].fillna('unknown')
+    cost = 2 * slippage_bps / 10_000
+
+    result = {'signals': len(frame), 'slippage_bps': slippage_bps, 'horizons': {}}
+    for h in horizons:
+        signed = direction * frame[f'return_{h}'].to_numpy()
+        frame[f'signed_{h}'] = signed
+        frame[f'pnl_{h}'] = signed - cost
+        frame[f'hit_{h}'] = np.where(np.isnan(signed), np.nan, signed > 0)
+        evaluated = frame[~np.isnan(signed)]
+        pnl = evaluated[f'pnl_{h}']
+        result['horizons'][str(h)] = {
+            'overall': {
+                'count': len(evaluated),
+                'hit_rate': float(evaluated[f'hit_{h}'].mean()) if len(evaluated) else None,
+                'mean_return': float(evaluated[f'signed_{h}'].mean()) if len(evaluated) else None,
+                'mean_pnl': float(pnl.mean()) if len(evaluated) else None,
+                'total_pnl': float(pnl.sum()),
+            },
+            'by_confidence': _summarize(evaluated, 'confidence_bucket', h),
+            'by_symbol': _summarize(evaluated, 'symbol', h),
+            'by_sentiment': _summarize(evaluated, 'sentiment', h),
+        }
+    return result
@@ -0,0 +1,123 @@
+"""
+Incremental parsing of streamed ``{"signals": [...], "news": [...]}`` completions.
+
+The scanner tracks string and bracket state one character at a time and
+only buffers the item or key currently open, so memory stays bounded by
+the largest item rather than the whole response.
+"""
+import json
+import logging
+from typing import Any, Callable, Iterable, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+
+class ItemStreamParser:
+    """
+    Emits each object in the top-level ``keys`` arrays as soon as it closes.
+
+    Text before the opening ``{`` (such as a markdown fence) and after the
+    closing ``}`` is ignored. An item that fails ``json.loads`` or
+    ``validate(key, item)`` is counted in ``dropped`` and skipped; so is one
+    still open when the stream ends. ``started`` and ``finished`` record
+    whether the top-level object was opened and closed, so a caller can tell
+    an empty response from a refusal or one cut off early.
+    """
+
+    def __init__(self, keys: Iterable[str] = ('signals', 'news'),
+                 validate: Optional[Callable[[str, Any], None]] = None):
+        self.keys = frozenset(keys)
+        self.validate = validate
+        self.dropped = 0
+        self.started = False
+        self.finished = False
+        self._text = ''
+        self._pos = 0
+        self._stack = []
+        self._in_string = False
+        self._escape = False
+        self._string_start = None  # start of a key string being read
+        self._last_key = None  # the most recent top-level key string, until its ':'
+        self._key = None  # the top-level key whose value is being read
+        self._item_start = None
+
+    def feed(self, chunk: str) -> List[Tuple[str, Any]]:
+        """Consume ``chunk`` and return the ``(key, item)`` pairs it completed."""
+        if self.finished:
+            return []
+        items = []
+        text = self._text + chunk
+        i = self._pos
+        stack = self._stack
+        while i < len(text) and not self.finished:
+            c = text[i]
+            if self._in_string:
+                if self._escape:
+                    self._escape = False
+                elif c == '\\':
+                    self._escape = True
+                elif c == '"':
+                    self._in_string = False
+                    if self._string_start is not None:
+                        self._last_key = text[self._string_start:i + 1]
+                        self._string_start = None
+            elif not stack:
+                if c == '{':
+                    self.started = True
+                    stack.append(c)
+            elif c == '"':
+                self._in_string = True
+                if len(stack) == 1:
+                    self._string_start = i
+            elif c == ':' and len(stack) == 1 and self._last_key is not None:
+                try:
+                    self._key = json.loads(self._last_key)
+                except ValueError:
+                    self._key = None
+                self._last_key = None
+            elif c in '{[':
+                if c == '{' and len(stack) == 2 and stack[1] == '[' and self._key in self.keys:
+                    self._item_start = i
+                stack.append(c)
+            elif c in '}]':
+                stack.pop()
+                if self._item_start is not None and len(stack) == 2:
+                    item = self._close_item(text[self._item_start:i + 1])
+                    if item is not None:
+                        items.append((self._key, item))
+                    self._item_start = None
+                elif not stack:
+                    self.finished = True
+            i += 1
+
+        # Keep only the text of what is still open.
+        keep = i
+        if self._item_start is not None:
+            keep = self._item_start
+        elif self._string_start is not None:
+            keep = self._string_start
+        self._text = text[keep:]
+        self._pos = i - keep
+        if self._item_start is not None:
+            self._item_start -= keep
+        if self._string_start is not None:
+            self._string_start -= keep
+        return items
+
+    def _close_item(self, raw: str) -> Optional[Any]:
+        try:
+            item = json.loads(raw)
+            if self.validate:
+                self.validate(self._key, item)
+            return item
+        except ValueError as e:
+            self.dropped += 1
+            logger.warning(f"Dropping malformed {self._key} item ({e}): {raw[:200]}")
+            return None
+
+    def close(self) -> None:
+        """Mark the end of the stream; an item still open is dropped."""
+        if self._item_start is not None:
+            self.dropped += 1
+            logger.warning(f"Dropping truncated {self._key} item: {self._text[self._item_start:][:200]}")
+            self._item_start = None
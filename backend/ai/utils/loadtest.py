@@ -0,0 +1,186 @@
+"""
+Local load-test harness: serves the real WSGI application in-process and
+drives it over HTTP from a pool of client threads.
+
+The server counts database queries per request with a connection execute
+wrapper and reports them in the ``X-Query-Count`` response header.
+"""
+import http.client
+import random
+import resource
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from socketserver import ThreadingMixIn
+from typing import Callable, Dict, List, Optional
+from wsgiref.simple_server import WSGIRequestHandler, WSGIServer, make_server
+
+import numpy as np
+from django.db import connection
+
+QUERY_COUNT_HEADER = 'X-Query-Count'
+
+
+class _QueryCounter:
+    def __init__(self):
+        self.count = 0
+
+    def __call__(self, execute, sql, params, many, context):
+        self.count += 1
+        return execute(sql, params, many, context)
+
+
+def counting_app(application):
+    """Wrap a WSGI app so each response carries its database query count."""
+
+    def app(environ, start_response):
+        counter = _QueryCounter()
+        captured = {}
+
+        def capture(status, headers, exc_info=None):
+            captured['status'], captured['headers'], captured['exc_info'] = status, headers, exc_info
+
+        with connection.execute_wrapper(counter):
+            result = application(environ, capture)
+            try:
+                body = b''.join(result)
+            finally:
+                if hasattr(result, 'close'):
+                    result.close()
+        start_response(captured['status'], captured['headers'] + [(QUERY_COUNT_HEADER, str(counter.count))],
+                       captured['exc_info'])
+        return [body]
+
+    return app
+
+
+class _ThreadingWSGIServer(ThreadingMixIn, WSGIServer):
+    daemon_threads = True
+    request_queue_size = 128
+
+
+class _QuietHandler(WSGIRequestHandler):
+    def log_message(self, format, *args):
+        pass
+
+
+class LocalServer:
+    """``application`` on an ephemeral 127.0.0.1 port, one thread per request."""
+
+    def __init__(self, application):
+        self.httpd = make_server('127.0.0.1', 0, counting_app(application),
+                                 server_class=_ThreadingWSGIServer, handler_class=_QuietHandler)
+        self.port = self.httpd.server_address[1]
+        self.thread = threading.Thread(target=self.httpd.serve_forever, daemon=True)
+
+    def __enter__(self):
+        self.thread.start()
+        return self
+
+    def __exit__(self, *exc):
+        self.httpd.shutdown()
+        self.httpd.server_close()
+
+
+@dataclass
+class ScenarioResult:
+    name: str
+    latencies_ms: List[float] = field(default_factory=list)
+    queries: List[int] = field(default_factory=list)
+    errors: int = 0
+    elapsed: float = 0.0
+
+    @property
+    def requests(self) -> int:
+        return len(self.latencies_ms) + self.errors
+
+    def summary(self) -> Dict[str, float]:
+        latencies = np.asarray(self.latencies_ms) if self.latencies_ms else np.asarray([np.nan])
+        return {
+            'requests': self.requests,
+            'errors': self.errors,
+            'error_rate': self.errors / self.requests if self.requests else 0.0,
+            'rps': len(self.latencies_ms) / self.elapsed if self.elapsed else 0.0,
+            'p50_ms': float(np.percentile(latencies, 50)),
+            'p95_ms': float(np.percentile(latencies, 95)),
+            'p99_ms': float(np.percentile(latencies, 99)),
+            'max_ms': float(np.max(latencies)),
+            'queries_per_request': float(np.mean(self.queries)) if self.queries else 0.0,
+        }
+
+
+def run_scenario(name: str, port: int, make_path: Callable[[random.Random], str], concurrency: int,
+                 duration: float, max_requests: Optional[int] = None, seed: int = 0) -> ScenarioResult:
+    """
+    Issue GETs for ``make_path`` from ``concurrency`` keep-alive clients for ``duration`` seconds.
+
+    A request counts as an error on a non-2xx status or a transport failure.
+    """
+    result = ScenarioResult(name)
+    lock = threading.Lock()
+    deadline = time.perf_counter() + duration
+    issued = [0]
+
+    def worker(worker_id: int):
+        rng = random.Random(seed * 1000 + worker_id)
+        client = http.client.HTTPConnection('127.0.0.1', port, timeout=60)
+        latencies, queries, errors = [], [], 0
+        while time.perf_counter() < deadline:
+            with lock:
+                if max_requests is not None and issued[0] >= max_requests:
+                    break
+                issued[0] += 1
+            path = make_path(rng)
+            t0 = time.perf_counter()
+            try:
+                client.request('GET', path, headers={'Accept': 'application/json'})
+                response = client.getresponse()
+                response.read()
+            except (OSError, http.client.HTTPException):
+                errors += 1
+                client.close()
+                client = http.client.HTTPConnection('127.0.0.1', port, timeout=60)
+                continue
+            if 200 <= response.status < 300:
+                latencies.append((time.perf_counter() - t0) * 1000)
+                queries.append(int(response.getheader(QUERY_COUNT_HEADER, 0)))
+            else:
+                errors += 1
+            if response.will_close:
+                client.close()
+        client.close()
+        with lock:
+            result.latencies_ms.extend(latencies)
+            result.queries.extend(queries)
+            result.errors += errors
+
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as pool:
+        list(pool.map(worker, range(concurrency)))
+    result.elapsed = time.perf_counter() - start
+    return result
+
+
+def peak_rss_mb() -> float:
+    """Peak resident set size of this process (server and clients together)."""
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+
+def check_thresholds(summary: Dict[str, float], thresholds: Dict[str, float]) -> List[str]:
+    """
+    Compare a scenario summary with ``max_<metric>`` / ``min_<metric>`` limits.
+
+    Returns a description of every breached limit.
+    """
+    breaches = []
+    for key, limit in thresholds.items():
+        if limit is None:
+            continue
+        bound, metric = key.split('_', 1)
+        value = summary.get(metric)
+        if value is None:
+            continue
+        if (bound == 'max' and value > limit) or (bound == 'min' and value < limit):
+            breaches.append(f"{metric} {value:.2f} {'>' if bound == 'max' else '<'} {limit}")
+    return breaches
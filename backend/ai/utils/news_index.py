@@ -0,0 +1,136 @@
+import chromadb
+import logging
+import os
+import time
+from typing import Any, Dict, Iterable, List, Optional
+
+from django.conf import settings
+from django_redis import get_redis_connection
+
+logger = logging.getLogger(__name__)
+
+PENDING_KEY = "news_embedding_pending"
+
+
+def _symbol_key(symbol: str) -> str:
+    return f"sym_{symbol}"
+
+
+class NewsIndex:
+    """
+    Vector index of analyzed news summaries in the ``analyzed_news`` ChromaDB collection.
+
+    Each document is keyed by ``AnalyzedNews.id``. Metadata holds the publish
+    time as a Unix timestamp and one ``sym_<SYMBOL>: True`` flag per tagged
+    stock so symbol filters run inside ChromaDB.
+    """
+    COLLECTION = "analyzed_news"
+
+    def __init__(self, client=None, max_retries: int = 3, retry_delay: int = 5):
+        self.client = client
+        self.collection = None
+        self._connect_chromadb(max_retries, retry_delay)
+
+    def _connect_chromadb(self, max_retries: int = 3, retry_delay: int = 5):
+        """Connect to ChromaDB and get or create the analyzed_news collection."""
+        for attempt in range(max_retries):
+            try:
+                if self.client is None:
+                    self.client = chromadb.HttpClient(
+                        host=os.getenv('CHROMA_SERVER_HOST', 'chromadb'),
+                        port=int(os.getenv('CHROMA_SERVER_PORT', 8000))
+                    )
+                self.collection = self.client.get_or_create_collection(
+                    self.COLLECTION,
+                    metadata={"description": "Analyzed news summaries", "hnsw:space": "cosine"},
+                )
+                return
+            except Exception as e:
+                logger.warning(f"Attempt {attempt + 1}/{max_retries} failed to connect to ChromaDB: {e}")
+                self.client = None
+                if attempt < max_retries - 1:
+                    time.sleep(retry_delay)
+        logger.error("Failed to connect to ChromaDB after all retries")
+        self.collection = None
+
+    @staticmethod
+    def metadata_for(analyzed) -> Dict[str, Any]:
+        from ai.utils.rollups import tag_symbols
+
+        metadata = {
+            "news_story_id": analyzed.news_story_id,
+            "published_at": analyzed.published_at.timestamp(),
+        }
+        for symbol in tag_symbols(analyzed.tags):
+            metadata[_symbol_key(symbol)] = True
+        return metadata
+
+    def upsert(self, analyzed_items: Iterable, embeddings: List[List[float]] = None) -> int:
+        """Embed and upsert a batch of AnalyzedNews rows in a single ChromaDB call."""
+        analyzed_items = [a for a in analyzed_items if a.summary]
+        if not self.collection or not analyzed_items:
+            return 0
+        self.collection.upsert(
+            ids=[str(a.id) for a in analyzed_items],
+            documents=[a.summary for a in analyzed_items],
+            metadatas=[self.metadata_for(a) for a in analyzed_items],
+            embeddings=embeddings,
+        )
+        return len(analyzed_items)
+
+    def similar(self, analyzed, k: int = 10, symbols: Optional[List[str]] = None,
+                half_life_hours: Optional[float] = None, overfetch: int = 4) -> List[Dict[str, Any]]:
+        """
+        Nearest stories to ``analyzed``, re-ranked with an exponential time decay.
+
+        ``score = similarity * 0.5 ** (|age difference| / half_life_hours)``.
+
+        Returns:
+            list: ``{"id", "similarity", "score"}`` dicts, best first
+        """
+        if not self.collection:
+            logger.error("ChromaDB news collection not available.")
+            return []
+        half_life_hours = half_life_hours or settings.SIMILAR_NEWS_HALF_LIFE_HOURS
+        where = None
+        if symbols:
+            clauses = [{_symbol_key(s): True} for s in symbols]
+            where = clauses[0] if len(clauses) == 1 else {"$or": clauses}
+
+        own = self.collection.get(ids=[str(analyzed.id)], include=["embeddings"])
+        query = {"query_texts": [analyzed.summary]}
+        if len(own["ids"]) and own["embeddings"] is not None and len(own["embeddings"]):
+            query = {"query_embeddings": [list(own["embeddings"][0])]}
+        results = self.collection.query(
+            n_results=k * overfetch + 1,
+            where=where,
+            include=["metadatas", "distances"],
+            **query,
+        )
+
+        published_at = analyzed.published_at.timestamp()
+        ranked = []
+        for doc_id, metadata, distance in zip(results["ids"][0], results["metadatas"][0], results["distances"][0]):
+            if doc_id == str(analyzed.id):
+                continue
+            similarity = 1.0 - distance
+            age_hours = abs(published_at - metadata["published_at"]) / 3600
+            ranked.append({
+                "id": int(doc_id),
+                "similarity": similarity,
+                "score": similarity * 0.5 ** (age_hours / half_life_hours),
+            })
+        ranked.sort(key=lambda r: r["score"], reverse=True)
+        return ranked[:k]
+
+
+def enqueue_for_embedding(analyzed_ids: Iterable[int]) -> None:
+    """Queue AnalyzedNews ids for the next batched embedding run."""
+    analyzed_ids = list(analyzed_ids)
+    if analyzed_ids:
+        get_redis_connection('default').sadd(PENDING_KEY, *analyzed_ids)
+
+
+def pop_pending(count: int) -> List[int]:
+    """Take up to ``count`` queued ids; callers re-queue them if the upsert fails."""
+    return [int(i) for i in get_redis_connection('default').spop(PENDING_KEY, count) or []]
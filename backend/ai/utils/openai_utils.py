@@ -1,49 +1,104 @@
 import os
 import json
 import logging
-from typing import List, Dict, Any
+from functools import lru_cache
+from typing import Any, Callable, Dict, Iterator, List
+from django.conf import settings
 from openai import OpenAI
+from ai.utils.json_stream import ItemStreamParser
 from ai.utils.stock_universe import StockUniverse
 from datetime import datetime
 
 logger = logging.getLogger(__name__)
 
-def get_gpt_response(prompt: str) -> str:
-    """Get response from GPT-4 model."""
+
+class IncompleteResponseError(Exception):
+    """A streamed response ended without a usable result; retrying may succeed."""
+
+@lru_cache(maxsize=None)
+def _openai_client(api_key: str, base_url: str = None) -> OpenAI:
+    # One client per process keeps its connection pool; the triage and
+    # analysis calls of a story reuse the same connections.
+    return OpenAI(api_key=api_key, base_url=base_url)
+
+
+def get_gpt_response(prompt: str, model: str = None, max_tokens: int = 2000) -> str:
+    """Get a completion from ``model``, ``settings.ANALYSIS_MODEL`` by default."""
     api_key = os.environ.get('OPENAI_API_KEY')
     if not api_key:
         raise ValueError("OPENAI_API_KEY environment variable not set")
         
-    client = OpenAI(api_key=api_key)
+    client = _openai_client(api_key, os.environ.get('OPENAI_BASE_URL'))
     response = client.chat.completions.create(
-        model="gpt-4",
+        model=model or settings.ANALYSIS_MODEL,
         messages=[{"role": "user", "content": prompt}],
         temperature=0.1,
-        max_tokens=2000  # Limit response size
+        max_tokens=max_tokens  # Limit response size
     )
     return response.choices[0].message.content
 
-def analyze_news_with_gpt(news_items: List[Dict], stock_universe: StockUniverse) -> Dict[str, Any]:
-    """Analyze news items using GPT and map companies to stocks in the universe."""
-    # Format news items for GPT analysis
-    news_text = "\n\n".join([
+# OpenAI's rule of thumb for English text; close enough to budget prompt space.
+CHARS_PER_TOKEN = 4
+
+
+def truncate_to_tokens(text: str, max_tokens: int) -> str:
+    """Cut ``text`` to roughly ``max_tokens`` tokens, at a word boundary."""
+    limit = max_tokens * CHARS_PER_TOKEN
+    if len(text) <= limit:
+        return text
+    cut = text[:limit]
+    return cut[:cut.rfind(' ')] if ' ' in cut else cut
+
+
+def stream_gpt_response(prompt: str, model: str = None, max_tokens: int = 2000) -> Iterator[str]:
+    """Yield the text of a completion from ``model`` as it is generated."""
+    api_key = os.environ.get('OPENAI_API_KEY')
+    if not api_key:
+        raise ValueError("OPENAI_API_KEY environment variable not set")
+
+    client = _openai_client(api_key, os.environ.get('OPENAI_BASE_URL'))
+    stream = client.chat.completions.create(
+        model=model or settings.ANALYSIS_MODEL,
+        messages=[{"role": "user", "content": prompt}],
+        temperature=0.1,
+        max_tokens=max_tokens,
+        stream=True,
+    )
+    for chunk in stream:
+        if chunk.choices and chunk.choices[0].delta.content:
+            yield chunk.choices[0].delta.content
+
+def format_news_text(news_items: List[Dict]) -> str:
+    """Format news items for GPT analysis and candidate retrieval."""
+    return "\n\n".join([
         f"Title: {item.get('title', '')}\n"
         f"Description: {item.get('description', '')}\n"
         f"Published: {item.get('datetime', datetime.utcnow().isoformat())}\n"
         f"Source: {item.get('source', 'News Source')}\n"
         f"URL: {item.get('link', '')}"
+        + (f"\nArticle: {item['body']}" if item.get('body') else "")
         for item in news_items
     ])
-    
+
+def analyze_news_with_gpt(news_items: List[Dict], stock_universe: StockUniverse) -> Dict[str, Any]:
+    """Analyze news items using GPT and map companies to stocks in the universe."""
+    news_text = format_news_text(news_items)
     # Get relevant stocks using ChromaDB
     relevant_stocks = stock_universe.get_relevant_stocks(news_text, n_results=5)  # Reduced from 10 to 5
-    
+    try:
+        return analyze_news_with_candidates(news_items, relevant_stocks)
+    except Exception as e:
+        logger.error(f"Error in analyze_news_with_gpt: {e}")
+        return {"signals": [], "news": []}
+
+def build_analysis_prompt(news_text: str, relevant_stocks: List[Dict[str, Any]]) -> str:
+    """Build the analysis prompt for news text and its candidate stocks."""
     # Format stock data more concisely
     stock_list = [f"{s['Symbol']}: {s['CompanyName']}" for s in relevant_stocks]  # Removed industry to save tokens
     stock_universe_text = "\n".join(stock_list)
     
     # Create prompt for GPT
-    prompt = f"""Analyze news and identify trading signals. Map companies to these stocks:
+    return f"""Analyze news and identify trading signals. Map companies to these stocks:
 
 {stock_universe_text}
 
@@ -70,19 +125,11 @@ Format:
         {{
             "title": "Original title",
             "summary": "Brief summary",
-            "content": "Full content",
             "publishedAt": "ISO8601 timestamp",
             "source": "Source name",
             "url": "URL",
             "tags": {{
-                "stocks": ["Stock symbols"],
-                "matched_stocks": [
-                    {{
-                        "symbol": "STOCK_SYMBOL",
-                        "company_name": "COMPANY_NAME",
-                        "industry": "INDUSTRY"
-                    }}
-                ],
+                "stocks": ["STOCK_SYMBOL"],
                 "sentiment": "positive/negative/neutral",
                 "impact": "high/medium/low",
                 "key_points": ["Key points"],
@@ -105,8 +152,70 @@ Rules:
 6. Keep all text fields on a single line
 7. Return only valid JSON"""
 
+def analyze_news_with_candidates(news_items: List[Dict], relevant_stocks: List[Dict[str, Any]]) -> Dict[str, Any]:
+    """
+    Analyze news items with GPT against already-retrieved candidate stocks.
+
+    Errors calling the API propagate so the caller can retry; a malformed
+    response yields empty signals and news.
+    """
+    prompt = build_analysis_prompt(format_news_text(news_items), relevant_stocks)
+    response_text = get_gpt_response(prompt)
+    return parse_gpt_response(response_text)
+
+# Single-line string fields required of each item, by response key
+ITEM_FIELDS = {
+    "signals": ("signal", ["type", "symbol", "reason", "timestamp"]),
+    "news": ("news", ["title", "summary", "publishedAt", "source", "url"]),
+}
+
+def validate_item(key: str, item: Any) -> None:
+    """Raise ``ValueError`` unless ``item`` has the string fields required under ``key``."""
+    label, fields = ITEM_FIELDS[key]
+    if not isinstance(item, dict):
+        raise ValueError(f"Invalid {label} item")
+    for field in fields:
+        if not isinstance(item.get(field), str):
+            raise ValueError(f"Invalid type for {label} field {field}")
+        if "\n" in item[field]:
+            raise ValueError(f"Line break found in {label} field {field}")
+
+def analyze_news_streaming(news_items: List[Dict], relevant_stocks: List[Dict[str, Any]],
+                           on_item: Callable[[str, Dict[str, Any]], None] = None) -> Dict[str, Any]:
+    """
+    Analyze news items like ``analyze_news_with_candidates``, reading the completion as it streams.
+
+    Each signal or news object is validated as soon as it closes and passed
+    to ``on_item(key, item)``. A malformed item is dropped on its own; the
+    items before and after it are kept.
+
+    Raises:
+        IncompleteResponseError: the response has no complete top-level
+            object (a refusal, plain text or a cut-off stream), or items
+            were dropped and no news item survived, which would leave the
+            story without analyzed news
+    """
+    prompt = build_analysis_prompt(format_news_text(news_items), relevant_stocks)
+    parser = ItemStreamParser(validate=validate_item)
+    result = {"signals": [], "news": []}
+    for chunk in stream_gpt_response(prompt):
+        for key, item in parser.feed(chunk):
+            result[key].append(item)
+            if on_item:
+                on_item(key, item)
+    parser.close()
+    if parser.dropped:
+        logger.warning(f"Dropped {parser.dropped} malformed items from a streamed GPT response")
+    if not parser.finished:
+        state = "was cut off" if parser.started else "has no JSON object"
+        raise IncompleteResponseError(f"Streamed GPT response {state}")
+    if parser.dropped and not result["news"]:
+        raise IncompleteResponseError(f"Streamed GPT response has no valid news item ({parser.dropped} items dropped)")
+    return result
+
+def parse_gpt_response(response_text: str) -> Dict[str, Any]:
+    """Strip markdown fences from a GPT response, then parse and validate its JSON."""
     try:
-        response_text = get_gpt_response(prompt)
         # Clean the response text to ensure valid JSON
         response_text = response_text.strip()
         if response_text.startswith('```json'):
@@ -128,18 +237,9 @@ Rules:
             
         # Validate string fields
         for signal in result["signals"]:
-            for field in ["type", "symbol", "reason", "timestamp"]:
-                if not isinstance(signal.get(field), str):
-                    raise ValueError(f"Invalid type for signal field {field}")
-                if "\n" in signal[field]:
-                    raise ValueError(f"Line break found in signal field {field}")
-                    
+            validate_item("signals", signal)
         for news_item in result["news"]:
-            for field in ["title", "summary", "content", "publishedAt", "source", "url"]:
-                if not isinstance(news_item.get(field), str):
-                    raise ValueError(f"Invalid type for news field {field}")
-                if "\n" in news_item[field]:
-                    raise ValueError(f"Line break found in news field {field}")
+            validate_item("news", news_item)
             
         return result
     except json.JSONDecodeError as e:
@@ -147,5 +247,5 @@ Rules:
         logger.error(f"Response text: {response_text}")
         return {"signals": [], "news": []}
     except Exception as e:
-        logger.error(f"Error in analyze_news_with_gpt: {e}")
-        return {"signals": [], "news": []} 
\ No newline at end of file
+        logger.error(f"Error in parse_gpt_response: {e}")
+        return {"signals": [], "news": []}
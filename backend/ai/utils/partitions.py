@@ -0,0 +1,261 @@
+"""
+Monthly range partitions for the time-series tables, and their archival.
+
+``ai_signal`` is partitioned on ``timestamp`` and ``ai_analyzednews`` on
+``published_at`` (see migration 0007). Partitions are named
+``<table>_pYYYY_MM`` and cover one UTC calendar month; a ``<table>_default``
+partition catches rows outside every monthly range. ``scrapy_newsstory``
+stays a plain table: other tables reference it by foreign key and its
+``link`` must stay globally unique, neither of which a partitioned table
+can offer without the partition key.
+"""
+import json
+import logging
+import os
+from datetime import date
+from pathlib import Path
+from typing import List, Optional
+
+from django.conf import settings
+from django.db import connection, transaction
+
+logger = logging.getLogger(__name__)
+
+PARTITIONED_TABLES = {
+    'ai_signal': 'timestamp',
+    'ai_analyzednews': 'published_at',
+}
+# Derived columns that are rebuilt on restore rather than archived
+ARCHIVE_EXCLUDED_COLUMNS = {'search_vector'}
+# Stored in Parquet as JSON strings
+JSON_COLUMNS = {'tags'}
+
+
+def month_start(value) -> date:
+    return date(value.year, value.month, 1)
+
+
+def add_months(month: date, n: int) -> date:
+    index = month.year * 12 + month.month - 1 + n
+    return date(index // 12, index % 12 + 1, 1)
+
+
+def partition_name(table: str, month: date) -> str:
+    return f"{table}_p{month:%Y_%m}"
+
+
+def _check_table(table: str) -> str:
+    if table not in PARTITIONED_TABLES:
+        raise ValueError(f"{table} is not a partitioned table")
+    return PARTITIONED_TABLES[table]
+
+
+def list_partitions(table: str) -> List[date]:
+    """Months that currently have an attached partition, oldest first."""
+    _check_table(table)
+    prefix = f"{table}_p"
+    with connection.cursor() as cursor:
+        cursor.execute(
+            """
+            SELECT child.relname FROM pg_inherits
+            JOIN pg_class parent ON parent.oid = pg_inherits.inhparent
+            JOIN pg_class child ON child.oid = pg_inherits.inhrelid
+            WHERE parent.relname = %s
+            """,
+            [table],
+        )
+        names = [row[0] for row in cursor.fetchall()]
+    months = []
+    for name in names:
+        if name.startswith(prefix):
+            year, month = name[len(prefix):].split('_')
+            months.append(date(int(year), int(month), 1))
+    return sorted(months)
+
+
+def create_partition(table: str, month: date) -> bool:
+    """
+    Create and attach the partition for ``month`` if it is missing.
+
+    Rows that already landed in the default partition for that month are
+    moved into the new partition before it is attached.
+    """
+    column = _check_table(table)
+    name = partition_name(table, month)
+    if month in list_partitions(table):
+        return False
+    start, end = month.isoformat(), add_months(month, 1).isoformat()
+    with transaction.atomic(), connection.cursor() as cursor:
+        cursor.execute(f'CREATE TABLE "{name}" (LIKE "{table}" INCLUDING DEFAULTS)')
+        cursor.execute(
+            f'WITH moved AS (DELETE FROM "{table}_default" '
+            f'WHERE "{column}" >= %s AND "{column}" < %s RETURNING *) '
+            f'INSERT INTO "{name}" SELECT * FROM moved',
+            [f"{start} 00:00:00+00", f"{end} 00:00:00+00"],
+        )
+        cursor.execute(
+            f'ALTER TABLE "{table}" ATTACH PARTITION "{name}" '
+            f"FOR VALUES FROM ('{start} 00:00:00+00') TO ('{end} 00:00:00+00')"
+        )
+    logger.info(f"Created partition {name}")
+    return True
+
+
+def ensure_partitions(table: str, months_ahead: int = None, today: date = None, since: date = None) -> List[str]:
+    """
+    Create partitions from the current month through ``months_ahead`` months ahead.
+
+    ``since`` extends the range back to cover history being loaded.
+    """
+    months_ahead = settings.PARTITION_MONTHS_AHEAD if months_ahead is None else months_ahead
+    current = month_start(today or date.today())
+    month = month_start(min(since, current)) if since else current
+    created = []
+    while month <= add_months(current, months_ahead):
+        if create_partition(table, month):
+            created.append(partition_name(table, month))
+        month = add_months(month, 1)
+    return created
+
+
+def retention_cutoff(retention_months: int = None, today: date = None) -> Optional[date]:
+    """First day still inside the retention window, or ``None`` when archival is disabled."""
+    retention_months = settings.PARTITION_RETENTION_MONTHS if retention_months is None else retention_months
+    if not retention_months:
+        return None
+    return add_months(month_start(today or date.today()), -retention_months)
+
+
+def archive_partition(table: str, month: date, archive_dir: Optional[str] = None):
+    """
+    Export one monthly partition to a zstd-compressed Parquet file, then detach and drop it.
+
+    JSON columns are stored as JSON strings. Before analyzed news is
+    dropped, its stories' ``AnalysisRun`` rows are marked done, so the
+    backfill never sends archived stories back to the model. Returns the
+    ``ArchivedPartition`` record.
+    """
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+    from ai.models import AnalysisRun, ArchivedPartition
+
+    _check_table(table)
+    name = partition_name(table, month)
+    directory = Path(archive_dir or settings.ARCHIVE_DIR) / table
+    directory.mkdir(parents=True, exist_ok=True)
+    path = directory / f"{month:%Y-%m}.parquet"
+    tmp_path = path.with_suffix('.parquet.tmp')
+
+    rows = 0
+    writer = None
+    with transaction.atomic():
+        with connection.cursor() as cursor:
+            cursor.execute(
+                "SELECT column_name FROM information_schema.columns "
+                "WHERE table_name = %s ORDER BY ordinal_position",
+                [name],
+            )
+            columns = [c for (c,) in cursor.fetchall() if c not in ARCHIVE_EXCLUDED_COLUMNS]
+            select = ', '.join(f'"{c}"' for c in columns)
+            # A named (server-side) cursor streams the partition instead of loading it whole.
+            with connection.connection.cursor(name=f"archive_{name}") as stream:
+                stream.itersize = 10_000
+                stream.execute(f'SELECT {select} FROM "{name}" ORDER BY id')
+                while True:
+                    batch = stream.fetchmany(10_000)
+                    if not batch:
+                        break
+                    data = {
+                        column: [json.dumps(row[i]) if column in JSON_COLUMNS else row[i] for row in batch]
+                        for i, column in enumerate(columns)
+                    }
+                    record_batch = pa.RecordBatch.from_pydict(data)
+                    if writer is None:
+                        writer = pq.ParquetWriter(tmp_path, record_batch.schema, compression='zstd')
+                    writer.write_batch(record_batch)
+                    rows += len(batch)
+        if writer is not None:
+            writer.close()
+            os.replace(tmp_path, path)
+
+        with connection.cursor() as cursor:
+            if table == 'ai_analyzednews':
+                cursor.execute(
+                    f'INSERT INTO "{AnalysisRun._meta.db_table}" '
+                    '(news_story_id, stage, attempts, last_error, created_at, updated_at) '
+                    f"SELECT DISTINCT news_story_id, 'done', 0, '', now(), now() FROM \"{name}\" "
+                    "ON CONFLICT (news_story_id) DO UPDATE SET stage = 'done', updated_at = now()"
+                )
+            cursor.execute(f'ALTER TABLE "{table}" DETACH PARTITION "{name}"')
+            cursor.execute(f'DROP TABLE "{name}"')
+        record = ArchivedPartition.objects.create(
+            table=table,
+            range_start=month,
+            range_end=add_months(month, 1),
+            path=str(path) if rows else '',
+            row_count=rows,
+            size_bytes=path.stat().st_size if rows else 0,
+        )
+    logger.info(f"Archived {rows} rows from {name} to {path}")
+    return record
+
+
+def archive_old_partitions(retention_months: int = None, today: date = None, dry_run: bool = False):
+    """
+    Archive every monthly partition that ends before the retention window.
+
+    A retention of 0 months disables archival.
+    """
+    cutoff = retention_cutoff(retention_months, today)
+    if cutoff is None:
+        return []
+    archived = []
+    for table in PARTITIONED_TABLES:
+        for month in list_partitions(table):
+            if add_months(month, 1) <= cutoff:
+                archived.append(partition_name(table, month) if dry_run else archive_partition(table, month))
+    return archived
+
+
+def read_archive(table: str, start=None, end=None, filters: Optional[dict] = None, limit: int = 100,
+                 offset: int = 0) -> List[dict]:
+    """
+    Read archived rows whose partition column falls in ``[start, end)``, newest first.
+
+    ``start`` and ``end`` are aware datetimes; ``filters`` maps column names
+    to required values. Only Parquet files whose month overlaps the range
+    are opened.
+    """
+    import pyarrow.compute as pc
+    import pyarrow.dataset as ds
+    from ai.models import ArchivedPartition
+
+    column = _check_table(table)
+    archives = ArchivedPartition.objects.filter(table=table).exclude(path='').order_by('range_start')
+    if start:
+        archives = archives.filter(range_end__gt=start.date())
+    if end:
+        archives = archives.filter(range_start__lte=end.date())
+    paths = [a.path for a in archives]
+    if not paths:
+        return []
+
+    dataset = ds.dataset(paths, format='parquet')
+    condition = None
+    expressions = []
+    if start:
+        expressions.append(ds.field(column) >= start)
+    if end:
+        expressions.append(ds.field(column) < end)
+    for field, value in (filters or {}).items():
+        expressions.append(ds.field(field) == value)
+    for expression in expressions:
+        condition = expression if condition is None else condition & expression
+    table_data = dataset.to_table(filter=condition)
+    # Partial top-k instead of a full sort: the range can span millions of rows
+    top = pc.select_k_unstable(table_data, k=offset + limit, sort_keys=[(column, 'descending')])
+    rows = table_data.take(top).sort_by([(column, 'descending')]).slice(offset, limit).to_pylist()
+    for row in rows:
+        for field in JSON_COLUMNS & row.keys():
+            row[field] = json.loads(row[field]) if row[field] is not None else None
+    return rows
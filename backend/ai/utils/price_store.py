@@ -0,0 +1,358 @@
+import json
+import logging
+import os
+import shutil
+import threading
+from datetime import date, datetime, timedelta
+from pathlib import Path
+from typing import Callable, Dict, Iterable, List, Optional
+
+import numpy as np
+import pandas as pd
+from django.conf import settings
+
+logger = logging.getLogger(__name__)
+
+FIELDS = ('open', 'high', 'low', 'close', 'volume')
+EPOCH = date(1970, 1, 1)
+
+
+def to_day(value) -> int:
+    """Days since the Unix epoch for a date, datetime or ISO8601 string."""
+    if isinstance(value, str):
+        value = datetime.fromisoformat(value.replace('Z', '+00:00'))
+    if isinstance(value, datetime):
+        value = value.date()
+    return (value - EPOCH).days
+
+
+def from_day(day: int) -> date:
+    return EPOCH + timedelta(days=int(day))
+
+
+class PriceStore:
+    """
+    Local daily OHLCV store for the stock universe.
+
+    Every field is a dense ``(calendar day, symbol)`` float64 matrix saved as
+    a ``.npy`` file and memory-mapped on read, so a lookup is two integer
+    offsets into an array. Two derived arrays make the common queries O(1):
+
+    * ``close_ffill`` -- close forward-filled over non-trading days, used for
+      "price as of" lookups.
+    * ``trading_rank`` / ``trading_days`` -- the index of the last trading
+      day on or before each calendar day, used for "N trading days ago".
+
+    Each write goes to a new version directory (``v000001``, ...) that is
+    never modified afterwards, and the ``current`` symlink is swapped to it
+    in one rename. A reader resolves the link once and maps every file from
+    that directory, so it never mixes arrays and metadata of two writes.
+    """
+    KEEP_VERSIONS = 3
+    ARRAYS = FIELDS + ('close_ffill', 'trading_rank', 'trading_days')
+
+    def __init__(self, path=None):
+        self.path = Path(path or settings.PRICE_STORE_DIR)
+        self.start_day = None
+        self.symbols: List[str] = []
+        self.symbol_index: Dict[str, int] = {}
+        self.arrays: Dict[str, np.ndarray] = {}
+        # Per symbol, the last day already downloaded even though it had no bar
+        self.checked: Dict[str, int] = {}
+        self.version_dir: Optional[Path] = None
+        self.load()
+
+    def _current_dir(self) -> Optional[Path]:
+        """Directory of the live version; ``None`` for an empty store."""
+        link = self.path / 'current'
+        if link.is_symlink():
+            return self.path / os.readlink(link)
+        if (self.path / 'meta.json').exists():
+            # Written before versioning: files directly in the store directory
+            return self.path
+        return None
+
+    def load(self) -> None:
+        """Memory-map the arrays of the current version; an empty store is valid."""
+        for _ in range(3):
+            version_dir = self._current_dir()
+            try:
+                self._load(version_dir)
+                return
+            except FileNotFoundError:
+                # Pruned between resolving the link and reading it; resolve again
+                continue
+        self._load(self._current_dir())
+
+    def _load(self, version_dir: Optional[Path]) -> None:
+        meta = json.loads((version_dir / 'meta.json').read_text()) if version_dir else {}
+        self.start_day = meta.get('start_day')
+        self.symbols = meta.get('symbols', [])
+        self.symbol_index = {s: i for i, s in enumerate(self.symbols)}
+        self.checked = meta.get('checked', {})
+        self.arrays = {} if self.start_day is None else {
+            name: np.load(version_dir / f'{name}.npy', mmap_mode='r') for name in self.ARRAYS
+        }
+        self.version_dir = version_dir
+
+    def is_stale(self) -> bool:
+        """True if another process wrote a new version since this one was loaded."""
+        return self._current_dir() != self.version_dir
+
+    @property
+    def n_days(self) -> int:
+        return self.arrays['close'].shape[0] if self.arrays else 0
+
+    @property
+    def end_day(self) -> Optional[int]:
+        return self.start_day + self.n_days - 1 if self.arrays else None
+
+    def _row(self, when) -> Optional[int]:
+        """Row for ``when``, clamped to the last stored day; None before the store starts."""
+        if not self.arrays:
+            return None
+        row = to_day(when) - self.start_day
+        if row < 0:
+            return None
+        return min(row, self.n_days - 1)
+
+    def has_bar(self, symbol: str, when) -> bool:
+        """True if there is a bar for ``symbol`` on exactly the day of ``when``."""
+        col = self.symbol_index.get(symbol)
+        if col is None or not self.arrays:
+            return False
+        row = to_day(when) - self.start_day
+        if row < 0 or row >= self.n_days:
+            return False
+        return not np.isnan(self.arrays['close'][row, col])
+
+    def close_asof(self, symbol: str, when) -> Optional[float]:
+        """Last close on or before ``when``."""
+        col = self.symbol_index.get(symbol)
+        row = self._row(when)
+        if col is None or row is None:
+            return None
+        value = self.arrays['close_ffill'][row, col]
+        return None if np.isnan(value) else float(value)
+
+    def price_change(self, symbol: str, when=None, days: int = 5) -> Optional[Dict[str, float]]:
+        """
+        Close-to-close change over the last ``days`` trading days ending at ``when``.
+
+        Mirrors ``history(period='5d')``: first vs last close of the window.
+        """
+        col = self.symbol_index.get(symbol)
+        row = self._row(when or datetime.utcnow())
+        if col is None or row is None:
+            return None
+        rank = int(self.arrays['trading_rank'][row])
+        if rank < 0:
+            return None
+        first_rank = max(rank - (days - 1), 0)
+        first_row = int(self.arrays['trading_days'][first_rank]) - self.start_day
+        last = self.arrays['close_ffill'][row, col]
+        first = self.arrays['close_ffill'][first_row, col]
+        if np.isnan(last) or np.isnan(first) or first == 0:
+            return None
+        change = float(last - first)
+        return {
+            'current_price': float(last),
+            'price_change': change,
+            'percent_change': change / float(first) * 100,
+        }
+
+    def last_days(self) -> Dict[str, int]:
+        """Last day with a bar, per symbol."""
+        if not self.arrays:
+            return {}
+        valid = ~np.isnan(self.arrays['close'])
+        has_any = valid.any(axis=0)
+        last_rows = self.n_days - 1 - np.argmax(valid[::-1], axis=0)
+        return {
+            symbol: self.start_day + int(last_rows[i])
+            for i, symbol in enumerate(self.symbols) if has_any[i]
+        }
+
+    def write_bars(self, bars: pd.DataFrame, checked: Dict[str, int] = None) -> int:
+        """
+        Merge daily bars into the store and write it as a new version.
+
+        Args:
+            bars: Columns ``symbol``, ``date`` and every name in ``FIELDS``
+            checked: Per symbol, the last day downloaded without a bar, so
+                the next update doesn't request it again
+
+        Returns:
+            int: Number of bars written
+        """
+        checked = {**self.checked, **{
+            symbol: max(int(day), self.checked.get(symbol, day)) for symbol, day in (checked or {}).items()
+        }}
+        bars = bars.dropna(subset=['close'])
+        if bars.empty:
+            if checked != self.checked:
+                arrays = {name: np.asarray(array) for name, array in self.arrays.items()}
+                self._write_version(self.start_day, list(self.symbols), arrays, checked)
+            return 0
+        days = (pd.to_datetime(bars['date']).dt.tz_localize(None).dt.normalize()
+                - pd.Timestamp(EPOCH)).dt.days.to_numpy()
+
+        symbols = list(self.symbols)
+        for symbol in pd.unique(bars['symbol']):
+            if symbol not in self.symbol_index:
+                symbols.append(symbol)
+        symbol_index = {s: i for i, s in enumerate(symbols)}
+
+        start_day = min(days.min(), self.start_day) if self.arrays else int(days.min())
+        end_day = max(days.max(), self.end_day) if self.arrays else int(days.max())
+        shape = (end_day - start_day + 1, len(symbols))
+
+        rows = days - start_day
+        cols = bars['symbol'].map(symbol_index).to_numpy()
+        offset = (self.start_day - start_day) if self.arrays else 0
+        merged = {}
+        for field in FIELDS:
+            matrix = np.full(shape, np.nan)
+            if self.arrays:
+                old = self.arrays[field]
+                matrix[offset:offset + old.shape[0], :old.shape[1]] = old
+            matrix[rows, cols] = bars[field].to_numpy(dtype=float)
+            merged[field] = matrix
+
+        close_ffill = pd.DataFrame(merged['close']).ffill().to_numpy()
+        is_trading = ~np.isnan(merged['close']).all(axis=1)
+        trading_days = np.flatnonzero(is_trading).astype(np.int64) + start_day
+        trading_rank = np.cumsum(is_trading).astype(np.int64) - 1
+
+        self._write_version(start_day, symbols, {
+            **merged,
+            'close_ffill': close_ffill,
+            'trading_rank': trading_rank,
+            'trading_days': trading_days,
+        }, checked)
+        return len(bars)
+
+    def _write_version(self, start_day: Optional[int], symbols: List[str], arrays: Dict[str, np.ndarray],
+                       checked: Dict[str, int]) -> None:
+        """Write a complete new version, point ``current`` at it and prune old versions."""
+        self.path.mkdir(parents=True, exist_ok=True)
+        versions = self._versions()
+        name = f"v{int(versions[-1].name[1:]) + 1 if versions else 1:06d}"
+        tmp_dir = self.path / f'.{name}.tmp'
+        shutil.rmtree(tmp_dir, ignore_errors=True)
+        tmp_dir.mkdir()
+        for array_name, array in arrays.items():
+            np.save(tmp_dir / f'{array_name}.npy', array)
+        (tmp_dir / 'meta.json').write_text(json.dumps({
+            'start_day': None if start_day is None else int(start_day),
+            'symbols': symbols,
+            'checked': {symbol: int(day) for symbol, day in checked.items()},
+        }))
+        os.rename(tmp_dir, self.path / name)
+        link_tmp = self.path / 'current.tmp'
+        if link_tmp.is_symlink() or link_tmp.exists():
+            link_tmp.unlink()
+        os.symlink(name, link_tmp)
+        os.replace(link_tmp, self.path / 'current')
+        self._prune()
+        self.load()
+
+    def _versions(self) -> List[Path]:
+        return sorted(p for p in self.path.glob('v[0-9]*') if p.is_dir())
+
+    def _prune(self) -> None:
+        """
+        Drop all but the newest ``KEEP_VERSIONS`` versions, and the unversioned files.
+
+        Readers that already mapped a removed file keep their mapping; the
+        spare versions cover readers between resolving the link and mapping.
+        """
+        for old in self._versions()[:-self.KEEP_VERSIONS]:
+            shutil.rmtree(old, ignore_errors=True)
+        for name in ('meta.json', *(f'{array}.npy' for array in self.ARRAYS)):
+            (self.path / name).unlink(missing_ok=True)
+
+
+def yahoo_download(symbols: List[str], start: date) -> pd.DataFrame:
+    """Bulk-download daily bars for NSE symbols since ``start`` in long format."""
+    import yfinance as yf
+
+    tickers = [f"{s}.NS" for s in symbols]
+    data = yf.download(tickers, start=start.isoformat(), interval='1d', group_by='ticker',
+                       auto_adjust=False, progress=False, threads=True)
+    frames = []
+    for symbol, ticker in zip(symbols, tickers):
+        if ticker not in data.columns.get_level_values(0):
+            continue
+        frame = data[ticker].rename(columns=str.lower).dropna(subset=['close'])
+        if frame.empty:
+            continue
+        frame = frame.reset_index().rename(columns={'Date': 'date'})
+        frame['symbol'] = symbol
+        frames.append(frame[['symbol', 'date', *FIELDS]])
+    if not frames:
+        return pd.DataFrame(columns=['symbol', 'date', *FIELDS])
+    return pd.concat(frames, ignore_index=True)
+
+
+def update_price_store(symbols: Iterable[str], store: PriceStore = None,
+                       downloader: Callable[[List[str], date], pd.DataFrame] = yahoo_download,
+                       today: date = None) -> int:
+    """
+    Download only the bars missing from the store and merge them in one write.
+
+    Symbols are grouped by the first missing day so each group is a single
+    bulk request.
+    """
+    store = store or PriceStore()
+    today = today or date.today()
+    last_days = store.last_days()
+    default_start = today - timedelta(days=settings.PRICE_STORE_HISTORY_DAYS)
+
+    by_start: Dict[date, List[str]] = {}
+    for symbol in symbols:
+        last = max(last_days.get(symbol, -1), store.checked.get(symbol, -1))
+        start = from_day(last + 1) if last >= 0 else default_start
+        if start <= today:
+            by_start.setdefault(start, []).append(symbol)
+
+    frames = []
+    # Symbols missing from a response that did return bars for others are marked
+    # checked through yesterday (today's bar may still be coming). An entirely
+    # empty response could be a throttled request, so it marks nothing.
+    checked = {}
+    for start, group in sorted(by_start.items()):
+        logger.info(f"Downloading {len(group)} symbols from {start}")
+        try:
+            frame = downloader(group, start)
+        except Exception as e:
+            logger.error(f"Error downloading prices from {start}: {e}")
+            continue
+        frames.append(frame)
+        if not frame.empty:
+            returned = set(frame['symbol'])
+            checked.update({symbol: to_day(today) - 1 for symbol in group if symbol not in returned})
+    frames = [f for f in frames if not f.empty]
+    bars = pd.concat(frames, ignore_index=True) if frames else pd.DataFrame(columns=['symbol', 'date', *FIELDS])
+    return store.write_bars(bars, checked)
+
+
+def load_universe_symbols() -> List[str]:
+    """Symbols from the stock universe CSV."""
+    csv_path = os.path.join(os.getenv('APP_DATA_DIR', '/app/data'), 'stock_universe.csv')
+    return pd.read_csv(csv_path, usecols=['Symbol'])['Symbol'].tolist()
+
+
+_store = None
+_store_lock = threading.Lock()
+
+
+def get_price_store() -> PriceStore:
+    """Process-wide store, remapped when the update task rewrites it."""
+    global _store
+    with _store_lock:
+        if _store is None:
+            _store = PriceStore()
+        elif _store.is_stale():
+            _store.load()
+        return _store
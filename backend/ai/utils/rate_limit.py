@@ -0,0 +1,35 @@
+import threading
+import time
+
+
+class AdaptiveRateLimiter:
+    """
+    Thread-safe request pacer with additive-increase/multiplicative-decrease.
+
+    ``acquire`` spaces calls to at most ``rate`` per minute. ``penalize``
+    halves the rate after a provider rate-limit error; ``reward`` creeps it
+    back up by one request per minute after each success.
+    """
+
+    def __init__(self, max_rpm: float, min_rpm: float = 1.0):
+        self.max_rpm = max_rpm
+        self.min_rpm = min_rpm
+        self.rate = max_rpm
+        self._next_at = time.monotonic()
+        self._lock = threading.Lock()
+
+    def acquire(self) -> None:
+        with self._lock:
+            now = time.monotonic()
+            wait = self._next_at - now
+            self._next_at = max(now, self._next_at) + 60.0 / self.rate
+        if wait > 0:
+            time.sleep(wait)
+
+    def penalize(self) -> None:
+        with self._lock:
+            self.rate = max(self.min_rpm, self.rate / 2)
+
+    def reward(self) -> None:
+        with self._lock:
+            self.rate = min(self.max_rpm, self.rate + 1)
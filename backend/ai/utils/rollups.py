@@ -0,0 +1,111 @@
+import logging
+from collections import Counter, defaultdict
+from datetime import datetime, timedelta, timezone as dt_timezone
+from typing import Dict, Iterable, List, Tuple
+
+from django.db import transaction
+from django.db.models import F
+from django.utils.dateparse import parse_datetime
+
+logger = logging.getLogger(__name__)
+
+GRANULARITIES = ('1h', '1d', '1w')
+IMPACT_SCORES = {'high': 3, 'medium': 2, 'low': 1}
+SENTIMENT_FIELDS = {'positive': 'positive_count', 'negative': 'negative_count', 'neutral': 'neutral_count'}
+SIGNAL_FIELDS = {'buy': 'buy_count', 'sell': 'sell_count'}
+
+RollupKey = Tuple[str, str, datetime]
+
+
+def bucket_start(value, granularity: str) -> datetime:
+    """Start of the UTC bucket containing ``value``; weeks start on Monday."""
+    if isinstance(value, str):
+        value = parse_datetime(value)
+    if value.tzinfo is None:
+        value = value.replace(tzinfo=dt_timezone.utc)
+    value = value.astimezone(dt_timezone.utc)
+    if granularity == '1h':
+        return value.replace(minute=0, second=0, microsecond=0)
+    day = value.replace(hour=0, minute=0, second=0, microsecond=0)
+    if granularity == '1d':
+        return day
+    if granularity == '1w':
+        return day - timedelta(days=day.weekday())
+    raise ValueError(f"Unknown rollup granularity: {granularity}")
+
+
+def tag_symbols(tags: dict) -> List[str]:
+    """Symbols in ``tags['stocks']``, which holds either symbols or ``{"symbol": ...}`` dicts."""
+    symbols = []
+    for stock in (tags or {}).get('stocks', []):
+        symbol = stock.get('symbol') if isinstance(stock, dict) else stock
+        if symbol and symbol not in symbols:
+            symbols.append(symbol)
+    return symbols
+
+
+class RollupDeltas:
+    """Accumulates counter increments per (symbol, granularity, bucket)."""
+
+    def __init__(self):
+        self.deltas: Dict[RollupKey, Counter] = defaultdict(Counter)
+
+    def _add(self, symbol: str, when, counts: Dict[str, int]) -> None:
+        for granularity in GRANULARITIES:
+            self.deltas[(symbol, granularity, bucket_start(when, granularity))].update(counts)
+
+    def add_news(self, tags: dict, published_at) -> None:
+        counts = {'news_count': 1, 'impact_score': IMPACT_SCORES.get((tags or {}).get('impact'), 0)}
+        sentiment_field = SENTIMENT_FIELDS.get((tags or {}).get('sentiment'))
+        if sentiment_field:
+            counts[sentiment_field] = 1
+        for symbol in tag_symbols(tags):
+            self._add(symbol, published_at, counts)
+
+    def add_signal(self, symbol: str, signal_type: str, timestamp) -> None:
+        counts = {'signal_count': 1}
+        if signal_type in SIGNAL_FIELDS:
+            counts[SIGNAL_FIELDS[signal_type]] = 1
+        self._add(symbol, timestamp, counts)
+
+    def apply(self) -> None:
+        """
+        Add the deltas to the rollup table.
+
+        Missing rows are inserted first with ``ignore_conflicts`` so concurrent
+        writers never race on creation; the increments are then applied with
+        ``F()`` expressions. Rows are written in key order, so concurrent
+        writers lock shared rows in the same order and can't deadlock. Call
+        inside the transaction that writes the underlying news and signals.
+        """
+        from ai.models import SymbolRollup
+
+        if not self.deltas:
+            return
+        deltas = sorted(self.deltas.items())
+        with transaction.atomic():
+            SymbolRollup.objects.bulk_create(
+                [SymbolRollup(symbol=s, granularity=g, bucket_start=b) for (s, g, b), _ in deltas],
+                ignore_conflicts=True,
+            )
+            for (symbol, granularity, bucket), counts in deltas:
+                SymbolRollup.objects.filter(
+                    symbol=symbol, granularity=granularity, bucket_start=bucket
+                ).update(**{field: F(field) + n for field, n in counts.items()})
+        self.deltas.clear()
+
+    def rows(self) -> Iterable:
+        """Rollup rows holding the accumulated totals, for rebuilding from scratch."""
+        from ai.models import SymbolRollup
+
+        for (symbol, granularity, bucket), counts in self.deltas.items():
+            yield SymbolRollup(symbol=symbol, granularity=granularity, bucket_start=bucket, **counts)
+
+
+def granularity_for_window(hours: int) -> str:
+    """Coarsest granularity that still resolves an ``hours`` window, to bound rows scanned."""
+    if hours <= 72:
+        return '1h'
+    if hours <= 24 * 60:
+        return '1d'
+    return '1w'
@@ -0,0 +1,117 @@
+import logging
+import os
+import threading
+import time
+from typing import Dict, Optional
+
+import pandas as pd
+from django.conf import settings
+from django.db import connection
+
+logger = logging.getLogger(__name__)
+
+STOCK_FIELDS = ('company_name', 'industry', 'isin', 'series')
+
+# Rewrites ``tags.stocks`` entries to ``{"symbol", "price"}`` and drops the
+# LLM's ``matched_stocks`` copy. Plain-symbol entries are kept as they are.
+COMPACT_TAGS_SQL = """
+UPDATE ai_analyzednews SET tags = (tags - 'matched_stocks') || jsonb_build_object('stocks', coalesce((
+    SELECT jsonb_agg(CASE WHEN jsonb_typeof(stock) = 'object'
+                          THEN jsonb_strip_nulls(jsonb_build_object('symbol', stock -> 'symbol', 'price', stock -> 'price'))
+                          ELSE stock END ORDER BY position)
+    FROM jsonb_array_elements(CASE WHEN jsonb_typeof(tags -> 'stocks') = 'array'
+                                   THEN tags -> 'stocks' ELSE '[]'::jsonb END) WITH ORDINALITY AS s(stock, position)
+), '[]'::jsonb))
+WHERE id >= %s AND id < %s AND (
+    tags ? 'matched_stocks' OR EXISTS (
+        SELECT 1 FROM jsonb_array_elements(CASE WHEN jsonb_typeof(tags -> 'stocks') = 'array'
+                                                THEN tags -> 'stocks' ELSE '[]'::jsonb END) AS stock
+        WHERE jsonb_typeof(stock) = 'object' AND stock - 'symbol' - 'price' <> '{}'::jsonb
+    )
+)
+"""
+
+
+def stock_universe_csv() -> str:
+    return os.path.join(os.getenv('APP_DATA_DIR', '/app/data'), 'stock_universe.csv')
+
+
+def load_stocks(csv_path: Optional[str] = None) -> int:
+    """
+    Upsert the stock universe CSV into the ``Stock`` table in one statement.
+
+    Returns the number of rows loaded.
+    """
+    from ai.models import Stock
+
+    df = pd.read_csv(csv_path or stock_universe_csv(), dtype=str).fillna('')
+    stocks = [
+        Stock(symbol=row['Symbol'], company_name=row['CompanyName'], industry=row['Industry'],
+              series=row['Series'], isin=row['ISIN Code'])
+        for row in df.to_dict('records')
+    ]
+    Stock.objects.bulk_create(stocks, update_conflicts=True, unique_fields=['symbol'],
+                              update_fields=list(STOCK_FIELDS))
+    clear_stock_cache()
+    return len(stocks)
+
+
+_stocks = None
+_stocks_loaded_at = 0.0
+_stocks_lock = threading.Lock()
+
+
+def get_stock_map() -> Dict[str, Dict[str, str]]:
+    """Process-wide ``symbol -> metadata`` map, refreshed every ``STOCK_CACHE_TTL_SECONDS``."""
+    global _stocks, _stocks_loaded_at
+    from ai.models import Stock
+
+    with _stocks_lock:
+        if _stocks is None or time.monotonic() - _stocks_loaded_at > settings.STOCK_CACHE_TTL_SECONDS:
+            _stocks = {row['symbol']: row for row in Stock.objects.values('symbol', *STOCK_FIELDS)}
+            _stocks_loaded_at = time.monotonic()
+        return _stocks
+
+
+def clear_stock_cache() -> None:
+    global _stocks
+    with _stocks_lock:
+        _stocks = None
+
+
+def hydrate_tags(tags: dict, stocks: Optional[Dict[str, Dict[str, str]]] = None) -> dict:
+    """
+    Expand compact ``{"symbol", "price"}`` stock tags with company metadata.
+
+    Returns a copy; symbols missing from the reference table keep only
+    their stored fields.
+    """
+    if not isinstance(tags, dict) or not isinstance(tags.get('stocks'), list):
+        return tags
+    stocks = get_stock_map() if stocks is None else stocks
+    hydrated = []
+    for stock in tags['stocks']:
+        if isinstance(stock, dict) and stock.get('symbol') in stocks:
+            stock = {**stocks[stock['symbol']], **stock}
+        hydrated.append(stock)
+    return {**tags, 'stocks': hydrated}
+
+
+def compact_tags(batch_size: int = 10_000) -> int:
+    """
+    Compact the stock tags of every existing AnalyzedNews row, one id range at a time.
+
+    Short batches keep row locks brief and let autovacuum keep up. Returns
+    the number of rows rewritten.
+    """
+    with connection.cursor() as cursor:
+        cursor.execute("SELECT min(id), max(id) FROM ai_analyzednews")
+        low, high = cursor.fetchone()
+        if low is None:
+            return 0
+        updated = 0
+        for start in range(low, high + 1, batch_size):
+            cursor.execute(COMPACT_TAGS_SQL, [start, start + batch_size])
+            updated += cursor.rowcount
+    logger.info(f"Compacted stock tags on {updated} analyzed news rows")
+    return updated
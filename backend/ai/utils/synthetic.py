@@ -0,0 +1,298 @@
+"""Synthetic datasets for the benchmark and load-test management commands."""
+from datetime import date
+
+import numpy as np
+import pandas as pd
+
+from ai.utils.price_store import FIELDS
+
+
+def synthetic_bars(symbols, start: date, end: date, seed: int = 0) -> pd.DataFrame:
+    """Random-walk weekday bars for ``symbols`` between ``start`` and ``end``."""
+    rng = np.random.default_rng(seed)
+    dates = pd.bdate_range(start, end)
+    n = len(dates) * len(symbols)
+    close = 100 * np.exp(np.cumsum(rng.normal(0, 0.01, (len(dates), len(symbols))), axis=0)).ravel()
+    return pd.DataFrame({
+        'symbol': np.tile(symbols, len(dates)),
+        'date': np.repeat(dates, len(symbols)),
+        'open': close * (1 + rng.normal(0, 0.002, n)),
+        'high': close * 1.01,
+        'low': close * 0.99,
+        'close': close,
+        'volume': rng.integers(1_000, 1_000_000, n).astype(float),
+    }, columns=['symbol', 'date', *FIELDS])
+
+
+def synthetic_signals(n: int, symbols, start: date, end: date, seed: int = 0) -> pd.DataFrame:
+    """Random signals in the shape returned by ``ai.utils.backtest.load_signals``."""
+    rng = np.random.default_rng(seed)
+    span = int((pd.Timestamp(end) - pd.Timestamp(start)).total_seconds())
+    return pd.DataFrame({
+        'symbol': np.asarray(symbols)[rng.integers(0, len(symbols), n)],
+        'type': rng.choice(['buy', 'sell'], n),
+        'timestamp': pd.Timestamp(start, tz='UTC') + pd.to_timedelta(rng.integers(0, span, n), unit='s'),
+        'confidence': np.round(rng.random(n), 2).astype(str),
+        'sentiment': rng.choice(['positive', 'negative', 'neutral'], n),
+    })
+
+
+def synthetic_arrivals(start: date, days: int, seed: int = 0, quiet_per_hour: float = 2.0,
+                       day_per_hour: float = 6.0, market_per_hour: float = 20.0, bursts_per_day: float = 1.5,
+                       burst_size: int = 15, burst_minutes: float = 10.0) -> np.ndarray:
+    """
+    Story publish times (Unix seconds, sorted) for one listing section.
+
+    A Poisson process whose rate follows the IST clock: ``quiet_per_hour``
+    overnight and on weekends, ``day_per_hour`` from 07:00 to 22:00 and
+    ``market_per_hour`` during NSE hours, plus breaking-news bursts of
+    about ``burst_size`` stories within ``burst_minutes`` at random
+    weekday times.
+    """
+    rng = np.random.default_rng(seed)
+    origin = pd.Timestamp(start, tz='Asia/Kolkata')
+    minutes = pd.date_range(origin, periods=days * 24 * 60, freq='min').as_unit('s')
+    clock = minutes.hour * 60 + minutes.minute
+    weekday = minutes.weekday < 5
+    per_hour = np.full(len(minutes), quiet_per_hour)
+    per_hour[weekday & (clock >= 7 * 60) & (clock < 22 * 60)] = day_per_hour
+    per_hour[weekday & (clock >= 9 * 60 + 15) & (clock < 15 * 60 + 30)] = market_per_hour
+    counts = rng.poisson(per_hour / 60)
+    base = minutes.asi8[counts > 0]
+    arrivals = [np.repeat(base, counts[counts > 0]) + rng.uniform(0, 60, counts.sum())]
+
+    weekday_starts = minutes.asi8[weekday]
+    for burst_start in rng.choice(weekday_starts, rng.poisson(bursts_per_day * days)):
+        arrivals.append(burst_start + rng.uniform(0, burst_minutes * 60, rng.poisson(burst_size)))
+    return np.sort(np.concatenate(arrivals).astype(float))
+
+
+WORDS = (
+    "rate hike inflation repo rbi policy bank credit growth earnings profit revenue margin "
+    "quarter guidance merger acquisition stake ipo listing shares rally slump rupee dollar "
+    "crude oil gas power steel cement auto sales exports imports tariff gst tax budget fiscal "
+    "deficit bond yield liquidity deposit loan npa default rating upgrade downgrade outlook "
+    "telecom spectrum pharma approval usfda monsoon kharif rabi fertiliser subsidy capex order "
+    "contract railway defence infrastructure highway metro housing realty demand supply"
+).split()
+SENTIMENTS = ('positive', 'negative', 'neutral')
+IMPACTS = ('high', 'medium', 'low')
+
+
+# Finance terms are mixed into a large filler vocabulary so that, as in real
+# coverage, any given term appears in only a small share of stories.
+FILLER = [f"w{i}" for i in range(5000)]
+VOCABULARY = np.array(WORDS + FILLER)
+WEIGHTS = np.concatenate([np.full(len(WORDS), 0.05 / len(WORDS)), np.full(len(FILLER), 0.95 / len(FILLER))])
+
+
+def _sentence(rng, n_words):
+    return ' '.join(rng.choice(VOCABULARY, n_words, p=WEIGHTS)).capitalize()
+
+
+def _stock_tags(rng, symbols, stock_metadata=None):
+    stocks = [{'symbol': s, 'price': float(rng.uniform(100, 3000))}
+              for s in rng.choice(symbols, rng.integers(1, 3), replace=False)]
+    if stock_metadata is None:
+        return {'stocks': stocks}
+    # Layout written before company metadata moved to the Stock table
+    return {
+        'stocks': [{**stock, **stock_metadata[stock['symbol']]} for stock in stocks],
+        'matched_stocks': [
+            {'symbol': stock['symbol'], 'company_name': stock_metadata[stock['symbol']]['company_name'],
+             'industry': stock_metadata[stock['symbol']]['industry']}
+            for stock in stocks
+        ],
+    }
+
+
+def synthetic_triage_stories(n: int, stocks, relevant_share: float = 0.3, seed: int = 0):
+    """
+    Stories with retrieved candidates and a ground-truth relevance label, for triage benchmarks.
+
+    Relevant stories name one of their candidate companies, most of them
+    alongside finance terms. A quarter of the irrelevant ones carry finance
+    terms too (macro news), so the heuristic can't separate them on terms.
+
+    Args:
+        stocks: ``(symbol, company_name)`` pairs to draw candidates from
+
+    Returns:
+        list: ``(news dict, candidates, relevant)`` tuples
+    """
+    rng = np.random.default_rng(seed)
+    stories = []
+    for i in range(n):
+        picks = rng.choice(len(stocks), 5, replace=False)
+        candidates = [{'Symbol': stocks[j][0], 'CompanyName': stocks[j][1], 'Industry': ''} for j in picks]
+        relevant = bool(rng.random() < relevant_share)
+        filler = ' '.join(rng.choice(FILLER, 10))
+        terms = ' '.join(rng.choice(WORDS, int(rng.integers(1, 4))))
+        if relevant:
+            company = candidates[0]['CompanyName']
+            title = f"{company} {terms if rng.random() < 0.8 else ''} {filler}"
+        else:
+            title = f"{filler} {terms if rng.random() < 0.25 else ''}"
+        news = {
+            'title': f"{' '.join(title.split()).capitalize()} #{i}",
+            'description': _sentence(rng, 25),
+            'datetime': '2025-01-01T00:00:00+00:00',
+            'source': 'Synthetic',
+            'link': f"https://triage.local/news/{i}",
+        }
+        stories.append((news, candidates, relevant))
+    return stories
+
+
+def synthetic_article_html(rng, paragraphs: int = 12) -> str:
+    """An article page shaped like Economic Times: nav, scripts and sidebars around ``div.artText``."""
+    nav = ''.join(f'<li><a href="/news/section{i}">{_sentence(rng, 2)}</a></li>' for i in range(80))
+    state = ','.join(f'"k{i}":"{_sentence(rng, 6)}"' for i in range(100))
+    body = ''.join(f'<p>{_sentence(rng, int(rng.integers(30, 90)))}.</p>' for _ in range(paragraphs))
+    related = ''.join(f'<li><a href="/news/{i}.cms">{_sentence(rng, 10)}</a></li>' for i in range(20))
+    return (
+        f'<!DOCTYPE html><html><head><title>{_sentence(rng, 8)}</title>'
+        f'<script>window.__STATE__={{{state}}};</script></head>'
+        f'<body><nav><ul>{nav}</ul></nav>'
+        f'<article><h1>{_sentence(rng, 10)}</h1><div class="artText">{body}'
+        f'<script>loadAd("mid-article");</script></div></article>'
+        f'<aside><ul>{related}</ul></aside><footer><p>{_sentence(rng, 40)}</p></footer></body></html>'
+    )
+
+
+def seed_news(n: int, symbols=('RELIANCE', 'TCS', 'INFY', 'HDFCBANK', 'ICICIBANK'), days: int = 365,
+              batch_size: int = 5000, seed: int = 0, tag: str = 'synthetic', stock_metadata=None) -> int:
+    """
+    Insert ``n`` synthetic NewsStory rows, each with one AnalyzedNews row.
+
+    Links are namespaced by ``tag`` so repeated seeding doesn't collide.
+    With ``stock_metadata`` (``symbol -> {company_name, industry, isin,
+    series}``) the tags use the legacy layout that embeds it per stock.
+    Returns the number of stories created.
+    """
+    from django.utils import timezone
+
+    from ai.models import AnalyzedNews
+    from scrapy.models import NewsStory
+
+    rng = np.random.default_rng(seed)
+    now = timezone.now()
+    created = 0
+    for start in range(0, n, batch_size):
+        count = min(batch_size, n - start)
+        offsets = rng.integers(0, days * 86400, count)
+        stories = NewsStory.objects.bulk_create([
+            NewsStory(
+                title=_sentence(rng, 8),
+                link=f"https://{tag}.local/news/{seed}/{start + i}",
+                datetime=now - pd.Timedelta(seconds=int(offsets[i])),
+                description=_sentence(rng, 25),
+            )
+            for i in range(count)
+        ])
+        AnalyzedNews.objects.bulk_create([
+            AnalyzedNews(
+                news_story=story,
+                title=story.title,
+                summary=_sentence(rng, 30),
+                content=_sentence(rng, 120),
+                published_at=story.datetime,
+                source='Synthetic',
+                url=story.link,
+                tags={
+                    **_stock_tags(rng, symbols, stock_metadata),
+                    'sentiment': str(rng.choice(SENTIMENTS)),
+                    'impact': str(rng.choice(IMPACTS)),
+                    'key_points': [_sentence(rng, 10) for _ in range(3)],
+                },
+            )
+            for story in stories
+        ])
+        created += count
+    return created
+
+
+def seed_signal_rows(n: int, story_ids, symbols=('RELIANCE', 'TCS', 'INFY', 'HDFCBANK', 'ICICIBANK'),
+                     days: int = 365, table: str = 'ai_signal', batch_size: int = 1_000_000,
+                     reason: str = 'synthetic') -> int:
+    """
+    Insert ``n`` random signals for ``story_ids`` spread over the last ``days`` days.
+
+    Rows are generated inside Postgres with ``generate_series``; building
+    model instances is far too slow at the tens-of-millions scale.
+    Returns the number of rows inserted.
+    """
+    from django.db import connection
+
+    story_ids = list(story_ids)
+    with connection.cursor() as cursor:
+        for start in range(0, n, batch_size):
+            cursor.execute(
+                f"""
+                INSERT INTO "{table}" (news_story_id, type, symbol, price, "timestamp", confidence, reason)
+                SELECT ids[1 + g %% cardinality(ids)],
+                       (ARRAY['buy', 'sell', 'entry'])[1 + (g * 7) %% 3],
+                       syms[1 + (g * 13) %% cardinality(syms)],
+                       100 + random() * 2900,
+                       now() - random() * make_interval(days => %s),
+                       round(random()::numeric, 2)::text,
+                       %s
+                FROM generate_series(%s, %s) AS g, (SELECT %s::bigint[] AS ids, %s::text[] AS syms) AS params
+                """,
+                [days, reason, start, min(start + batch_size, n) - 1, story_ids, list(symbols)],
+            )
+    return n
+
+
+def _sql_sentence(n_words: int, row_ref: str) -> str:
+    # Same 5% finance / 95% filler mix as _sentence. Referencing the outer
+    # row keeps Postgres from evaluating the subquery only once.
+    # The aggregate must reference the series column ``i`` to stay at the
+    # subquery's level rather than the outer query's.
+    return (
+        "(SELECT (string_agg(CASE WHEN random() < 0.05 "
+        "THEN words[1 + floor(random() * cardinality(words))::int] "
+        f"ELSE 'w' || floor(random() * {len(FILLER)})::int END, ' ' ORDER BY i)) "
+        f"FROM generate_series(1, {n_words}) AS s(i) WHERE {row_ref} IS NOT NULL)"
+    )
+
+
+def seed_news_rows(n: int, symbols=('RELIANCE', 'TCS', 'INFY', 'HDFCBANK', 'ICICIBANK'), days: int = 365,
+                   tag: str = 'synthetic', start: int = 0, batch_size: int = 50_000) -> int:
+    """
+    Insert ``n`` NewsStory rows, each with one AnalyzedNews row, inside Postgres.
+
+    The set-based counterpart of ``seed_news`` for millions of rows. Links
+    are ``https://<tag>.local/news/bulk/<i>`` for ``i`` from ``start``, so
+    callers can top a dataset up to a target size. Returns the number of
+    stories created.
+    """
+    from django.db import connection
+
+    with connection.cursor() as cursor:
+        for first in range(start, start + n, batch_size):
+            last = min(first + batch_size, start + n) - 1
+            cursor.execute(
+                f"""
+                WITH params AS (SELECT %s::text[] AS words, %s::text[] AS syms),
+                stories AS (
+                    INSERT INTO scrapy_newsstory (title, link, datetime, description)
+                    SELECT {_sql_sentence(8, 'g')}, %s || g, now() - random() * make_interval(days => %s),
+                           {_sql_sentence(25, 'g')}
+                    FROM generate_series(%s, %s) AS g, params
+                    RETURNING id, title, link, datetime
+                )
+                INSERT INTO ai_analyzednews (news_story_id, title, summary, content, published_at, source, url, tags)
+                SELECT id, title, {_sql_sentence(30, 'id')}, {_sql_sentence(120, 'id')}, datetime, 'Synthetic', link,
+                       jsonb_build_object(
+                           'stocks', jsonb_build_array(jsonb_build_object(
+                               'symbol', syms[1 + floor(random() * cardinality(syms))::int],
+                               'price', round((100 + random() * 2900)::numeric, 2))),
+                           'sentiment', (ARRAY['positive', 'negative', 'neutral'])[1 + floor(random() * 3)::int],
+                           'impact', (ARRAY['high', 'medium', 'low'])[1 + floor(random() * 3)::int],
+                           'key_points', jsonb_build_array({_sql_sentence(10, 'id')}, {_sql_sentence(10, 'id')}))
+                FROM stories, params
+                """,
+                [list(WORDS), list(symbols), f"https://{tag}.local/news/bulk/", days, first, last],
+            )
+    return n
@@ -0,0 +1,170 @@
+"""
+Triage ahead of the analysis model.
+
+Tiers run cheapest first and each either decides or defers:
+
+    heuristic score -> triage model -> analysis model
+
+The heuristic looks for retrieved candidate companies and listed symbols
+in the story and for market-moving terms. Stories it can't call either
+way are scored by the small ``TRIAGE_MODEL``.
+"""
+import json
+import logging
+import re
+import time
+from dataclasses import dataclass, field
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+from django.conf import settings
+
+from ai.utils.openai_utils import get_gpt_response, truncate_to_tokens
+
+logger = logging.getLogger(__name__)
+
+MODES = ('off', 'heuristic', 'model', 'cascade')
+
+MARKET_TERMS = frozenset("""
+    acquisition acquire buyback bonus dividend split earnings profit loss revenue margin ebitda quarter
+    results guidance outlook upgrade downgrade rating target stake merger demerger ipo listing delisting
+    shares stock sebi nse bse sensex nifty rally slump crash surge plunge order contract tender capex
+    expansion plant approval usfda penalty fraud default npa insolvency debt bond yield rbi repo
+    inflation gdp tariff gst subsidy budget fiscal deficit rupee crude
+""".split())
+# Words dropped from company names before looking for them in the text
+COMPANY_SUFFIXES = frozenset('limited ltd ltd. the company co corporation corp india industries inc'.split())
+WORD_RE = re.compile(r"[A-Za-z][A-Za-z&.'-]*")
+SYMBOL_RE = re.compile(r"\b[A-Z][A-Z0-9&]{2,}\b")
+
+
+@dataclass
+class TriageResult:
+    passed: bool
+    # One entry per tier consulted, in ``TriageDecision`` field names
+    decisions: List[Dict[str, Any]] = field(default_factory=list)
+
+
+def thresholds() -> Dict[str, float]:
+    return {
+        'reject': settings.TRIAGE_REJECT_SCORE,
+        'accept': settings.TRIAGE_ACCEPT_SCORE,
+        'model': settings.TRIAGE_MODEL_THRESHOLD,
+    }
+
+
+def _company_core(name: str) -> str:
+    words = [w for w in name.lower().split() if w not in COMPANY_SUFFIXES]
+    return ' '.join(words)
+
+
+def heuristic_score(news: Dict[str, Any], candidates: List[Dict[str, Any]],
+                    symbols: Optional[Iterable[str]] = None) -> Tuple[float, Dict[str, Any]]:
+    """
+    Score a story from 0 to 1 without any model call.
+
+    0.6 for naming a candidate company or a listed symbol, plus up to 0.4
+    for market terms (three or more earn it all).
+
+    Args:
+        news: Story dict as built by ``pipeline.news_data``
+        candidates: Retrieved stocks with ``Symbol`` and ``CompanyName``
+        symbols: Listed symbols; defaults to the ``Stock`` table
+
+    Returns:
+        tuple: ``(score, features)`` where features lists what matched
+    """
+    if symbols is None:
+        from ai.utils.stocks import get_stock_map
+
+        symbols = get_stock_map()
+    headline = f"{news.get('title', '')} {news.get('description', '')}"
+    text = f"{headline} {truncate_to_tokens(news.get('body') or '', settings.TRIAGE_PROMPT_TOKENS)}"
+    lowered = ' '.join(WORD_RE.findall(text.lower()))
+    words = set(lowered.split())
+
+    mentioned = []
+    for stock in candidates:
+        core = _company_core(stock.get('CompanyName', ''))
+        if (core and f" {core} " in f" {lowered} ") or stock.get('Symbol', '').lower() in words:
+            mentioned.append(stock['Symbol'])
+    listed = sorted({token for token in SYMBOL_RE.findall(headline) if token in symbols} - set(mentioned))
+    terms = sorted(words & MARKET_TERMS)
+
+    score = 0.6 * bool(mentioned or listed) + 0.4 * min(len(terms), 3) / 3
+    return round(score, 3), {'mentioned': mentioned, 'symbols': listed, 'terms': terms}
+
+
+def build_triage_prompt(news: Dict[str, Any], candidates: List[Dict[str, Any]]) -> str:
+    stock_list = "\n".join(f"{s['Symbol']}: {s['CompanyName']}" for s in candidates) or "(none)"
+    body = truncate_to_tokens(news.get('body') or '', settings.TRIAGE_PROMPT_TOKENS)
+    return f"""Decide whether this news story matters to Indian equity traders.
+
+Candidate listed companies:
+{stock_list}
+
+Title: {news.get('title', '')}
+Description: {news.get('description', '')}
+{f"Article: {body}" if body else ""}
+
+Reply with only JSON: {{"score": 0.0-1.0, "reason": "one short line"}}
+"score" is the probability that the story concerns a listed company or sector and could move its share price."""
+
+
+def model_score(news: Dict[str, Any], candidates: List[Dict[str, Any]],
+                model: str = None) -> Tuple[Optional[float], str]:
+    """
+    Ask the triage model for a relevance score.
+
+    API errors propagate so the stage is retried; an unparseable reply
+    returns a ``None`` score.
+    """
+    text = get_gpt_response(build_triage_prompt(news, candidates), model=model or settings.TRIAGE_MODEL,
+                            max_tokens=60).strip()
+    if text.startswith('```'):
+        text = text.strip('`').removeprefix('json')
+    try:
+        reply = json.loads(text)
+        return min(max(float(reply['score']), 0.0), 1.0), str(reply.get('reason', ''))[:500]
+    except (ValueError, TypeError, KeyError) as e:
+        logger.warning(f"Unparseable triage reply ({e}): {text[:200]}")
+        return None, 'unparseable reply'
+
+
+def triage(news: Dict[str, Any], candidates: List[Dict[str, Any]], mode: str = None,
+           symbols: Optional[Iterable[str]] = None) -> TriageResult:
+    """
+    Run the tiers ``mode`` calls for and decide whether the story is analyzed.
+
+    When in doubt the story passes: an unparseable model reply or an
+    uncertain heuristic score without a model tier lets it through.
+    """
+    mode = mode or settings.TRIAGE_MODE
+    if mode not in MODES:
+        raise ValueError(f"Unknown triage mode: {mode}")
+    if mode == 'off':
+        return TriageResult(passed=True)
+    limits = thresholds()
+    decisions = []
+
+    if mode in ('heuristic', 'cascade'):
+        t0 = time.perf_counter()
+        score, features = heuristic_score(news, candidates, symbols)
+        passed = True if score >= limits['accept'] else False if score < limits['reject'] else None
+        if passed is None and mode == 'heuristic':
+            passed = True
+        decisions.append({
+            'tier': 'heuristic', 'score': score, 'passed': passed, 'features': features,
+            'thresholds': limits, 'latency_ms': (time.perf_counter() - t0) * 1000,
+        })
+        if passed is not None:
+            return TriageResult(passed, decisions)
+
+    model = settings.TRIAGE_MODEL
+    t0 = time.perf_counter()
+    score, reason = model_score(news, candidates, model)
+    decisions.append({
+        'tier': 'model', 'model': model, 'score': score, 'reason': reason,
+        'passed': score is None or score >= limits['model'], 'thresholds': limits,
+        'latency_ms': (time.perf_counter() - t0) * 1000,
+    })
+    return TriageResult(decisions[-1]['passed'], decisions)
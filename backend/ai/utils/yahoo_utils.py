@@ -1,28 +1,53 @@
 import yfinance as yf
 import logging
+from datetime import datetime
 from typing import Dict, Optional
+from ai.utils.price_store import get_price_store, to_day
 
 logger = logging.getLogger(__name__)
 
-def get_stock_price(symbol: str) -> Dict[str, float]:
-    """Get current stock price and price change."""
+def get_stock_price(symbol: str, at=None) -> Dict[str, float]:
+    """
+    Get stock price and 5-day price change.
+
+    Served from the local price store when it covers ``at`` (defaulting to
+    now): either a bar exists on that day, or the day is already behind the
+    newest stored bar. Otherwise the price is a live quote.
+    """
+    symbol = symbol[:-3] if symbol.endswith('.NS') else symbol
+    when = at or datetime.utcnow()
+    stored = None
+    try:
+        store = get_price_store()
+        stored = store.price_change(symbol, when)
+        if stored and (store.has_bar(symbol, when) or to_day(when) < store.end_day):
+            return stored
+    except Exception as e:
+        logger.error(f"Error reading price store for {symbol}: {e}")
+    return _get_live_stock_price(symbol, stored)
+
+def _get_live_stock_price(symbol: str, stored: Optional[Dict[str, float]] = None) -> Dict[str, float]:
+    """Get the live price from Yahoo, using history only when the store has no change."""
     try:
         # Add .NS suffix for NSE stocks
-        if not symbol.endswith('.NS'):
-            symbol = f"{symbol}.NS"
+        ticker = f"{symbol}.NS"
             
         # Get stock info
-        stock = yf.Ticker(symbol)
+        stock = yf.Ticker(ticker)
         info = stock.info
-        
-        # Get historical data for price change
-        hist = stock.history(period='5d')
-        if len(hist) > 1:
-            price_change = hist['Close'][-1] - hist['Close'][0]
-            percent_change = (price_change / hist['Close'][0]) * 100
+
+        if stored:
+            price_change = stored['price_change']
+            percent_change = stored['percent_change']
         else:
-            price_change = 0
-            percent_change = 0
+            # Get historical data for price change
+            hist = stock.history(period='5d')
+            if len(hist) > 1:
+                price_change = hist['Close'][-1] - hist['Close'][0]
+                percent_change = (price_change / hist['Close'][0]) * 100
+            else:
+                price_change = 0
+                percent_change = 0
             
         return {
             'current_price': info.get('currentPrice', 0),
@@ -30,9 +55,9 @@ def get_stock_price(symbol: str) -> Dict[str, float]:
             'percent_change': percent_change
         }
     except Exception as e:
-        logger.error(f"Error getting price for {symbol}: {e}")
+        logger.error(f"Error getting price for {symbol}.NS: {e}")
         return {
             'current_price': 0,
             'price_change': 0,
             'percent_change': 0
-        } 
\ No newline at end of file
+        }
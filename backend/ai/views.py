@@ -1,14 +1,359 @@
+from django.http import Http404
 from django.shortcuts import render
-from rest_framework import viewsets
-from .models import Signal, AnalyzedNews
-from .serializers import SignalSerializer, AnalyzedNewsSerializer
+import time
+from datetime import datetime, timedelta, timezone as dt_timezone
+from django.conf import settings
+from django.db.models import F, Sum
+from django.db.models.fields.json import KeyTransform
+from django.db.models.functions import JSONObject
+from django.utils import timezone
+from django.utils.dateparse import parse_date, parse_datetime
+from django.contrib.postgres.search import SearchHeadline, SearchQuery, SearchRank
+from rest_framework import generics, viewsets
+from rest_framework.decorators import action
+from rest_framework.exceptions import ValidationError
+from rest_framework.pagination import PageNumberPagination
+from rest_framework.permissions import SAFE_METHODS
+from rest_framework.response import Response
+from rest_framework.views import APIView
+from .models import Signal, AnalyzedNews, SymbolRollup
+from .serializers import (
+    SignalSerializer, AnalyzedNewsSerializer, AnalyzedNewsListSerializer, SearchResultSerializer, camel_case,
+)
+from .utils.backtest import DEFAULT_HORIZONS, load_signals, run_backtest
+from .utils.news_index import NewsIndex
+from .utils.partitions import read_archive
+from .utils.price_store import get_price_store
+from .utils.rollups import bucket_start, granularity_for_window
 
 # Create your views here.
 
-class SignalViewSet(viewsets.ModelViewSet):
+_news_index = None
+_news_index_retry_at = 0.0
+
+def get_news_index():
+    """
+    Per-process news index, or ``None`` while ChromaDB is unavailable.
+
+    Connects with a single attempt, since a request can't wait out retries.
+    After a failure no connection is tried for
+    ``NEWS_INDEX_RETRY_SECONDS``, so requests fail fast in the meantime.
+    """
+    global _news_index, _news_index_retry_at
+    if _news_index is not None and _news_index.collection is not None:
+        return _news_index
+    if time.monotonic() < _news_index_retry_at:
+        return None
+    _news_index = NewsIndex(max_retries=1)
+    if _news_index.collection is None:
+        _news_index_retry_at = time.monotonic() + settings.NEWS_INDEX_RETRY_SECONDS
+        return None
+    return _news_index
+
+def _split_param(value):
+    return [name.strip() for name in (value or '').split(',') if name.strip()]
+
+def _time_bounds(params):
+    """
+    ``since`` and ``until`` as aware datetimes (``None`` when absent).
+
+    Each may be an ISO8601 datetime or date; naive values are UTC. Raises
+    ``ValueError`` naming the malformed parameter.
+    """
+    bounds = {}
+    for name in ('since', 'until'):
+        value = params.get(name)
+        parsed = None
+        if value:
+            try:
+                parsed = parse_datetime(value)
+                if parsed is None:
+                    day = parse_date(value)
+                    parsed = datetime.combine(day, datetime.min.time()) if day else None
+            except ValueError:
+                parsed = None
+            if parsed is None:
+                raise ValueError(f'{name} must be an ISO8601 datetime or date')
+            if timezone.is_naive(parsed):
+                parsed = parsed.replace(tzinfo=dt_timezone.utc)
+        bounds[name] = parsed
+    return bounds
+
+class SparseFieldsetMixin:
+    """
+    ``?fields=`` / ``?omit=`` sparse fieldsets for read requests.
+
+    Both take comma-separated camelCase (or snake_case) field names; ``id``
+    is always returned. The selected fields are passed to the serializer and
+    pushed down to the query with ``.only()``, so columns that aren't
+    rendered are never read from Postgres.
+    """
+
+    def selected_fields(self):
+        if not hasattr(self, '_selected_fields'):
+            self._selected_fields = self._parse_fields()
+        return self._selected_fields
+
+    def _parse_fields(self):
+        serializer_class = self.get_serializer_class()
+        available = list(serializer_class().fields)
+        if self.request is None or self.request.method not in SAFE_METHODS:
+            return available
+        names = {camel_case(name): name for name in available}
+        names.update({name: name for name in available})
+        params = self.request.query_params
+        requested, omitted = _split_param(params.get('fields')), _split_param(params.get('omit'))
+        unknown = [name for name in requested + omitted if name not in names]
+        if unknown:
+            raise ValidationError({'fields': f"Unknown fields: {', '.join(unknown)}"})
+        requested = {names[name] for name in requested}
+        omitted = {names[name] for name in omitted}
+        return [
+            name for name in available
+            if name == 'id' or ((not requested or name in requested) and name not in omitted)
+        ]
+
+    def get_serializer(self, *args, **kwargs):
+        kwargs.setdefault('fields', self.selected_fields())
+        return super().get_serializer(*args, **kwargs)
+
+    def get_queryset(self):
+        queryset = super().get_queryset()
+        if self.request is None or self.request.method not in SAFE_METHODS:
+            return queryset
+        # Declared serializer fields are computed, not read from a column of the same name.
+        declared = self.get_serializer_class()._declared_fields
+        columns = {field.name for field in queryset.model._meta.concrete_fields}
+        return queryset.only(*[name for name in self.selected_fields() if name in columns and name not in declared])
+
+class SignalViewSet(SparseFieldsetMixin, viewsets.ModelViewSet):
     queryset = Signal.objects.all().order_by('-timestamp')
     serializer_class = SignalSerializer
 
-class AnalyzedNewsViewSet(viewsets.ModelViewSet):
-    queryset = AnalyzedNews.objects.all().order_by('-published_at')
+class AnalyzedNewsViewSet(SparseFieldsetMixin, viewsets.ModelViewSet):
+    """
+    Analyzed news. Lists accept ``?view=list`` for the lightweight
+    representation (no ``content``, symbol-only tags) or ``?view=full``;
+    ``ANALYZED_NEWS_LIST_VIEW`` sets the default.
+    """
+    queryset = AnalyzedNews.objects.defer('search_vector').order_by('-published_at')
     serializer_class = AnalyzedNewsSerializer
+    VIEWS = ('full', 'list')
+
+    def list_view(self):
+        view = self.request.query_params.get('view', settings.ANALYZED_NEWS_LIST_VIEW)
+        if view not in self.VIEWS:
+            raise ValidationError({'view': f"Must be one of: {', '.join(self.VIEWS)}"})
+        return view
+
+    def get_serializer_class(self):
+        if self.action == 'list' and self.list_view() == 'list':
+            return AnalyzedNewsListSerializer
+        return super().get_serializer_class()
+
+    def get_queryset(self):
+        queryset = super().get_queryset()
+        if self.action == 'list' and self.list_view() == 'list' and 'tags' in self.selected_fields():
+            # Only the summary keys of the tags JSON leave Postgres
+            queryset = queryset.annotate(list_tags=JSONObject(**{
+                key: KeyTransform(key, 'tags') for key in ('stocks', 'sectors', 'sentiment', 'impact')
+            }))
+        return queryset
+
+    @action(detail=True)
+    def similar(self, request, pk=None):
+        """
+        Related coverage ranked by embedding similarity with time decay.
+
+        Query params: ``k`` (default 10, max 50), ``symbols`` (comma-separated)
+        and ``half_life_hours``.
+        """
+        analyzed = self.get_object()
+        try:
+            k = min(int(request.query_params.get('k', 10)), 50)
+            half_life = request.query_params.get('half_life_hours')
+            half_life = float(half_life) if half_life else None
+        except ValueError:
+            return Response({'detail': 'k must be an integer and half_life_hours a number'}, status=400)
+        symbols = [s for s in request.query_params.get('symbols', '').split(',') if s]
+
+        index = get_news_index()
+        if index is None:
+            return Response({'detail': 'Similar stories are temporarily unavailable'}, status=503)
+        ranked = index.similar(analyzed, k=k, symbols=symbols, half_life_hours=half_life)
+        by_id = AnalyzedNews.objects.defer('search_vector').in_bulk([r['id'] for r in ranked])
+        results = []
+        for r in ranked:
+            if r['id'] in by_id:
+                item = self.get_serializer(by_id[r['id']]).data
+                item['similarity'] = r['similarity']
+                item['score'] = r['score']
+                results.append(item)
+        return Response(results)
+
+class BacktestView(APIView):
+    """
+    Backtest stored signals against the local price store.
+
+    Query params: ``horizons`` (comma-separated trading days), ``slippage_bps``,
+    ``symbol``, ``since`` and ``until`` (ISO8601 signal timestamps or dates).
+    """
+
+    def get(self, request):
+        params = request.query_params
+        try:
+            horizons = [int(h) for h in params.get('horizons', '').split(',') if h] or DEFAULT_HORIZONS
+            slippage_bps = float(params.get('slippage_bps', 10))
+        except ValueError:
+            return Response({'detail': 'horizons must be integers and slippage_bps a number'}, status=400)
+        if any(h <= 0 for h in horizons):
+            return Response({'detail': 'horizons must be positive'}, status=400)
+
+        try:
+            bounds = _time_bounds(params)
+        except ValueError as e:
+            return Response({'detail': str(e)}, status=400)
+
+        queryset = Signal.objects.all()
+        if params.get('symbol'):
+            queryset = queryset.filter(symbol=params['symbol'])
+        if bounds['since']:
+            queryset = queryset.filter(timestamp__gte=bounds['since'])
+        if bounds['until']:
+            queryset = queryset.filter(timestamp__lt=bounds['until'])
+
+        return Response(run_backtest(load_signals(queryset), get_price_store(), horizons, slippage_bps))
+
+
+class RollupView(APIView):
+    """
+    Top symbols by rolled-up sentiment, impact or signals over the last ``hours``.
+
+    Reads only the rollup buckets inside the window, so cost does not grow
+    with history. Query params: ``hours`` (default 24), ``order``
+    (``sentiment``, ``-sentiment``, ``impact`` or ``signals``), ``limit`` (default 20).
+    """
+    ORDERINGS = {
+        'sentiment': '-net_sentiment',
+        '-sentiment': 'net_sentiment',
+        'impact': '-impact_score',
+        'signals': '-signal_count',
+    }
+
+    def get(self, request):
+        params = request.query_params
+        try:
+            hours = int(params.get('hours', 24))
+            limit = min(int(params.get('limit', 20)), 500)
+        except ValueError:
+            return Response({'detail': 'hours and limit must be integers'}, status=400)
+        ordering = self.ORDERINGS.get(params.get('order', 'sentiment'))
+        if hours <= 0 or limit <= 0 or ordering is None:
+            return Response({'detail': 'invalid hours, limit or order'}, status=400)
+
+        granularity = granularity_for_window(hours)
+        since = bucket_start(timezone.now() - timedelta(hours=hours), granularity)
+        rows = (
+            SymbolRollup.objects.filter(granularity=granularity, bucket_start__gte=since)
+            .values('symbol')
+            .annotate(
+                news_count=Sum('news_count'),
+                positive_count=Sum('positive_count'),
+                negative_count=Sum('negative_count'),
+                neutral_count=Sum('neutral_count'),
+                impact_score=Sum('impact_score'),
+                signal_count=Sum('signal_count'),
+                buy_count=Sum('buy_count'),
+                sell_count=Sum('sell_count'),
+            )
+            .annotate(net_sentiment=F('positive_count') - F('negative_count'))
+            .order_by(ordering, 'symbol')[:limit]
+        )
+        results = [{camel_case(key): value for key, value in row.items()} for row in rows]
+        return Response({'hours': hours, 'granularity': granularity, 'since': since, 'results': results})
+
+
+class SearchPagination(PageNumberPagination):
+    page_size = 20
+
+class SearchView(generics.ListAPIView):
+    """
+    Ranked full-text search over analyzed news.
+
+    Matches title, summary, key points and the scraped description using
+    the trigger-maintained ``search_vector``. ``q`` accepts web search
+    syntax (quoted phrases, ``or``, ``-exclude``). Matches are wrapped in
+    ``<mark>`` in ``titleHeadline`` and ``summaryHeadline``.
+
+    Only the newest ``SEARCH_RANK_LIMIT`` matches are ranked. Ranking reads
+    every matching row, and a common term matches a large share of the
+    table; the newest matches are found from the ``published_at`` index.
+    ``truncated`` in the response is true when older matches were left out.
+    Pages are numbered (``page``) over the capped set, since ranks are
+    floats that make poor cursor positions.
+    """
+    serializer_class = SearchResultSerializer
+    pagination_class = SearchPagination
+
+    def get_queryset(self):
+        q = self.request.query_params.get('q', '').strip()
+        if not q:
+            raise ValidationError({'q': 'This query parameter is required.'})
+        query = SearchQuery(q, search_type='websearch', config='english')
+        headline = dict(query=query, config='english', start_sel='<mark>', stop_sel='</mark>')
+        matches = AnalyzedNews.objects.filter(search_vector=query)
+        limit = settings.SEARCH_RANK_LIMIT
+        self.truncated = False
+        if limit:
+            # A literal cutoff (rather than a subquery) lets the planner skip older partitions
+            cutoff = list(matches.order_by('-published_at').values_list('published_at', flat=True)[limit - 1:limit])
+            if cutoff:
+                self.truncated = matches.filter(published_at__lt=cutoff[0]).exists()
+                matches = matches.filter(published_at__gte=cutoff[0])
+        return (
+            matches
+            .defer('search_vector')
+            .annotate(
+                rank=SearchRank(F('search_vector'), query),
+                title_headline=SearchHeadline('title', **headline),
+                summary_headline=SearchHeadline('summary', **headline),
+            )
+            .order_by('-rank', '-id')
+        )
+
+    def get_paginated_response(self, data):
+        response = super().get_paginated_response(data)
+        response.data['truncated'] = self.truncated
+        return response
+
+
+class ArchiveView(APIView):
+    """
+    Signals or analyzed news from archived (exported and dropped) partitions.
+
+    Rows older than ``PARTITION_RETENTION_MONTHS`` are no longer served by
+    the regular endpoints. Query params: ``since`` and ``until`` (ISO8601 datetimes or dates),
+    ``symbol`` (signals only), ``limit`` (default 100, max 1000) and ``offset``.
+    """
+    TABLES = {'signals': 'ai_signal', 'analyzed-news': 'ai_analyzednews'}
+
+    def get(self, request, kind):
+        if kind not in self.TABLES:
+            raise Http404
+        params = request.query_params
+        try:
+            limit = min(int(params.get('limit', 100)), 1000)
+            offset = int(params.get('offset', 0))
+        except ValueError:
+            return Response({'detail': 'limit and offset must be integers'}, status=400)
+        try:
+            bounds = _time_bounds(params)
+        except ValueError as e:
+            return Response({'detail': str(e)}, status=400)
+        filters = {}
+        if kind == 'signals' and params.get('symbol'):
+            filters['symbol'] = params['symbol']
+
+        rows = read_archive(self.TABLES[kind], bounds['since'], bounds['until'], filters, limit, offset)
+        results = [{camel_case(key): value for key, value in row.items()} for row in rows]
+        return Response({'limit': limit, 'offset': offset, 'results': results})
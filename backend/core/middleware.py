@@ -0,0 +1,52 @@
+import re
+
+from django.conf import settings
+from django.middleware.gzip import GZipMiddleware
+from django.utils.cache import patch_vary_headers
+
+try:
+    import brotli
+except ImportError:  # Brotli is optional; responses fall back to gzip
+    brotli = None
+
+re_accepts_brotli = re.compile(r'\bbr\b')
+# Only API payloads are compressed. HTML pages (admin, the browsable API)
+# carry CSRF tokens next to reflected input, which is what BREACH exploits.
+COMPRESSIBLE_CONTENT_TYPES = {'application/json'}
+
+
+class CompressionMiddleware(GZipMiddleware):
+    """
+    Compress JSON responses with Brotli when the client accepts it, otherwise gzip.
+
+    Other content types are passed through uncompressed. Streaming responses
+    and clients without ``br`` in ``Accept-Encoding`` take Django's gzip path
+    unchanged, including its random-length padding.
+    """
+
+    def process_response(self, request, response):
+        content_type = response.get('Content-Type', '').split(';')[0].strip().lower()
+        if content_type not in COMPRESSIBLE_CONTENT_TYPES:
+            return response
+        if (
+            brotli is None
+            or response.streaming
+            or response.has_header('Content-Encoding')
+            or not re_accepts_brotli.search(request.META.get('HTTP_ACCEPT_ENCODING', ''))
+        ):
+            return super().process_response(request, response)
+        if len(response.content) < 200:
+            return response
+
+        patch_vary_headers(response, ('Accept-Encoding',))
+        compressed = brotli.compress(response.content, quality=settings.BROTLI_QUALITY)
+        if len(compressed) >= len(response.content):
+            return response
+        response.content = compressed
+        response.headers['Content-Length'] = str(len(compressed))
+        # The body changed, so a strong ETag no longer identifies it byte for byte.
+        etag = response.get('ETag')
+        if etag and etag.startswith('"'):
+            response.headers['ETag'] = 'W/' + etag
+        response.headers['Content-Encoding'] = 'br'
+        return response
@@ -14,6 +14,7 @@ INSTALLED_APPS = [
     'django.contrib.sessions',
     'django.contrib.messages',
     'django.contrib.staticfiles',
+    'django.contrib.postgres',
     'corsheaders',
     'scrapy',
     'django_celery_beat',
@@ -25,6 +26,7 @@ MIDDLEWARE = [
     'whitenoise.middleware.WhiteNoiseMiddleware',
     'corsheaders.middleware.CorsMiddleware',
     'django.middleware.security.SecurityMiddleware',
+    'core.middleware.CompressionMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
     'django.middleware.common.CommonMiddleware',
     'django.middleware.csrf.CsrfViewMiddleware',
@@ -90,10 +92,71 @@ STATICFILES_STORAGE = 'whitenoise.storage.CompressedManifestStaticFilesStorage'
 
 DEFAULT_AUTO_FIELD = 'django.db.models.BigAutoField'
 
+# Default representation for /api/analyzed-news/ lists: 'full' or 'list' (lightweight)
+ANALYZED_NEWS_LIST_VIEW = os.environ.get('ANALYZED_NEWS_LIST_VIEW', 'full')
+# Brotli quality for compressed responses (0-11); lower is faster
+BROTLI_QUALITY = int(os.environ.get('BROTLI_QUALITY', 5))
+
+# Stock reference data is cached per process (see ai.utils.stocks)
+STOCK_CACHE_TTL_SECONDS = int(os.environ.get('STOCK_CACHE_TTL_SECONDS', 3600))
+
+# Local daily OHLCV store (see ai.utils.price_store)
+PRICE_STORE_DIR = os.environ.get('PRICE_STORE_DIR', os.path.join(os.environ.get('APP_DATA_DIR', '/app/data'), 'prices'))
+PRICE_STORE_HISTORY_DAYS = int(os.environ.get('PRICE_STORE_HISTORY_DAYS', 5 * 365))
+
+# "Similar stories" vector index (see ai.utils.news_index)
+NEWS_EMBED_BATCH_SIZE = int(os.environ.get('NEWS_EMBED_BATCH_SIZE', 128))
+SIMILAR_NEWS_HALF_LIFE_HOURS = float(os.environ.get('SIMILAR_NEWS_HALF_LIFE_HOURS', 72))
+# After a failed connection, API requests skip ChromaDB (503) for this long
+NEWS_INDEX_RETRY_SECONDS = float(os.environ.get('NEWS_INDEX_RETRY_SECONDS', 30))
+# Full-text search ranks only the newest this many matches; 0 ranks every match
+SEARCH_RANK_LIMIT = int(os.environ.get('SEARCH_RANK_LIMIT', 1000))
+
+# Monthly partitions of signals and analyzed news (see ai.utils.partitions).
+# Partitions older than the retention window are exported to Parquet under
+# ARCHIVE_DIR and dropped; 0 keeps everything in the database.
+PARTITION_MONTHS_AHEAD = int(os.environ.get('PARTITION_MONTHS_AHEAD', 3))
+PARTITION_RETENTION_MONTHS = int(os.environ.get('PARTITION_RETENTION_MONTHS', 0))
+ARCHIVE_DIR = os.environ.get('ARCHIVE_DIR', os.path.join(os.environ.get('APP_DATA_DIR', '/app/data'), 'archive'))
+
 # Celery Configuration
 CELERY_BROKER_URL = os.environ.get('CELERY_BROKER_URL', 'redis://redis:6379/0')
 CELERY_RESULT_BACKEND = CELERY_BROKER_URL
 
+# Analysis pipeline stages each get their own queue so slow Yahoo lookups
+# never hold the slots issuing LLM calls. Unrouted tasks use the default
+# 'celery' queue.
+CELERY_TASK_ROUTES = {
+    'ai.tasks.retrieve_candidates_task': {'queue': 'retrieval'},
+    'ai.tasks.triage_task': {'queue': 'llm'},
+    'ai.tasks.llm_analysis_task': {'queue': 'llm'},
+    'ai.tasks.enrich_prices_task': {'queue': 'prices'},
+    'ai.tasks.persist_analysis_task': {'queue': 'persist'},
+}
+# Model cascade. Every story first gets a local heuristic score: below TRIAGE_REJECT_SCORE it is
+# skipped, at or above TRIAGE_ACCEPT_SCORE it goes to ANALYSIS_MODEL, and in between TRIAGE_MODEL
+# decides, passing it at TRIAGE_MODEL_THRESHOLD. TRIAGE_MODE 'heuristic' passes the uncertain band
+# without asking the model, 'model' asks it about every story and 'off' analyzes everything.
+ANALYSIS_MODEL = os.environ.get('ANALYSIS_MODEL', 'gpt-4')
+TRIAGE_MODEL = os.environ.get('TRIAGE_MODEL', 'gpt-4o-mini')
+TRIAGE_MODE = os.environ.get('TRIAGE_MODE', 'cascade')
+TRIAGE_REJECT_SCORE = float(os.environ.get('TRIAGE_REJECT_SCORE', 0.1))
+TRIAGE_ACCEPT_SCORE = float(os.environ.get('TRIAGE_ACCEPT_SCORE', 0.7))
+TRIAGE_MODEL_THRESHOLD = float(os.environ.get('TRIAGE_MODEL_THRESHOLD', 0.5))
+TRIAGE_PROMPT_TOKENS = int(os.environ.get('TRIAGE_PROMPT_TOKENS', 300))
+# Stream analysis completions and parse them incrementally; each signal is published on
+# LIVE_SIGNALS_CHANNEL (Redis pub/sub) as soon as it closes, ahead of prices and persistence.
+LLM_STREAMING = os.environ.get('LLM_STREAMING', '1') == '1'
+LIVE_SIGNALS_CHANNEL = os.environ.get('LIVE_SIGNALS_CHANNEL', 'signals:live')
+# Stories whose run has failed this many times (every failed stage execution counts, including
+# Celery's own retries) are no longer picked up by the backfill; fix the cause and reset attempts.
+MAX_ANALYSIS_ATTEMPTS = int(os.environ.get('MAX_ANALYSIS_ATTEMPTS', 12))
+# Per-worker cap on LLM stage executions, e.g. '60/m'; None disables it
+LLM_TASK_RATE_LIMIT = os.environ.get('LLM_TASK_RATE_LIMIT') or None
+# Stage tasks are idempotent, so acknowledge late and redeliver if a worker dies mid-stage.
+CELERY_TASK_ACKS_LATE = True
+CELERY_WORKER_PREFETCH_MULTIPLIER = 1
+
 # CORS
 CORS_ALLOW_ALL_ORIGINS = True
 
@@ -112,6 +175,49 @@ CACHES = {
 SESSION_ENGINE = 'django.contrib.sessions.backends.cache'
 SESSION_CACHE_ALIAS = 'default'
 
+# Economic Times scraper
+# 'fast' parses only the story containers; 'full' builds a tree for the whole page.
+ET_EXTRACTOR = os.environ.get('ET_EXTRACTOR', 'fast')
+ET_HTML_PARSER = os.environ.get('ET_HTML_PARSER', 'lxml')
+# Listing pages to poll, as "name:path" pairs.
+ET_SECTIONS = dict(
+    section.split(':', 1)
+    for section in os.environ.get('ET_SECTIONS', 'india:/news/india').split(',') if section
+)
+
+# Adaptive scrape schedule: each section is polled every sqrt(2 * SCRAPE_FETCH_COST_SECONDS / rate)
+# seconds, where rate is its story arrival rate estimated with a SCRAPE_RATE_HALF_LIFE_SECONDS memory
+# and a fetch is worth SCRAPE_FETCH_COST_SECONDS of total detection delay. The upper bound drops to
+# SCRAPE_MARKET_MAX_INTERVAL_SECONDS during NSE market hours.
+SCRAPE_MIN_INTERVAL_SECONDS = int(os.environ.get('SCRAPE_MIN_INTERVAL_SECONDS', 60))
+SCRAPE_MAX_INTERVAL_SECONDS = int(os.environ.get('SCRAPE_MAX_INTERVAL_SECONDS', 1800))
+SCRAPE_MARKET_MAX_INTERVAL_SECONDS = int(os.environ.get('SCRAPE_MARKET_MAX_INTERVAL_SECONDS', 300))
+SCRAPE_FETCH_COST_SECONDS = float(os.environ.get('SCRAPE_FETCH_COST_SECONDS', 120))
+SCRAPE_RATE_HALF_LIFE_SECONDS = int(os.environ.get('SCRAPE_RATE_HALF_LIFE_SECONDS', 3600))
+SCRAPE_BURST_FACTOR = float(os.environ.get('SCRAPE_BURST_FACTOR', 3.0))
+SCRAPE_MARKET_HOURS = tuple(os.environ.get('SCRAPE_MARKET_HOURS', '09:15-15:30').split('-'))
+SCRAPE_MARKET_DAYS = (0, 1, 2, 3, 4)
+SCRAPE_TIMEZONE = os.environ.get('SCRAPE_TIMEZONE', 'Asia/Kolkata')
+
+# Article bodies: fetched from a pool of ARTICLE_FETCH_WORKERS threads with at most
+# ARTICLE_FETCH_PER_HOST requests in flight and ARTICLE_FETCH_DELAY_SECONDS between request starts
+# per host. Stored compressed; only the first ARTICLE_PROMPT_TOKENS tokens go into the prompt.
+ARTICLE_FETCH_ENABLED = os.environ.get('ARTICLE_FETCH_ENABLED', '1') == '1'
+ARTICLE_FETCH_WORKERS = int(os.environ.get('ARTICLE_FETCH_WORKERS', 8))
+ARTICLE_FETCH_PER_HOST = int(os.environ.get('ARTICLE_FETCH_PER_HOST', 2))
+ARTICLE_FETCH_DELAY_SECONDS = float(os.environ.get('ARTICLE_FETCH_DELAY_SECONDS', 0.5))
+ARTICLE_FETCH_TIMEOUT_SECONDS = float(os.environ.get('ARTICLE_FETCH_TIMEOUT_SECONDS', 10))
+ARTICLE_MAX_BYTES = int(os.environ.get('ARTICLE_MAX_BYTES', 2 * 1024 * 1024))
+ARTICLE_BODY_CODEC = os.environ.get('ARTICLE_BODY_CODEC', 'zstd')
+ARTICLE_ZSTD_LEVEL = int(os.environ.get('ARTICLE_ZSTD_LEVEL', 9))
+ARTICLE_PROMPT_TOKENS = int(os.environ.get('ARTICLE_PROMPT_TOKENS', 1500))
+
+# Seen-link Bloom filter: 2**20 bits (128 KiB) per generation with 7 hashes keeps the
+# false-positive rate under 1e-6 for ~20k links per window.
+SEEN_FILTER_BITS = int(os.environ.get('SEEN_FILTER_BITS', 2 ** 20))
+SEEN_FILTER_HASHES = int(os.environ.get('SEEN_FILTER_HASHES', 7))
+SEEN_FILTER_WINDOW_SECONDS = int(os.environ.get('SEEN_FILTER_WINDOW_SECONDS', 7 * 24 * 3600))
+
 # Logging configuration
 LOGGING = {
     'version': 1,
@@ -12,6 +12,7 @@ echo "Starting Django application..."
 echo "Running migrations..."
 python manage.py makemigrations
 python manage.py migrate
+python manage.py load_stocks
 
 # Create superuser if credentials provided
 if [ "$DJANGO_SUPERUSER_USERNAME" ] && [ "$DJANGO_SUPERUSER_EMAIL" ] && [ "$DJANGO_SUPERUSER_PASSWORD" ]; then
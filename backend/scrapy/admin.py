@@ -1,4 +1,5 @@
 from django.contrib import admin
-from .models import NewsStory
+from .models import ArticleBody, NewsStory
 
-admin.site.register(NewsStory) 
\ No newline at end of file
+admin.site.register(NewsStory)
+admin.site.register(ArticleBody)
@@ -0,0 +1,240 @@
+"""
+Article body fetching for new stories.
+
+Pages are fetched from a thread pool with at most ``per_host`` requests
+in flight per host and at least ``delay`` seconds between request starts to
+the same host. The main text is extracted from the article container only and
+stored compressed in ``ArticleBody``, a table of its own, so that story and
+analysis queries never load it.
+"""
+import codecs
+import gzip
+import logging
+import re
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+from dataclasses import dataclass
+from typing import Iterable, List, Optional
+from urllib.parse import urlsplit
+
+import requests
+from bs4 import BeautifulSoup, SoupStrainer
+from bs4.dammit import EncodingDetector
+from django.conf import settings
+
+from scrapy.economictimes import HEADERS
+
+try:
+    import zstandard
+except ImportError:  # zstandard is optional; bodies fall back to gzip
+    zstandard = None
+
+logger = logging.getLogger(__name__)
+
+ARTICLE_CLASSES = {'artText', 'artData', 'article_wrap', 'story_content'}
+
+
+def _has_article_class(value):
+    # As with the listing strainer, the raw attribute string may arrive unsplit.
+    if not value:
+        return False
+    if isinstance(value, str):
+        value = value.split()
+    return not ARTICLE_CLASSES.isdisjoint(value)
+
+
+# Only the article containers are materialised; nav, ads, comments and
+# scripts around them are skipped by the tokenizer.
+ARTICLE_STRAINER = SoupStrainer('div', class_=_has_article_class)
+
+
+def extract_article_text(html: str, parser: str = None) -> str:
+    """
+    Main text of an article page, one paragraph per line.
+
+    Falls back to every ``<p>`` on the page when no ``ARTICLE_CLASSES``
+    container is present.
+    """
+    parser = parser or settings.ET_HTML_PARSER
+    soup = BeautifulSoup(html, parser, parse_only=ARTICLE_STRAINER)
+    for tag in soup(['script', 'style', 'figure', 'aside']):
+        tag.decompose()
+    text = soup.get_text('\n', strip=True)
+    if not text:
+        soup = BeautifulSoup(html, parser, parse_only=SoupStrainer('p'))
+        text = soup.get_text('\n', strip=True)
+    return '\n'.join(line for line in text.splitlines() if line.strip())
+
+
+def decode_html(body: bytes, content_type: str = '') -> str:
+    """
+    Decode a fetched page.
+
+    The charset comes from the ``Content-Type`` header, then the page's own
+    ``<meta charset>``, then detection, then UTF-8. requests' ``resp.encoding``
+    is not used: it reports ISO-8859-1 for any ``text/html`` without a charset,
+    which garbles the UTF-8 pages most sites serve that way.
+    """
+    match = re.search(r'charset=["\']?([\w.:-]+)', content_type or '', re.I)
+    candidates = (
+        match and match.group(1),
+        EncodingDetector.find_declared_encoding(body, is_html=True),
+        lambda: requests.compat.chardet.detect(body)['encoding'],
+    )
+    for candidate in candidates:
+        encoding = candidate() if callable(candidate) else candidate
+        if not encoding:
+            continue
+        try:
+            return body.decode(codecs.lookup(encoding).name, errors='replace')
+        except LookupError:
+            continue
+    return body.decode('utf-8', errors='replace')
+
+
+def compress_body(text: str, codec: str = None) -> tuple:
+    """
+    Compress ``text`` with ``codec`` (``zstd`` or ``gzip``).
+
+    Returns:
+        tuple: ``(codec actually used, compressed bytes)``; ``zstd`` becomes
+        ``gzip`` when zstandard is not installed
+    """
+    codec = codec or settings.ARTICLE_BODY_CODEC
+    data = text.encode('utf-8')
+    if codec == 'zstd' and zstandard is not None:
+        return 'zstd', zstandard.ZstdCompressor(level=settings.ARTICLE_ZSTD_LEVEL).compress(data)
+    if codec not in ('zstd', 'gzip'):
+        raise ValueError(f"Unknown article body codec: {codec}")
+    return 'gzip', gzip.compress(data, compresslevel=6)
+
+
+def decompress_body(codec: str, body: bytes) -> str:
+    if not body:
+        return ''
+    if codec == 'zstd':
+        if zstandard is None:
+            raise RuntimeError("zstandard is required to read zstd article bodies")
+        return zstandard.ZstdDecompressor().decompress(bytes(body)).decode('utf-8')
+    return gzip.decompress(bytes(body)).decode('utf-8')
+
+
+@dataclass
+class ArticleResult:
+    url: str
+    text: str = ''
+    status: Optional[int] = None
+    error: str = ''
+    bytes: int = 0
+    elapsed: float = 0.0
+
+
+class ArticleFetcher:
+    """Fetches article pages concurrently within per-host limits."""
+
+    def __init__(self, workers: int = None, per_host: int = None, delay: float = None,
+                 timeout: float = None, max_bytes: int = None, headers: dict = None):
+        self.workers = workers or settings.ARTICLE_FETCH_WORKERS
+        self.per_host = per_host or settings.ARTICLE_FETCH_PER_HOST
+        self.delay = settings.ARTICLE_FETCH_DELAY_SECONDS if delay is None else delay
+        self.timeout = timeout or settings.ARTICLE_FETCH_TIMEOUT_SECONDS
+        self.max_bytes = max_bytes or settings.ARTICLE_MAX_BYTES
+        self.headers = HEADERS if headers is None else headers
+        self._lock = threading.Lock()
+        self._slots = {}
+        self._next_start = {}
+        self._local = threading.local()
+
+    @contextmanager
+    def _host_slot(self, host: str):
+        with self._lock:
+            slot = self._slots.setdefault(host, threading.BoundedSemaphore(self.per_host))
+        with slot:
+            with self._lock:
+                now = time.monotonic()
+                start = max(now, self._next_start.get(host, now))
+                self._next_start[host] = start + self.delay
+            time.sleep(start - now)
+            yield
+
+    def _session(self) -> requests.Session:
+        # One pooled session per worker thread; Session is not thread-safe.
+        if not hasattr(self._local, 'session'):
+            self._local.session = requests.Session()
+            self._local.session.headers.update(self.headers)
+        return self._local.session
+
+    def fetch(self, url: str) -> ArticleResult:
+        result = ArticleResult(url)
+        t0 = time.perf_counter()
+        try:
+            with self._host_slot(urlsplit(url).netloc):
+                with self._session().get(url, timeout=self.timeout, stream=True) as resp:
+                    result.status = resp.status_code
+                    resp.raise_for_status()
+                    chunks, size = [], 0
+                    for chunk in resp.iter_content(64 * 1024):
+                        chunks.append(chunk)
+                        size += len(chunk)
+                        if size >= self.max_bytes:
+                            break
+                    html = decode_html(b''.join(chunks)[:self.max_bytes], resp.headers.get('Content-Type'))
+            result.bytes = size
+            result.text = extract_article_text(html)
+        except Exception as e:
+            result.error = str(e)[:2000]
+        result.elapsed = time.perf_counter() - t0
+        return result
+
+    def fetch_many(self, urls: Iterable[str]) -> List[ArticleResult]:
+        """Results in the order of ``urls``; failures carry ``error`` instead of raising."""
+        with ThreadPoolExecutor(max_workers=self.workers) as pool:
+            return list(pool.map(self.fetch, urls))
+
+
+def fetch_article_bodies(stories, fetcher: ArticleFetcher = None) -> dict:
+    """
+    Fetch, extract and store the bodies of ``stories`` (``NewsStory`` rows).
+
+    Failed fetches are stored with their HTTP status, error and an empty
+    body, so they can be inspected and retried.
+
+    Returns:
+        dict: counts of fetched, failed, raw and compressed bytes
+    """
+    from scrapy.models import ArticleBody
+
+    stories = list(stories)
+    fetcher = fetcher or ArticleFetcher()
+    t0 = time.perf_counter()
+    results = fetcher.fetch_many(story.link for story in stories)
+    elapsed = time.perf_counter() - t0
+
+    rows = []
+    raw_bytes = compressed_bytes = 0
+    for story, result in zip(stories, results):
+        codec, body = compress_body(result.text) if result.text else ('', b'')
+        raw_bytes += len(result.text.encode('utf-8'))
+        compressed_bytes += len(body)
+        rows.append(ArticleBody(
+            news_story=story, codec=codec, body=body, text_length=len(result.text),
+            http_status=result.status, error=result.error,
+        ))
+    ArticleBody.objects.bulk_create(
+        rows, update_conflicts=True, unique_fields=['news_story'],
+        update_fields=['codec', 'body', 'text_length', 'http_status', 'error', 'fetched_at'],
+    )
+    stats = {
+        'fetched': sum(1 for r in results if r.text),
+        'failed': sum(1 for r in results if not r.text),
+        'seconds': elapsed,
+        'raw_bytes': raw_bytes,
+        'compressed_bytes': compressed_bytes,
+    }
+    logger.info(
+        "Fetched %(fetched)d article bodies (%(failed)d failed) in %(seconds).1fs; "
+        "%(raw_bytes)d bytes of text stored in %(compressed_bytes)d.", stats,
+    )
+    return stats
@@ -1,48 +1,103 @@
 import requests
-from bs4 import BeautifulSoup
+from bs4 import BeautifulSoup, SoupStrainer
+from django.conf import settings
 from django.utils.dateparse import parse_datetime
 from django.utils import timezone
 import logging
 
 logger = logging.getLogger(__name__)
 
+ET_BASE_URL = "https://economictimes.indiatimes.com"
 
+HEADERS = {
+    "sec-ch-ua": '"Chromium";v="136", "Google Chrome";v="136", "Not.A/Brand";v="99"',
+    "sec-ch-ua-mobile": "?0",
+    "sec-ch-ua-model": '""',
+    "sec-ch-ua-platform": '"Windows"',
+    "sec-ch-ua-platform-version": '"19.0.0"',
+    "upgrade-insecure-requests": "1",
+    "user-agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/136.0.0.0 Safari/537.36"
+}
 
-def fetch_economic_times_news():
-    HEADERS = {
-        "sec-ch-ua": '"Chromium";v="136", "Google Chrome";v="136", "Not.A/Brand";v="99"',
-        "sec-ch-ua-mobile": "?0",
-        "sec-ch-ua-model": '""',
-        "sec-ch-ua-platform": '"Windows"',
-        "sec-ch-ua-platform-version": '"19.0.0"',
-        "upgrade-insecure-requests": "1",
-        "user-agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/136.0.0.0 Safari/537.36"
+
+def _has_each_story_class(value):
+    # The strainer may see the raw attribute string ("eachStory clearfix")
+    # rather than the split class list, so match on whitespace tokens.
+    if not value:
+        return False
+    if isinstance(value, str):
+        value = value.split()
+    return 'eachStory' in value
+
+
+# Only the story containers are materialised by the fast extractor; the rest
+# of the page (nav, ads, scripts) is skipped by the tokenizer.
+EACH_STORY_STRAINER = SoupStrainer('div', class_=_has_each_story_class)
+
+
+def _story_to_dict(story):
+    """Convert a single ``div.eachStory`` element into a news dict."""
+    a = story.find('a')
+    time_tag = story.find('time')
+    p = story.find('p')
+    title = a.get_text(strip=True) if a else ''
+    link = ET_BASE_URL + a['href'] if a and a.has_attr('href') else ''
+    dt_str = time_tag['datetime'] if time_tag and time_tag.has_attr('datetime') else ''
+    dt = parse_datetime(dt_str) if dt_str else timezone.now()
+    description = p.get_text(strip=True) if p else ''
+    return {
+        'title': title,
+        'link': link,
+        'datetime': dt,
+        'description': description
     }
-    logger.info("Fetching Economic Times news...")
+
+
+def extract_stories_full(html, parser='html.parser'):
+    """Build a tree for the whole page and pick out every ``div.eachStory``."""
+    soup = BeautifulSoup(html, parser)
+    return soup.find_all('div', class_='eachStory')
+
+
+def extract_stories_fast(html, parser=None):
+    """Parse only the ``div.eachStory`` containers using a ``SoupStrainer``."""
+    soup = BeautifulSoup(html, parser or settings.ET_HTML_PARSER, parse_only=EACH_STORY_STRAINER)
+    return soup.find_all('div', class_='eachStory')
+
+
+EXTRACTORS = {
+    'full': extract_stories_full,
+    'fast': extract_stories_fast,
+}
+
+
+def parse_economic_times_html(html, extractor=None):
+    """
+    Parse an Economic Times listing page into news dicts.
+
+    Args:
+        html: Raw page markup
+        extractor: Name of an entry in ``EXTRACTORS``; defaults to ``settings.ET_EXTRACTOR``
+
+    Returns:
+        list: One dict per story with ``title``, ``link``, ``datetime`` and ``description``
+    """
+    extractor = extractor or settings.ET_EXTRACTOR
+    try:
+        extract = EXTRACTORS[extractor]
+    except KeyError:
+        raise ValueError(f"Unknown Economic Times extractor: {extractor}")
+    return [_story_to_dict(story) for story in extract(html)]
+
+
+def fetch_economic_times_news(extractor=None, path='/news/india'):
+    logger.info(f"Fetching Economic Times news from {path}...")
     try:
-        resp = requests.get("https://economictimes.indiatimes.com/news/india", headers=HEADERS)
+        resp = requests.get(f"{ET_BASE_URL}{path}", headers=HEADERS)
         resp.raise_for_status()
     except Exception as e:
         logger.error(f"Failed to fetch Economic Times page: {e}")
         return []
-    soup = BeautifulSoup(resp.text, 'html.parser')
-    stories = soup.find_all('div', class_='eachStory')
-    logger.info("Found %d stories on the page.", len(stories))
-    news_list = []
-    for story in stories:
-        a = story.find('a')
-        time_tag = story.find('time')
-        p = story.find('p')
-        title = a.get_text(strip=True) if a else ''
-        link = 'https://economictimes.indiatimes.com' + a['href'] if a and a.has_attr('href') else ''
-        dt_str = time_tag['datetime'] if time_tag and time_tag.has_attr('datetime') else ''
-        dt = parse_datetime(dt_str) if dt_str else timezone.now()
-        description = p.get_text(strip=True) if p else ''
-        news_list.append({
-            'title': title,
-            'link': link,
-            'datetime': dt,
-            'description': description
-        })
+    news_list = parse_economic_times_html(resp.text, extractor)
     logger.info("Returning %d parsed news stories.", len(news_list))
-    return news_list
\ No newline at end of file
+    return news_list
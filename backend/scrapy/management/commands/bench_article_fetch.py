@@ -0,0 +1,139 @@
+import gzip
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+
+import numpy as np
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+from ai.utils.openai_utils import truncate_to_tokens
+from ai.utils.synthetic import synthetic_article_html
+from scrapy.articles import ArticleFetcher, compress_body, extract_article_text, zstandard
+
+
+class FixtureServer:
+    """Serves ``pages`` at ``/articles/<n>`` after ``latency`` seconds and records peak concurrency."""
+
+    def __init__(self, pages, latency: float):
+        self.pages = [page.encode('utf-8') for page in pages]
+        self.in_flight = 0
+        self.peak = 0
+        lock = threading.Lock()
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                with lock:
+                    server.in_flight += 1
+                    server.peak = max(server.peak, server.in_flight)
+                try:
+                    time.sleep(latency)
+                    page = server.pages[int(self.path.rsplit('/', 1)[-1]) % len(server.pages)]
+                    self.send_response(200)
+                    self.send_header('Content-Type', 'text/html; charset=utf-8')
+                    self.send_header('Content-Length', str(len(page)))
+                    self.end_headers()
+                    self.wfile.write(page)
+                finally:
+                    with lock:
+                        server.in_flight -= 1
+
+            def log_message(self, format, *args):
+                pass
+
+        self.httpd = ThreadingHTTPServer(('127.0.0.1', 0), Handler)
+        self.httpd.daemon_threads = True
+        self.port = self.httpd.server_address[1]
+        self.thread = threading.Thread(target=self.httpd.serve_forever, daemon=True)
+
+    def __enter__(self):
+        self.thread.start()
+        return self
+
+    def __exit__(self, *exc):
+        self.httpd.shutdown()
+        self.httpd.server_close()
+
+
+class Command(BaseCommand):
+    help = (
+        "Benchmark the article body fetcher against local fixture servers, one per simulated host. "
+        "Reports pages/second and peak per-host concurrency for each worker/per-host setting, "
+        "then extraction speed, stored size per codec and prompt truncation."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--html', nargs='*', default=[], help='Saved article pages to serve instead of '
+                                                                  'synthetic ones')
+        parser.add_argument('--pages', type=int, default=200, help='Articles to fetch per run')
+        parser.add_argument('--hosts', type=int, default=4, help='Fixture servers, each a separate host')
+        parser.add_argument('--latency-ms', type=float, default=100, help='Server response delay')
+        parser.add_argument('--delay', type=float, default=0.0, help='Politeness delay between requests per host')
+        parser.add_argument('--configs', default='1x1,8x2,16x4',
+                            help='Comma-separated WORKERSxPER_HOST fetcher settings')
+        parser.add_argument('--seed', type=int, default=0)
+
+    def handle(self, *args, **options):
+        if options['html']:
+            try:
+                pages = [Path(path).read_text(encoding='utf-8') for path in options['html']]
+            except OSError as e:
+                raise CommandError(f"Cannot read page: {e}")
+        else:
+            rng = np.random.default_rng(options['seed'])
+            pages = [synthetic_article_html(rng) for _ in range(50)]
+
+        servers = [FixtureServer(pages, options['latency_ms'] / 1000) for _ in range(options['hosts'])]
+        for server in servers:
+            server.__enter__()
+        try:
+            urls = [f"http://127.0.0.1:{servers[i % len(servers)].port}/articles/{i}" for i in range(options['pages'])]
+            for config in [c for c in options['configs'].split(',') if c]:
+                workers, per_host = (int(v) for v in config.split('x'))
+                for server in servers:
+                    server.peak = 0
+                fetcher = ArticleFetcher(workers=workers, per_host=per_host, delay=options['delay'], headers={})
+                t0 = time.perf_counter()
+                results = fetcher.fetch_many(urls)
+                elapsed = time.perf_counter() - t0
+                failed = sum(1 for r in results if not r.text)
+                latencies = np.asarray([r.elapsed for r in results]) * 1000
+                self.stdout.write(
+                    f"{workers:>3} workers x {per_host} per host: {len(urls) / elapsed:7.1f} pages/s  "
+                    f"p50 {np.percentile(latencies, 50):6.1f}  p95 {np.percentile(latencies, 95):6.1f} ms  "
+                    f"peak {max(s.peak for s in servers)} in flight per host  {failed} failed"
+                )
+        finally:
+            for server in servers:
+                server.__exit__()
+
+        t0 = time.perf_counter()
+        texts = [extract_article_text(page) for page in pages]
+        extract_ms = (time.perf_counter() - t0) * 1000 / len(pages)
+        html_bytes = sum(len(page.encode('utf-8')) for page in pages)
+        text_bytes = sum(len(text.encode('utf-8')) for text in texts)
+        self.stdout.write(
+            f"Extraction: {extract_ms:.2f} ms/page; {html_bytes / len(pages) / 1024:.1f} KiB of HTML -> "
+            f"{text_bytes / len(pages) / 1024:.1f} KiB of text per page"
+        )
+        codecs = ['gzip'] + (['zstd'] if zstandard is not None else [])
+        for codec in codecs:
+            t0 = time.perf_counter()
+            sizes = [len(compress_body(text, codec)[1]) for text in texts]
+            compress_ms = (time.perf_counter() - t0) * 1000 / len(texts)
+            self.stdout.write(
+                f"{codec:>5}: {sum(sizes) / len(sizes) / 1024:.2f} KiB per body "
+                f"({text_bytes / sum(sizes):.1f}x), {compress_ms:.2f} ms to compress"
+            )
+        # For reference: what storing the whole page instead of the text would cost.
+        page_sizes = [len(gzip.compress(page.encode('utf-8'), compresslevel=6)) for page in pages]
+        self.stdout.write(f"gzipped HTML for reference: {sum(page_sizes) / len(page_sizes) / 1024:.2f} KiB per page")
+
+        truncated = [truncate_to_tokens(text, settings.ARTICLE_PROMPT_TOKENS) for text in texts]
+        cut = sum(1 for text, short in zip(texts, truncated) if len(short) < len(text))
+        self.stdout.write(
+            f"Prompt budget {settings.ARTICLE_PROMPT_TOKENS} tokens: {cut}/{len(texts)} bodies truncated, "
+            f"{np.mean([len(t) for t in truncated]):.0f} chars per prompt body"
+        )
@@ -0,0 +1,74 @@
+import time
+import tracemalloc
+from pathlib import Path
+
+from django.core.management.base import BaseCommand, CommandError
+
+from scrapy.economictimes import EXTRACTORS, parse_economic_times_html
+
+FIXTURES = Path(__file__).resolve().parents[2] / 'tests' / 'fixtures'
+
+
+def _comparable(news_list, undated):
+    """Drop the fallback ``timezone.now()`` datetimes, which differ between runs."""
+    return [
+        {k: v for k, v in news.items() if not (k == 'datetime' and i in undated)}
+        for i, news in enumerate(news_list)
+    ]
+
+
+class Command(BaseCommand):
+    help = (
+        "Benchmark Economic Times extractors on saved pages. Reports pages/second and "
+        "peak memory per extractor and checks every extractor matches the 'full' output."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('pages', nargs='*', help='Saved Economic Times HTML pages; defaults to the '
+                                                     'golden test fixtures')
+        parser.add_argument('--repeat', type=int, default=20, help='Parses per page per extractor')
+
+    def handle(self, *args, **options):
+        pages = []
+        for path in options['pages'] or sorted(FIXTURES.glob('et_*.html')):
+            try:
+                pages.append(Path(path).read_text(encoding='utf-8'))
+            except OSError as e:
+                raise CommandError(f"Cannot read {path}: {e}")
+
+        # Golden output: the original whole-page parse.
+        golden = [parse_economic_times_html(html, 'full') for html in pages]
+        # Stories without a <time datetime> get timezone.now(); mask them per story.
+        undated = []
+        for html in pages:
+            stories = EXTRACTORS['full'](html)
+            undated.append({
+                i for i, story in enumerate(stories)
+                if not (story.find('time') and story.find('time').has_attr('datetime'))
+            })
+
+        for name in EXTRACTORS:
+            for page, expected, skip in zip(pages, golden, undated):
+                got = parse_economic_times_html(page, name)
+                if _comparable(got, skip) != _comparable(expected, skip):
+                    raise CommandError(f"Extractor '{name}' output differs from 'full'")
+
+            start = time.perf_counter()
+            for _ in range(options['repeat']):
+                for html in pages:
+                    parse_economic_times_html(html, name)
+            elapsed = time.perf_counter() - start
+
+            # Peak memory is measured on a separate pass; tracing slows parsing down.
+            tracemalloc.start()
+            for html in pages:
+                parse_economic_times_html(html, name)
+            _, peak = tracemalloc.get_traced_memory()
+            tracemalloc.stop()
+
+            parsed = options['repeat'] * len(pages)
+            self.stdout.write(
+                f"{name:>5}: {parsed / elapsed:8.1f} pages/s  "
+                f"peak {peak / (1024 * 1024):6.2f} MiB  ({parsed} parses in {elapsed:.2f}s)"
+            )
+        self.stdout.write(self.style.SUCCESS("All extractors match the golden output."))
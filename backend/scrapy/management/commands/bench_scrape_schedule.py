@@ -0,0 +1,83 @@
+from datetime import date, timedelta
+
+import numpy as np
+import pandas as pd
+from django.core.management.base import BaseCommand, CommandError
+from django.utils import timezone
+
+from ai.utils.synthetic import synthetic_arrivals
+from scrapy.models import NewsStory
+from scrapy.schedule import AdaptivePolicy, simulate
+
+
+class Command(BaseCommand):
+    help = (
+        "Replay a story arrival trace against fixed polling intervals and the adaptive schedule. "
+        "Reports fetches per day against detection latency (publish to first fetch that sees it) "
+        "and stories missed because they scrolled off the listing page between fetches."
+    )
+
+    def add_arguments(self, parser):
+        source = parser.add_mutually_exclusive_group()
+        source.add_argument('--trace', help='CSV of publish times: a "datetime" column or the first column')
+        source.add_argument('--from-db', action='store_true',
+                            help='Use the datetimes of stored NewsStory rows from the last --days days')
+        parser.add_argument('--days', type=int, default=14, help='Length of the synthetic or database trace')
+        parser.add_argument('--seed', type=int, default=0)
+        parser.add_argument('--page-size', type=int, default=50, help='Stories shown on the listing page')
+        parser.add_argument('--intervals', default='60,120,300,600,900,1800',
+                            help='Comma-separated fixed polling intervals in seconds')
+        parser.add_argument('--fetch-costs', default='30,60,120,300',
+                            help='Comma-separated adaptive fetch costs in seconds of detection delay')
+        parser.add_argument('--min-interval', type=float)
+        parser.add_argument('--max-interval', type=float)
+        parser.add_argument('--market-max-interval', type=float)
+        parser.add_argument('--half-life', type=float)
+        parser.add_argument('--burst-factor', type=float)
+
+    def load_trace(self, options):
+        if options['trace']:
+            try:
+                df = pd.read_csv(options['trace'])
+            except (OSError, ValueError) as e:
+                raise CommandError(f"Cannot read {options['trace']}: {e}")
+            column = df['datetime'] if 'datetime' in df else df.iloc[:, 0]
+            times = pd.to_datetime(column, utc=True).dropna()
+            return times.dt.as_unit('s').astype('int64').to_numpy(dtype=float)
+        if options['from_db']:
+            since = timezone.now() - timedelta(days=options['days'])
+            times = NewsStory.objects.filter(datetime__gte=since).values_list('datetime', flat=True)
+            return np.asarray([t.timestamp() for t in times], dtype=float)
+        start = date.today() - timedelta(days=options['days'])
+        return synthetic_arrivals(start, options['days'], seed=options['seed'])
+
+    def report(self, label, result, days):
+        minutes = {key: result[key] / 60 for key in ('mean_latency', 'p50_latency', 'p95_latency', 'max_latency')}
+        self.stdout.write(
+            f"{label:>18}: {result['fetches'] / days:7.1f} fetches/day  "
+            f"latency mean {minutes['mean_latency']:5.1f}  p50 {minutes['p50_latency']:5.1f}  "
+            f"p95 {minutes['p95_latency']:5.1f}  max {minutes['max_latency']:6.1f} min  "
+            f"{result['missed']} missed"
+        )
+
+    def handle(self, *args, **options):
+        arrivals = np.sort(self.load_trace(options))
+        if len(arrivals) < 2:
+            raise CommandError("The trace needs at least two stories")
+        start, end = arrivals[0], arrivals[-1] + 1
+        days = (end - start) / 86400
+        self.stdout.write(f"{len(arrivals):,} stories over {days:.1f} days "
+                          f"({len(arrivals) / days:.0f}/day), page size {options['page_size']}")
+
+        for interval in [float(i) for i in options['intervals'].split(',') if i]:
+            result = simulate(arrivals, start, end, interval=interval, page_size=options['page_size'])
+            self.report(f"fixed {interval:.0f}s", result, days)
+
+        for fetch_cost in [float(c) for c in options['fetch_costs'].split(',') if c]:
+            policy = AdaptivePolicy(
+                min_interval=options['min_interval'], max_interval=options['max_interval'],
+                market_max_interval=options['market_max_interval'], fetch_cost=fetch_cost,
+                half_life=options['half_life'], burst_factor=options['burst_factor'],
+            )
+            result = simulate(arrivals, start, end, policy=policy, page_size=options['page_size'])
+            self.report(f"adaptive C={fetch_cost:g}s", result, days)
@@ -0,0 +1,31 @@
+# Generated by Django 5.2.18 on 2026-10-19 15:50
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('scrapy', '0002_delete_scheduledtask'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ArticleBody',
+            fields=[
+                ('news_story', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, primary_key=True, related_name='article_body', serialize=False, to='scrapy.newsstory')),
+                ('codec', models.CharField(blank=True, choices=[('zstd', 'zstd'), ('gzip', 'gzip')], max_length=4)),
+                ('body', models.BinaryField()),
+                ('text_length', models.PositiveIntegerField(default=0)),
+                ('http_status', models.PositiveSmallIntegerField(blank=True, null=True)),
+                ('error', models.TextField(blank=True)),
+                ('fetched_at', models.DateTimeField(auto_now=True)),
+            ],
+        ),
+        # Bodies are already compressed; skip TOAST's own pglz pass over them.
+        migrations.RunSQL(
+            'ALTER TABLE scrapy_articlebody ALTER COLUMN body SET STORAGE EXTERNAL',
+            'ALTER TABLE scrapy_articlebody ALTER COLUMN body SET STORAGE EXTENDED',
+        ),
+    ]
@@ -7,4 +7,35 @@ class NewsStory(models.Model):
     description = models.TextField()
 
     def __str__(self):
-        return self.title 
\ No newline at end of file
+        return self.title
+
+
+class ArticleBody(models.Model):
+    """
+    Extracted article text of a story, compressed.
+
+    Kept out of ``NewsStory`` so story lists and joins never read it. An
+    empty ``body`` with ``error`` set records a failed fetch.
+    """
+    CODECS = (
+        ('zstd', 'zstd'),
+        ('gzip', 'gzip'),
+    )
+    news_story = models.OneToOneField(NewsStory, on_delete=models.CASCADE, primary_key=True,
+                                      related_name='article_body')
+    codec = models.CharField(max_length=4, choices=CODECS, blank=True)
+    body = models.BinaryField()
+    # Characters of text before compression
+    text_length = models.PositiveIntegerField(default=0)
+    http_status = models.PositiveSmallIntegerField(null=True, blank=True)
+    error = models.TextField(blank=True)
+    fetched_at = models.DateTimeField(auto_now=True)
+
+    @property
+    def text(self) -> str:
+        from scrapy.articles import decompress_body
+
+        return decompress_body(self.codec, self.body)
+
+    def __str__(self):
+        return f"{self.news_story_id}: {self.text_length} chars"
@@ -0,0 +1,182 @@
+import json
+import logging
+import math
+import time
+from dataclasses import asdict, dataclass
+from datetime import datetime, time as dt_time
+from typing import Iterable, List, Optional
+from zoneinfo import ZoneInfo
+
+from django.conf import settings
+from django_redis import get_redis_connection
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class SectionState:
+    """Arrival-rate estimate and polling schedule for one listing section."""
+    rate: float = 0.0  # EWMA of stories per second
+    interval: float = 0.0  # seconds until the next fetch
+    next_due: float = 0.0  # Unix time
+    last_fetch: Optional[float] = None
+    last_story: Optional[float] = None  # newest story timestamp seen; the arrival watermark
+    burst: bool = False
+
+
+class AdaptivePolicy:
+    """
+    Polling interval from the observed story arrival rate.
+
+    Each fetch counts the stories published after the previous watermark and
+    folds ``count / elapsed`` into an exponentially weighted rate whose
+    weight decays with ``half_life`` seconds of elapsed time.
+
+    Polling every ``I`` seconds costs ``1 / I`` fetches and ``rate * I / 2``
+    seconds of detection delay per second; weighing a fetch as
+    ``fetch_cost`` seconds of delay, the total is smallest at
+    ``I = sqrt(2 * fetch_cost / rate)``. The interval is clamped to
+    ``[min_interval, max_interval]``, and the upper bound drops to
+    ``market_max_interval`` during market hours. A fetch whose
+    instantaneous rate exceeds ``burst_factor`` times the estimate polls
+    again at ``min_interval``.
+    """
+
+    def __init__(self, min_interval: float = None, max_interval: float = None,
+                 market_max_interval: float = None, fetch_cost: float = None, half_life: float = None,
+                 burst_factor: float = None, market_hours=None, market_days=None, tz: str = None):
+        self.min_interval = min_interval or settings.SCRAPE_MIN_INTERVAL_SECONDS
+        self.max_interval = max_interval or settings.SCRAPE_MAX_INTERVAL_SECONDS
+        self.market_max_interval = market_max_interval or settings.SCRAPE_MARKET_MAX_INTERVAL_SECONDS
+        self.fetch_cost = fetch_cost or settings.SCRAPE_FETCH_COST_SECONDS
+        self.half_life = half_life or settings.SCRAPE_RATE_HALF_LIFE_SECONDS
+        self.burst_factor = burst_factor or settings.SCRAPE_BURST_FACTOR
+        start, end = market_hours or settings.SCRAPE_MARKET_HOURS
+        self.market_open = dt_time.fromisoformat(start)
+        self.market_close = dt_time.fromisoformat(end)
+        self.market_days = set(market_days if market_days is not None else settings.SCRAPE_MARKET_DAYS)
+        self.tz = ZoneInfo(tz or settings.SCRAPE_TIMEZONE)
+
+    def in_market_hours(self, now: float) -> bool:
+        local = datetime.fromtimestamp(now, self.tz)
+        return local.weekday() in self.market_days and self.market_open <= local.time() < self.market_close
+
+    def observe(self, state: SectionState, now: float, story_times: Iterable[float]) -> SectionState:
+        """Fold one fetch's story timestamps into ``state`` and schedule the next fetch."""
+        story_times = [t for t in story_times if t is not None]
+        burst = False
+        if state.last_fetch is None:
+            # First sight of the section: the page is backlog, not arrivals, but
+            # its time span gives a starting estimate.
+            span = now - min(story_times, default=now)
+            rate = (len(story_times) - 1) / span if len(story_times) > 1 and span > 0 else state.rate
+        else:
+            elapsed = max(now - state.last_fetch, 1.0)
+            watermark = state.last_story if state.last_story is not None else state.last_fetch
+            arrivals = sum(1 for t in story_times if t > watermark)
+            instant = arrivals / elapsed
+            weight = 1.0 - 0.5 ** (elapsed / self.half_life)
+            rate = weight * instant + (1.0 - weight) * state.rate
+            burst = arrivals >= 2 and instant > self.burst_factor * max(state.rate, 1e-9)
+
+        upper = self.market_max_interval if self.in_market_hours(now) else self.max_interval
+        if burst:
+            interval = self.min_interval
+        elif rate > 0:
+            interval = min(max(math.sqrt(2 * self.fetch_cost / rate), self.min_interval), upper)
+        else:
+            interval = upper
+        newest = max(story_times, default=None)
+        last_story = state.last_story if newest is None else max(newest, state.last_story or newest)
+        return SectionState(rate=rate, interval=interval, next_due=now + interval, last_fetch=now,
+                            last_story=last_story, burst=burst)
+
+
+class ScrapeSchedule:
+    """``SectionState`` per section, persisted in Redis as JSON."""
+
+    def __init__(self, key_prefix: str = 'et_schedule', policy: AdaptivePolicy = None, connection=None):
+        self.key_prefix = key_prefix
+        self.policy = policy or AdaptivePolicy()
+        self.redis = connection or get_redis_connection('default')
+
+    def _key(self, section: str) -> str:
+        return f"{self.key_prefix}:{section}"
+
+    def get(self, section: str) -> SectionState:
+        raw = self.redis.get(self._key(section))
+        return SectionState(**json.loads(raw)) if raw else SectionState()
+
+    def due_sections(self, sections: Iterable[str], now: float = None) -> List[str]:
+        """
+        Sections whose next fetch is due, each claimed for this caller.
+
+        The claim is a short-lived Redis lock, so overlapping dispatcher runs
+        never fetch a section twice.
+        """
+        now = time.time() if now is None else now
+        due = []
+        for section in sections:
+            if self.get(section).next_due <= now and self.redis.set(
+                f"{self._key(section)}:claim", 1, nx=True, ex=int(self.policy.min_interval)
+            ):
+                due.append(section)
+        return due
+
+    def record_fetch(self, section: str, story_datetimes: Iterable[datetime], now: float = None) -> SectionState:
+        now = time.time() if now is None else now
+        state = self.policy.observe(self.get(section), now, [d.timestamp() for d in story_datetimes if d])
+        self.redis.set(self._key(section), json.dumps(asdict(state)))
+        logger.info(
+            f"Section {section}: {state.rate * 3600:.1f} stories/h, next fetch in {state.interval:.0f}s"
+            f"{' (burst)' if state.burst else ''}"
+        )
+        return state
+
+
+def simulate(arrivals: List[float], start: float, end: float, policy: AdaptivePolicy = None,
+             interval: float = None, page_size: int = 50) -> dict:
+    """
+    Replay an arrival trace against a polling policy.
+
+    Polls with a fixed ``interval`` when given, otherwise with ``policy``.
+    A fetch at ``t`` sees the ``page_size`` newest stories published by
+    ``t``; a story first seen at ``t`` has detection latency ``t - published``,
+    and one that scrolls off the page between fetches is missed.
+
+    Returns:
+        dict: ``fetches``, ``detected``, ``missed`` and latency percentiles in seconds
+    """
+    import numpy as np
+
+    arrivals = np.sort(np.asarray([a for a in arrivals if start <= a < end], dtype=float))
+    state = SectionState()
+    latencies = []
+    missed = 0
+    detected_upto = 0  # arrivals[:detected_upto] have been seen or missed
+    fetches = 0
+    now = start
+    while now < end:
+        fetches += 1
+        published = int(np.searchsorted(arrivals, now, side='right'))
+        first_visible = max(published - page_size, 0)
+        if first_visible > detected_upto:
+            missed += first_visible - detected_upto
+            detected_upto = first_visible
+        latencies.extend(now - arrivals[detected_upto:published])
+        detected_upto = max(detected_upto, published)
+        if interval:
+            now += interval
+        else:
+            state = policy.observe(state, now, arrivals[first_visible:published])
+            now = state.next_due
+    latencies = np.asarray(latencies) if latencies else np.asarray([math.nan])
+    return {
+        'fetches': fetches,
+        'detected': int(np.count_nonzero(~np.isnan(latencies))),
+        'missed': missed,
+        'mean_latency': float(np.nanmean(latencies)),
+        'p50_latency': float(np.nanpercentile(latencies, 50)),
+        'p95_latency': float(np.nanpercentile(latencies, 95)),
+        'max_latency': float(np.nanmax(latencies)),
+    }
@@ -0,0 +1,106 @@
+import hashlib
+import logging
+import time
+from typing import Dict, Iterable, List
+from urllib.parse import urlsplit, urlunsplit
+
+from django.conf import settings
+from django_redis import get_redis_connection
+
+logger = logging.getLogger(__name__)
+
+
+def normalize_link(link: str) -> str:
+    """Normalize a story link so tracking params and cosmetic differences don't defeat the filter."""
+    parts = urlsplit(link.strip())
+    path = parts.path.rstrip('/') or '/'
+    return urlunsplit((parts.scheme.lower(), parts.netloc.lower(), path, '', ''))
+
+
+class SeenLinkFilter:
+    """
+    Redis-backed Bloom filter of story links that are already stored.
+
+    The filter is split into time-bucketed generations. Lookups check the
+    current and previous generation; every hit is re-added to the current
+    generation, so links still being served stay warm while stale ones
+    age out once their generation expires. Bloom filters have no false
+    negatives, so a miss always means "check the database".
+    """
+
+    def __init__(self, key_prefix: str = 'et_seen', bits: int = None, hashes: int = None,
+                 window_seconds: int = None, connection=None):
+        self.key_prefix = key_prefix
+        self.bits = bits or settings.SEEN_FILTER_BITS
+        self.hashes = hashes or settings.SEEN_FILTER_HASHES
+        self.window_seconds = window_seconds or settings.SEEN_FILTER_WINDOW_SECONDS
+        self.redis = connection or get_redis_connection('default')
+
+    def _generation(self, now: float = None) -> int:
+        return int((now if now is not None else time.time()) // self.window_seconds)
+
+    def _key(self, generation: int) -> str:
+        return f"{self.key_prefix}:{generation}"
+
+    def _offsets(self, link: str) -> List[int]:
+        # Kirsch-Mitzenmacher double hashing from a single digest.
+        digest = hashlib.blake2b(normalize_link(link).encode('utf-8'), digest_size=16).digest()
+        h1 = int.from_bytes(digest[:8], 'big')
+        h2 = int.from_bytes(digest[8:], 'big') | 1
+        return [(h1 + i * h2) % self.bits for i in range(self.hashes)]
+
+    def contains_many(self, links: Iterable[str], now: float = None) -> Dict[str, bool]:
+        """Return ``{link: seen}`` for every link using one Redis round trip."""
+        links = list(links)
+        generation = self._generation(now)
+        keys = [self._key(generation), self._key(generation - 1)]
+        offsets = [self._offsets(link) for link in links]
+
+        pipe = self.redis.pipeline(transaction=False)
+        for link_offsets in offsets:
+            for key in keys:
+                for offset in link_offsets:
+                    pipe.getbit(key, offset)
+        bits = pipe.execute()
+
+        result = {}
+        stride = self.hashes
+        pos = 0
+        for link in links:
+            seen = False
+            for _ in keys:
+                if all(bits[pos:pos + stride]):
+                    seen = True
+                pos += stride
+            result[link] = seen
+        return result
+
+    def add_many(self, links: Iterable[str], now: float = None) -> None:
+        """Record links in the current generation."""
+        links = list(links)
+        if not links:
+            return
+        key = self._key(self._generation(now))
+        pipe = self.redis.pipeline(transaction=False)
+        for link in links:
+            for offset in self._offsets(link):
+                pipe.setbit(key, offset, 1)
+        # Each generation has to outlive the one after it.
+        pipe.expire(key, self.window_seconds * 2)
+        pipe.execute()
+
+    def estimated_false_positive_rate(self, now: float = None) -> float:
+        """
+        Estimate the false-positive rate from the fill ratio of the live generations.
+
+        A lookup is a false positive if all ``k`` bits are set in either
+        generation: ``1 - prod(1 - fill_g ** k)``.
+        """
+        generation = self._generation(now)
+        pipe = self.redis.pipeline(transaction=False)
+        for key in (self._key(generation), self._key(generation - 1)):
+            pipe.bitcount(key)
+        miss = 1.0
+        for set_bits in pipe.execute():
+            miss *= 1.0 - (set_bits / self.bits) ** self.hashes
+        return 1.0 - miss
@@ -1,53 +1,142 @@
 from celery import shared_task
-from django.utils.dateparse import parse_datetime
-from django.utils import timezone
+from django.conf import settings
+from django.db import connection
 from scrapy.models import NewsStory
-from django.core.cache import cache
+from scrapy.articles import fetch_article_bodies
 from scrapy.economictimes import fetch_economic_times_news
+from scrapy.schedule import ScrapeSchedule
+from scrapy.seen import SeenLinkFilter
 from ai.tasks import analyze_news_task
 import logging
 
 logger = logging.getLogger(__name__)
 
-REDIS_KEY = "et_latest_timestamp"
+
+
+def insert_new_stories(news_by_link):
+    """
+    Insert stories in one statement, skipping links that already exist.
+
+    Returns the ids of the rows this call inserted. A link inserted
+    concurrently by another scrape is skipped, so only one scrape queues
+    its analysis. ``bulk_create(ignore_conflicts=True)`` can't tell the two
+    apart, hence ``ON CONFLICT DO NOTHING RETURNING``.
+    """
+    if not news_by_link:
+        return []
+    rows = list(news_by_link.items())
+    with connection.cursor() as cursor:
+        cursor.execute(
+            f"""
+            INSERT INTO {NewsStory._meta.db_table} (title, link, datetime, description)
+            SELECT * FROM unnest(%s::varchar[], %s::varchar[], %s::timestamptz[], %s::text[])
+            ON CONFLICT (link) DO NOTHING
+            RETURNING id
+            """,
+            [
+                [news['title'] for _, news in rows],
+                [link for link, _ in rows],
+                [news['datetime'] for _, news in rows],
+                [news['description'] for _, news in rows],
+            ],
+        )
+        return [row[0] for row in cursor.fetchall()]
+
 
 @shared_task
-def scrape_economic_times():
-    logger.info("Starting Economic Times scraping task.")
-    last_timestamp = cache.get(REDIS_KEY)
-    if last_timestamp:
-        last_timestamp = parse_datetime(last_timestamp)
-        logger.info(f"Last timestamp from cache: {last_timestamp}")
-    else:
-        last_timestamp = timezone.make_aware(timezone.datetime.min)
-        logger.info("No last timestamp found, using minimum datetime.")
+def dispatch_scrapes():
+    """
+    Enqueue a scrape for every section whose adaptive interval has elapsed.
 
+    Schedule it in django-celery-beat every ``SCRAPE_MIN_INTERVAL_SECONDS``
+    (or more often) in place of a fixed ``scrape_economic_times`` entry.
+    """
+    due = ScrapeSchedule().due_sections(settings.ET_SECTIONS)
+    for section in due:
+        scrape_economic_times.delay(section)
+    return due
+
+
+@shared_task
+def scrape_economic_times(section=None):
+    section = section or next(iter(settings.ET_SECTIONS))
+    logger.info(f"Starting Economic Times scraping task for section {section}.")
     try:
-        news_list = fetch_economic_times_news()
+        news_list = fetch_economic_times_news(path=settings.ET_SECTIONS[section])
         logger.info(f"Fetched {len(news_list)} stories from Economic Times.")
     except Exception as e:
         logger.error(f"Error fetching news: {e}")
         return
 
-    new_latest = last_timestamp
-    new_count = 0
+    news_by_link = {}
     for news in news_list:
-        dt = news['datetime']
-        if dt > last_timestamp:
-            news_story, created = NewsStory.objects.update_or_create(
-                link=news['link'],
-                defaults={
-                    'title': news['title'],
-                    'datetime': dt,
-                    'description': news['description']
-                }
-            )
-            new_count += 1
-            if created:
-                analyze_news_task.delay(news_story.id)
-            if dt > new_latest:
-                new_latest = dt
-    if new_latest > last_timestamp:
-        cache.set(REDIS_KEY, new_latest.isoformat())
-        logger.info(f"Updated latest timestamp in cache: {new_latest}")
-    logger.info(f"Scraping task complete. {new_count} new stories saved.") 
\ No newline at end of file
+        if news['link']:
+            news_by_link.setdefault(news['link'], news)
+
+    # Discard links we already stored without touching the database. Bloom
+    # filters have no false negatives, so anything unseen gets checked below
+    # regardless of its timestamp, which lets late-arriving stories through.
+    seen_filter = SeenLinkFilter()
+    seen = seen_filter.contains_many(news_by_link)
+    candidates = {link: news for link, news in news_by_link.items() if not seen[link]}
+
+    queries = 0
+    created = []
+    if candidates:
+        existing = set(
+            NewsStory.objects.filter(link__in=list(candidates)).values_list('link', flat=True)
+        )
+        queries += 1
+        to_create = {link: news for link, news in candidates.items() if link not in existing}
+        if to_create:
+            created = insert_new_stories(to_create)
+            queries += 1
+
+    if created and settings.ARTICLE_FETCH_ENABLED:
+        fetch_article_bodies_task.delay(created)
+    else:
+        for news_story_id in created:
+            analyze_news_task.delay(news_story_id)
+
+    # Refresh every link on the page so it stays in the current generation.
+    seen_filter.add_many(news_by_link)
+
+    # Only unseen links count as arrivals, so undated stories (stamped with
+    # the fetch time) are not counted again on every poll.
+    schedule = ScrapeSchedule().record_fetch(section, [news['datetime'] for news in candidates.values()])
+
+    stats = {
+        'section': section,
+        'fetched': len(news_by_link),
+        'discarded_in_memory': len(news_by_link) - len(candidates),
+        'checked_in_db': len(candidates),
+        'created': len(created),
+        'db_queries': queries,
+        'estimated_false_positive_rate': seen_filter.estimated_false_positive_rate(),
+        'stories_per_hour': schedule.rate * 3600,
+        'next_fetch_in_seconds': schedule.interval,
+    }
+    logger.info(
+        "Scraping task complete. %(created)d new stories saved; %(discarded_in_memory)d of "
+        "%(fetched)d discarded by the seen-link filter; %(db_queries)d DB queries; "
+        "estimated false-positive rate %(estimated_false_positive_rate).2e.",
+        stats,
+    )
+    return stats
+
+
+@shared_task
+def fetch_article_bodies_task(news_story_ids):
+    """
+    Fetch and store the bodies of new stories, then queue their analysis.
+
+    A failed fetch doesn't hold a story back; it is analyzed from its
+    title and description. That includes the whole batch failing, so
+    analysis is queued even when fetching raises.
+    """
+    stories = NewsStory.objects.filter(id__in=news_story_ids).only('id', 'link')
+    try:
+        return fetch_article_bodies(stories)
+    finally:
+        for news_story_id in news_story_ids:
+            analyze_news_task.delay(news_story_id)
@@ -0,0 +1,27 @@
+from django.test import SimpleTestCase
+
+from scrapy.articles import decode_html
+
+TEXT = 'Sensex climbs ₹2 lakh crore — Nifty at 25,000'
+
+
+class DecodeHtmlTests(SimpleTestCase):
+    """Charset selection for fetched article pages."""
+
+    def page(self, head=''):
+        return f'<html><head>{head}</head><body><p>{TEXT}</p></body></html>'
+
+    def test_header_charset_wins(self):
+        body = self.page('<meta charset="windows-1252">').encode('utf-8')
+        self.assertIn(TEXT, decode_html(body, 'text/html; charset=UTF-8'))
+
+    def test_meta_charset_without_header_charset(self):
+        html = self.page('<meta charset="windows-1252">').replace('₹', 'Rs')
+        self.assertIn(TEXT.replace('₹', 'Rs'), decode_html(html.encode('cp1252'), 'text/html'))
+
+    def test_utf8_without_any_charset_is_not_read_as_latin1(self):
+        self.assertIn(TEXT, decode_html(self.page().encode('utf-8'), 'text/html'))
+
+    def test_unknown_charset_falls_through(self):
+        body = self.page().encode('utf-8')
+        self.assertIn(TEXT, decode_html(body, 'text/html; charset=x-made-up'))
@@ -0,0 +1,122 @@
+from django.test import SimpleTestCase
+
+from scrapy.seen import SeenLinkFilter, normalize_link
+
+WINDOW = 3600
+
+
+class FakeRedis:
+    """The bit and expiry commands ``SeenLinkFilter`` uses, on a clock the test sets."""
+
+    def __init__(self):
+        self.now = 0.0
+        self.keys = {}  # key -> (bytearray, expires at or None)
+
+    def _bits(self, key):
+        bits, expires_at = self.keys.get(key, (None, None))
+        if bits is None or (expires_at is not None and expires_at <= self.now):
+            self.keys.pop(key, None)
+            return None
+        return bits
+
+    def getbit(self, key, offset):
+        bits = self._bits(key)
+        if bits is None or offset // 8 >= len(bits):
+            return 0
+        return bits[offset // 8] >> (7 - offset % 8) & 1
+
+    def setbit(self, key, offset, value):
+        bits = self._bits(key)
+        if bits is None:
+            bits = bytearray()
+            self.keys[key] = (bits, None)
+        if offset // 8 >= len(bits):
+            bits.extend(bytes(offset // 8 + 1 - len(bits)))
+        old = self.getbit(key, offset)
+        if value:
+            bits[offset // 8] |= 1 << (7 - offset % 8)
+        else:
+            bits[offset // 8] &= ~(1 << (7 - offset % 8))
+        return old
+
+    def expire(self, key, seconds):
+        bits = self._bits(key)
+        if bits is not None:
+            self.keys[key] = (bits, self.now + seconds)
+
+    def bitcount(self, key):
+        bits = self._bits(key)
+        return sum(bin(byte).count('1') for byte in bits) if bits else 0
+
+    def pipeline(self, transaction=True):
+        return FakePipeline(self)
+
+
+class FakePipeline:
+    def __init__(self, redis):
+        self.redis = redis
+        self.calls = []
+
+    def __getattr__(self, name):
+        def queue(*args):
+            self.calls.append((getattr(self.redis, name), args))
+        return queue
+
+    def execute(self):
+        return [method(*args) for method, args in self.calls]
+
+
+class SeenLinkFilterTests(SimpleTestCase):
+    """Bloom filter membership, generation rollover and false-positive rate."""
+
+    def setUp(self):
+        self.redis = FakeRedis()
+        self.filter = SeenLinkFilter(bits=2 ** 16, hashes=7, window_seconds=WINDOW, connection=self.redis)
+
+    def at(self, now):
+        self.redis.now = now
+        return now
+
+    def test_added_links_are_seen(self):
+        now = self.at(10 * WINDOW)
+        links = [f"https://example.com/news/{i}" for i in range(100)]
+        self.filter.add_many(links[:50], now=now)
+        seen = self.filter.contains_many(links, now=now)
+        self.assertTrue(all(seen[link] for link in links[:50]))
+        self.assertFalse(any(seen[link] for link in links[50:]))
+
+    def test_lookup_normalizes_links(self):
+        now = self.at(10 * WINDOW)
+        self.filter.add_many(['https://Example.com/news/1/?utm_source=x'], now=now)
+        self.assertEqual(normalize_link('https://Example.com/news/1/?utm_source=x'), 'https://example.com/news/1')
+        self.assertTrue(self.filter.contains_many(['https://example.com/news/1'], now=now)['https://example.com/news/1'])
+
+    def test_generation_rollover_and_expiry(self):
+        link = 'https://example.com/news/1'
+        start = 10 * WINDOW
+        self.filter.add_many([link], now=self.at(start))
+        # Still found from the previous generation after one rollover
+        self.assertTrue(self.filter.contains_many([link], now=self.at(start + WINDOW))[link])
+        # Gone two generations later, and its key has expired
+        self.assertFalse(self.filter.contains_many([link], now=self.at(start + 2 * WINDOW))[link])
+        self.assertIsNone(self.redis._bits(self.filter._key(10)))
+
+    def test_re_adding_keeps_a_link_warm(self):
+        link = 'https://example.com/news/1'
+        start = 10 * WINDOW
+        for generation in range(5):
+            now = self.at(start + generation * WINDOW)
+            self.assertEqual(self.filter.contains_many([link], now=now)[link], generation > 0)
+            self.filter.add_many([link], now=now)
+
+    def test_false_positive_rate(self):
+        # 6,000 links in 2 ** 16 bits with 7 hashes: ~0.5% per generation, ~1% over both
+        now = self.at(10 * WINDOW)
+        self.filter.add_many([f"https://example.com/old/{i}" for i in range(6000)], now=now - WINDOW)
+        self.filter.add_many([f"https://example.com/new/{i}" for i in range(6000)], now=now)
+        probes = [f"https://example.com/other/{i}" for i in range(20000)]
+        rate = sum(self.filter.contains_many(probes, now=now).values()) / len(probes)
+        estimate = self.filter.estimated_false_positive_rate(now=now)
+        self.assertLess(rate, 0.02)
+        self.assertLess(estimate, 0.02)
+        self.assertAlmostEqual(rate, estimate, delta=0.003)